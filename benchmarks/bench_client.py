@@ -0,0 +1,221 @@
+#!/usr/bin/env python
+"""Measure the client-side hot paths of Odooly, and save the results as JSON.
+
+The micro benchmarks run offline on the models of a local fake server:
+domain parsing, record sets, wrapping of the values.  The macro benchmarks
+call ``search_read`` end-to-end on the fake server.  For each case, the
+time per call is the best and the median of several repeats, and the peak
+memory is measured with :mod:`tracemalloc` on a separate call.
+
+Usage::
+
+    python benchmarks/bench_client.py [-k union] [-o results.json] [--compare baseline.json]
+"""
+import argparse
+import datetime
+import json
+import platform
+import statistics
+import sys
+import timeit
+import tracemalloc
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import odooly  # noqa: E402
+from tests._common import FakeOdoo  # noqa: E402
+
+BENCHMARKS = {}
+STRING_DOMAIN = ['name like Partner', 'id > 10', 'country_id.code = BE', "state in ('draft', 'open')",
+                 'parent_id = False', 'write_date >= "2026-01-01 00:00:00"', 'credit_limit != 0.0']
+
+
+def benchmark(group):
+    """Register a benchmark.  The function returns the callable to time."""
+    def register(func):
+        BENCHMARKS[f'{group}.{func.__name__}'] = func
+        return func
+    return register
+
+
+def make_rows(count):
+    return [{
+        'id': idx,
+        'name': f'Partner {idx}',
+        'email': f'partner{idx}@example.com',
+        'parent_id': idx % 10 and [idx - idx % 10, f'Partner {idx - idx % 10}'] or False,
+        'country_id': [1 + idx % 4, 'Belgium'],
+        'category_id': [1 + idx % 20],
+    } for idx in range(1, count + 1)]
+
+
+# Micro benchmarks
+
+@benchmark('domain')
+def searchargs(ctx):
+    return lambda: odooly.searchargs(([*STRING_DOMAIN],))     # The domain is updated in place
+
+
+@benchmark('domain')
+def term_re(ctx):
+    terms = [term.strip() for term in STRING_DOMAIN]
+    return lambda: [odooly._term_re.match(term).groups() for term in terms]
+
+
+@benchmark('domain')
+def literal_eval(ctx):
+    return lambda: odooly.literal_eval("[('name', '=', 'Joe'), ('id', 'in', [1, 2, 3]), ('active', '=', True)]")
+
+
+@benchmark('model')
+def parse_format_many2one_100k(ctx):
+    rows = [{'parent_id': row['parent_id']} for row in make_rows(100_000)]
+    return lambda: ctx.model._parse_format('parent_id')[1](rows)
+
+
+@benchmark('model')
+def parse_format_template_100k(ctx):
+    rows = make_rows(100_000)
+    return lambda: ctx.model._parse_format('{name} <{email}>')[1](rows)
+
+
+@benchmark('model')
+def browse_values_100k(ctx):
+    rows = make_rows(100_000)
+    browse_values = ctx.model._browse_values
+    return lambda: [browse_values({**row}) for row in rows]
+
+
+@benchmark('records')
+def recordlist_1m(ctx):
+    ids = [*range(1, 1_000_001)]
+    return lambda: odooly.RecordList(ctx.model, ids)
+
+
+@benchmark('records')
+def union_500k(ctx):
+    (left, right) = (ctx.model.browse([*range(1, 500_001)]), ctx.model.browse([*range(250_001, 750_001)]))
+    return lambda: left.union(right)
+
+
+@benchmark('records')
+def sub_500k(ctx):
+    (left, right) = (ctx.model.browse([*range(1, 500_001)]), ctx.model.browse([*range(250_001, 750_001)]))
+    return lambda: left - right
+
+
+@benchmark('records')
+def and_500k(ctx):
+    (left, right) = (ctx.model.browse([*range(1, 500_001)]), ctx.model.browse([*range(250_001, 750_001)]))
+    return lambda: left & right
+
+
+@benchmark('records')
+def record_create_10k(ctx):
+    model = ctx.model
+    return lambda: [odooly.Record(model, id_) for id_ in range(1, 10_001)]
+
+
+@benchmark('records')
+def record_getattr_10k(ctx):
+    records = [*ctx.model.browse([*range(1, 10_001)])]
+    for rec in records:     # Simulate the cache of a read
+        rec.env._record_values(rec._name, rec.id)['name'] = f'Partner {rec.id}'
+    return lambda: [(rec.id, rec.name, rec._name) for rec in records]
+
+
+@benchmark('env')
+def env_context(ctx):
+    env = ctx.client.env
+    env(context={'lang': 'fr_FR', 'tz': 'Europe/Paris', 'active_test': False})
+    return lambda: env(context={'lang': 'fr_FR', 'tz': 'Europe/Paris', 'active_test': False})
+
+
+# Macro benchmarks
+
+@benchmark('e2e')
+def search_read(ctx):
+    return lambda: ctx.model.search_read([], 'name email parent_id country_id')
+
+
+@benchmark('e2e')
+def search_read_stream(ctx):
+    return lambda: [*ctx.model.search_read([], 'name email parent_id country_id', stream=True)]
+
+
+@benchmark('e2e')
+def search_then_read(ctx):
+    return lambda: ctx.model.search([]).read('name email')
+
+
+class Context:
+    """A fake server with some partners, and a connected client."""
+
+    def __init__(self, partners):
+        self.server = FakeOdoo().start()
+        self.server.populate(partners)
+        self.client = odooly.Client(self.server.url, 'db', 'admin', 'admin')
+        self.model = self.client.env['res.partner']
+        self.model.with_context(active_test=False).search_count([])    # Load the fields
+
+    def close(self):
+        self.server.stop()
+
+
+def measure(func, repeat):
+    timer = timeit.Timer(func)
+    (number, __) = timer.autorange()
+    times = [elapsed / number for elapsed in timer.repeat(repeat, number)]
+    tracemalloc.start()
+    try:
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return {'number': number, 'best': min(times), 'median': statistics.median(times), 'peak_memory': peak}
+
+
+def print_results(results, baseline=None):
+    print(f"{'benchmark':36} {'best':>12} {'median':>12} {'peak KiB':>10}" + ('    change' if baseline else ''))
+    for (name, res) in results.items():
+        line = f"{name:36} {res['best'] * 1E6:9.1f} µs {res['median'] * 1E6:9.1f} µs {res['peak_memory'] / 1024:10.0f}"
+        if base := (baseline or {}).get(name):
+            ratio = res['median'] / base['median']
+            line += f"  {ratio - 1:+8.1%}" + ('  !' if ratio > 1.1 else '')
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('-k', '--filter', default='', help='run the benchmarks which match this substring')
+    parser.add_argument('-r', '--repeat', type=int, default=5, help='number of repeats (default: 5)')
+    parser.add_argument('--partners', type=int, default=10_000, help='rows of the fake server')
+    parser.add_argument('-o', '--output', help='save the results in this JSON file')
+    parser.add_argument('--compare', help='compare with the results in this JSON file')
+    args = parser.parse_args()
+
+    ctx = Context(args.partners)
+    results = {}
+    try:
+        for (name, setup) in BENCHMARKS.items():
+            if args.filter in name:
+                results[name] = measure(setup(ctx), args.repeat)
+    finally:
+        ctx.close()
+
+    baseline = json.loads(Path(args.compare).read_text())['results'] if args.compare else None
+    print_results(results, baseline)
+    if args.output:
+        report = {
+            'odooly': odooly.__version__,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'json': getattr(odooly._json_loads, '__module__', None),
+            'date': datetime.datetime.now().isoformat(timespec='seconds'),
+            'results': results,
+        }
+        Path(args.output).write_text(json.dumps(report, indent=2) + '\n')
+
+
+if __name__ == '__main__':
+    main()
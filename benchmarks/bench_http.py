@@ -0,0 +1,90 @@
+#!/usr/bin/env python
+"""Compare the HTTP backends of ``odooly.HTTPSession``.
+
+A local HTTP/1.1 server answers JSON-RPC requests.  Each backend runs
+in a separate process, because the backend is selected on import:
+
+ - ``requests``: the ``requests.Session`` backend (if installed)
+ - ``urllib``: the ``urllib.request`` fallback with keep-alive pool
+ - ``urllib-close``: plain ``urllib.request``, one connection per request
+
+Usage::
+
+    python benchmarks/bench_http.py [-n 2000]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from threading import Thread
+
+ROOT = Path(__file__).resolve().parent.parent
+BACKENDS = ['requests', 'urllib', 'urllib-close']
+
+
+class JsonRpcHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        body = json.dumps({'jsonrpc': '2.0', 'id': payload['id'], 'result': [1, 2, 3]}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def run_backend(backend, url, count):
+    sys.path.insert(0, str(ROOT))
+    import odooly
+
+    if backend == 'requests' and not odooly.requests:
+        return None
+    http = odooly.HTTPSession()
+    if backend == 'urllib-close':
+        http._session = odooly.build_opener(odooly.HTTPCookieProcessor(), odooly.HTTPHandler())
+    payload = {'jsonrpc': '2.0', 'method': 'call', 'params': {'args': [1, 2]}, 'id': 0}
+    start = time.perf_counter()
+    for __ in range(count):
+        http.request(url, json=payload)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('-n', '--count', type=int, default=2000, help='number of requests')
+    parser.add_argument('--backend', choices=BACKENDS, help=argparse.SUPPRESS)
+    parser.add_argument('--url', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.backend:
+        print(json.dumps(run_backend(args.backend, args.url, args.count)))
+        return
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), JsonRpcHandler)
+    Thread(target=server.serve_forever, daemon=True).start()
+    url = f'http://127.0.0.1:{server.server_address[1]}/jsonrpc'
+    for backend in BACKENDS:
+        env = dict(os.environ)
+        if backend.startswith('urllib'):
+            env['ODOOLY_SSL_UNVERIFIED'] = '1'   # Force urllib.request
+        cmd = [sys.executable, __file__, '--backend', backend, '--url', url, '-n', str(args.count)]
+        if (elapsed := json.loads(subprocess.check_output(cmd, env=env))) is None:
+            print(f'{backend:>14}: not installed')
+        else:
+            print(f'{backend:>14}: {args.count / elapsed:8.0f} req/s  '
+                  f'{elapsed / args.count * 1E6:7.1f} µs/req')
+    server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
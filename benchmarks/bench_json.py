@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+"""Compare the JSON codecs available to Odooly.
+
+Payloads are similar to a ``search_read`` response and to a ``create``
+request with a list of values.
+
+Usage::
+
+    python benchmarks/bench_json.py [-n 20000]
+"""
+import argparse
+import sys
+import timeit
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import odooly  # noqa: E402
+
+CODECS = ['json', 'orjson', 'msgspec']
+
+
+def search_read_rows(count):
+    return {'jsonrpc': '2.0', 'id': '1f2e3d4c5b6a', 'result': [{
+        'id': idx,
+        'name': f'Partner {idx} - Société Générale',
+        'display_name': f'Acme Corporation, Partner {idx} - Société Générale',
+        'email': f'partner{idx}@example.com',
+        'active': True,
+        'is_company': idx % 7 == 0,
+        'country_id': [75, 'France'],
+        'parent_id': idx % 3 and [idx - 1, f'Partner {idx - 1}'] or False,
+        'category_id': [1, 4, 9],
+        'credit_limit': idx * 12.5,
+        'write_date': '2026-03-26 12:34:56',
+        'comment': False,
+    } for idx in range(count)]}
+
+
+def create_vals(count):
+    return {'jsonrpc': '2.0', 'method': 'call', 'id': '1f2e3d4c5b6a', 'params': {
+        'service': 'object', 'method': 'execute_kw',
+        'args': ['db', 2, 'secret', 'res.partner', 'create', [[{
+            'name': f'Partner {idx}',
+            'email': f'partner{idx}@example.com',
+            'country_id': 75,
+            'category_id': [(6, 0, [1, 4, 9])],
+            'credit_limit': idx * 12.5,
+        } for idx in range(count)]], {'context': {'lang': 'en_US', 'tz': 'Europe/Zurich'}}],
+    }}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('-n', '--count', type=int, default=20000, help='number of rows')
+    parser.add_argument('-r', '--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    payloads = {'search_read': search_read_rows(args.count), 'create': create_vals(args.count)}
+    for name, payload in payloads.items():
+        print(f'{name} ({args.count} rows)')
+        for codec in CODECS:
+            try:
+                (dumps, loads) = odooly._get_json_codec(codec)
+            except ImportError:
+                print(f'{codec:>10}: not installed')
+                continue
+            data = dumps(payload)
+            t_enc = min(timeit.repeat(lambda: dumps(payload), number=1, repeat=args.repeat))
+            t_dec = min(timeit.repeat(lambda: loads(data), number=1, repeat=args.repeat))
+            print(f'{codec:>10}: encode {t_enc * 1E3:8.2f} ms   decode {t_dec * 1E3:8.2f} ms'
+                  f'   size {len(data) / 1E6:6.2f} MB')
+
+
+if __name__ == '__main__':
+    main()
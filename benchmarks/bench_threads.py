@@ -0,0 +1,50 @@
+#!/usr/bin/env python
+"""Measure the throughput of one ``odooly.Client`` shared between threads.
+
+The fake Odoo server of the tests answers the Web API requests, with
+``--delay`` of latency.  For each number of threads, the workers call
+``search_count`` with the same Client.  Each thread opens its own HTTP
+connections and Web session.
+
+Usage::
+
+    python benchmarks/bench_threads.py [-n 4000] [--delay 0.002]
+"""
+import argparse
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+import odooly  # noqa: E402
+from tests._common import FakeOdoo  # noqa: E402
+
+THREADS = [1, 2, 4, 8, 16, 32]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('-n', '--count', type=int, default=4000, help='number of requests')
+    parser.add_argument('--delay', type=float, default=0.002, help='server time per request (seconds)')
+    args = parser.parse_args()
+
+    server = FakeOdoo(args.delay).start()
+    server.populate(100, categories=5)
+    client = odooly.Client(server.url, 'db', 'admin', 'admin')
+    model = client.env['res.partner']
+
+    for threads in THREADS:
+        with ThreadPoolExecutor(threads) as executor:
+            [*executor.map(model.search_count, [[]] * threads)]    # Warm up, and login
+            start = time.perf_counter()
+            [*executor.map(model.search_count, [[]] * args.count)]
+            elapsed = time.perf_counter() - start
+        print(f'{threads:>3} threads: {args.count / elapsed:8.0f} req/s  '
+              f'{elapsed / args.count * 1E6:7.1f} µs/req')
+    client.close()
+    server.stop()
+
+
+if __name__ == '__main__':
+    main()
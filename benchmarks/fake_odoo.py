@@ -0,0 +1,37 @@
+#!/usr/bin/env python
+"""Serve the fake Odoo server of the tests, with in-memory tables.
+
+The server is :class:`tests._common.FakeOdoo`.  It answers the Webclient
+API, JSON-RPC and JSON-2 requests, with an optional latency.
+
+Usage::
+
+    python benchmarks/fake_odoo.py [--port 8069] [--latency 0.002] [--partners 1000]
+"""
+import argparse
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from tests._common import FakeOdoo  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.split('\n')[0])
+    parser.add_argument('--port', type=int, default=8069, help='TCP port (default: 8069)')
+    parser.add_argument('--latency', type=float, default=0, help='server time per request (seconds)')
+    parser.add_argument('--partners', type=int, default=1000, help='number of partners')
+    parser.add_argument('--server-version', default='17.0', help='Odoo version (default: 17.0)')
+    args = parser.parse_args()
+
+    server = FakeOdoo(args.latency, args.server_version, port=args.port)
+    server.populate(args.partners)
+    print(f"Serving database 'db' on {server.url} (login 'admin', password 'admin')")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == '__main__':
+    main()
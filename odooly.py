@@ -5,23 +5,40 @@ Author: Florent Xicluna
 """
 import _ast
 import argparse
+import asyncio
 import atexit
+import base64
+import codecs
 import datetime
 import functools
+import gzip
+import hashlib
 import json
+import math
 import os
+import random
 import re
 import shlex
 import sys
 import time
 import traceback
 
+from collections import OrderedDict, deque
+from collections.abc import MutableMapping
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
+from copy import deepcopy
 from configparser import ConfigParser
+from email.utils import parsedate_to_datetime
 from getpass import getpass
+from inspect import isawaitable
+from itertools import islice
 from pathlib import Path
 from string import Formatter
-from threading import current_thread
+from types import SimpleNamespace
+from threading import Condition, Lock, RLock, current_thread, local
+from urllib.error import HTTPError
 from urllib.parse import urlencode, urljoin, urlsplit
+from weakref import WeakSet
 
 try:
     import requests
@@ -29,7 +46,10 @@ except ImportError:
     requests = None
 
 __version__ = '2.6.4'
-__all__ = ['Client', 'Env', 'HTTPSession', 'WebAPI', 'Service', 'Json2',
+__all__ = ['Client', 'Env', 'WebAPI', 'Service', 'Json2',
+           'Cassette', 'EnvCache', 'HTTPSession', 'MetadataCache',
+           'NodePool', 'RateLimiter', 'RetryPolicy', 'Stats',
+           'AsyncClient', 'AsyncEnv', 'AsyncHTTPSession', 'AsyncModel',
            'Printer', 'Error', 'ServerError',
            'BaseModel', 'Model', 'BaseRecord', 'Record', 'RecordList',
            'format_exception', 'read_config', 'start_odoo_services']
@@ -79,6 +99,8 @@ _term_re = re.compile(
     r'([\w._]+)\s*'   r'(=like\b|=ilike\b|=\?|[<>]=?|!?=|'
     r'\b(?:like|ilike|in|any|not (?:=?like|=?ilike|in|any)|child_of|parent_of)\b)'
     r'(?![?!=<>])\s*(.+)')
+_RELATIONAL_TYPES = ('many2one', 'one2many', 'many2many')
+_DEFAULT = object()     # Default value of the arguments which accept None
 
 # Web methods (not exhaustive)
 _web_methods = {
@@ -132,6 +154,44 @@ for query in sql_queries:
 log(str({'queries': sql_queries, 'result': result}))
 result[:] = []
 """
+_batch_methods = frozenset(['create', 'read', 'search', 'search_count', 'search_read', 'unlink', 'write'])
+# The ids of these methods are sent by chunks of `Client.chunk_size`
+_chunked_methods = frozenset(['exists', 'read', 'unlink', 'write'])
+# Identical calls of these methods share the result, when they are in flight
+_readonly_methods = frozenset([
+    'check_access', 'check_access_rights', 'context_get', 'default_get', 'exists',
+    'fields_get', 'fields_view_get', 'get_available_models', 'get_external_id',
+    'get_metadata', 'get_views', 'has_access', 'has_group', 'name_get', 'name_search',
+    'read', 'read_group', 'search', 'search_count', 'search_read',
+    'web_read', 'web_read_group', 'web_search_read',
+])
+_serialization_errors = ('ConcurrencyError', 'DeadlockDetected', 'SerializationFailure', 'TransactionRollbackError')
+_batch_action_code = """\
+(results, calls) = ([], env.context.get("__batch") or [])
+env = env(context={key: val for (key, val) in env.context.items() if key != "__batch"})
+for (model, method, args, kwargs) in calls:
+    records = env[model].with_context(kwargs.pop("context", None) or {})
+    if method == "create":
+        res = records.create(args[0])
+        res = res.ids if isinstance(args[0], list) else res.id
+    elif method == "read":
+        res = records.browse(args[0]).read(*args[1:], **kwargs)
+    elif method == "search":
+        res = records.search(*args, **kwargs).ids
+    elif method == "search_count":
+        res = records.search_count(*args, **kwargs)
+    elif method == "search_read":
+        res = records.search_read(*args, **kwargs)
+    elif method == "write":
+        res = records.browse(args[0]).write(*args[1:], **kwargs)
+    elif method == "unlink":
+        res = records.browse(args[0]).unlink()
+    else:
+        raise UserError("Method not supported: %s" % method)
+    results.append(res)
+
+action = {"type": "ir.actions.act_window_close", "results": results}
+"""
 color_bold = color_comment = color_py = color_repr = str
 http_context = None
 
@@ -141,11 +201,127 @@ if os.getenv('ODOOLY_SSL_UNVERIFIED'):
     http_context = ssl._create_unverified_context()
     requests = None
 
+
+def _get_json_codec(name=None):
+    """Return the functions ``(dumps, loads)`` of the JSON codec `name`.
+
+    Supported codecs are ``orjson``, ``msgspec`` and ``json``.  If `name`
+    is empty, the first available codec is used.  Function ``dumps``
+    returns bytes, and it accepts the optional argument `sort_keys`.
+    """
+    for codec in [name] if name else ['orjson', 'msgspec', 'json']:
+        try:
+            if codec == 'orjson':
+                import orjson
+                options = [orjson.OPT_NON_STR_KEYS, orjson.OPT_NON_STR_KEYS | orjson.OPT_SORT_KEYS]
+                return (lambda obj, sort_keys=False: orjson.dumps(obj, option=options[sort_keys])), orjson.loads
+            if codec == 'msgspec':
+                import msgspec
+                encoders = [msgspec.json.Encoder(enc_hook=_json_enc_hook, order=order)
+                            for order in (None, 'sorted')]
+                return (lambda obj, sort_keys=False: encoders[sort_keys].encode(obj)), msgspec.json.decode
+        except ImportError:
+            if name:
+                raise
+            continue
+        if codec == 'json':
+            def dumps(obj, sort_keys=False):
+                return json.dumps(obj, sort_keys=sort_keys, separators=(',', ':')).encode()
+            return dumps, json.loads
+    raise ValueError(f"Unknown JSON codec {name!r}")
+
+
+def _json_enc_hook(obj):
+    # Subclasses of builtin types, like 'Ids' and 'Id1'
+    for base in (list, tuple, int, str, dict):
+        if isinstance(obj, base):
+            return base(obj)
+    raise TypeError(f"Object of type {obj.__class__.__name__} is not JSON serializable")
+
+
+_json_dumps, _json_loads = _get_json_codec(os.getenv('ODOOLY_JSON'))
+
 if not requests:
-    from urllib.request import HTTPCookieProcessor, HTTPSHandler, Request, build_opener
+    from http.client import HTTPException
+    from urllib.error import URLError
+    from urllib.request import HTTPCookieProcessor, HTTPHandler, HTTPSHandler, Request, build_opener
+
+    class _KeepAliveHandler(HTTPHandler, HTTPSHandler):
+        """Reuse HTTP/1.1 connections with a pool of idle connections per host."""
+        pool_maxsize = 8        # Max idle connections per host
+        pool_timeout = 60.0     # Idle connections are closed after some time
+
+        def __init__(self, context=None):
+            HTTPSHandler.__init__(self, context=context)
+            self._pool = {}
+            self._lock = Lock()
+
+        def _get_conn(self, key):
+            with self._lock:
+                idle = self._pool.get(key) or []
+                while idle:
+                    (conn, idle_since) = idle.pop()
+                    if time.monotonic() - idle_since < self.pool_timeout:
+                        return conn
+                    conn.close()
+
+        def _put_conn(self, key, conn):
+            with self._lock:
+                idle = self._pool.setdefault(key, [])
+                if len(idle) < self.pool_maxsize:
+                    return idle.append((conn, time.monotonic()))
+            conn.close()
+
+        def _release(self, key, conn, resp):
+            del resp.close  # Restore HTTPResponse.close
+            # Connection is reusable only if the response was fully read
+            reusable = resp.isclosed() or resp.length == 0
+            resp.close()
+            self._put_conn(key, conn) if reusable else conn.close()
+
+        def close(self):
+            with self._lock:
+                (idle, self._pool) = (self._pool, {})
+            for (conn, __) in [item for conns in idle.values() for item in conns]:
+                conn.close()
+
+        def do_open(self, http_class, req, **http_conn_args):
+            if req._tunnel_host:  # Proxy tunnel is not pooled
+                return super().do_open(http_class, req, **http_conn_args)
+            key = (http_class, req.host)
+            headers = dict(req.unredirected_hdrs)
+            headers.update({k: v for k, v in req.headers.items() if k not in headers})
+            headers = {name.title(): val for name, val in headers.items()}
+            while True:
+                if (conn := self._get_conn(key)) is None:
+                    conn = http_class(req.host, timeout=req.timeout, **http_conn_args)
+                    reused = False
+                else:
+                    reused = True
+                try:
+                    conn.request(req.get_method(), req.selector, req.data, headers,
+                                 encode_chunked=req.has_header('Transfer-encoding'))
+                    resp = conn.getresponse()
+                    break
+                except (ConnectionError, HTTPException) as err:
+                    conn.close()
+                    if not reused:  # Otherwise, server closed an idle connection
+                        raise URLError(err)
+                except OSError as err:
+                    conn.close()
+                    raise URLError(err)
+            (resp.url, resp.msg) = (req.get_full_url(), resp.reason)
+            if not resp.will_close:
+                resp.close = partial(self._release, key, conn, resp)
+            return resp
 
 
 class HTTPSession:
+    chunk_size = 2**16  # Read size for streamed responses
+    limiter = None      # Shared RateLimiter
+    stats = None        # Count the bytes for the Stats
+    cassette = None     # Record or replay the requests
+
     if requests:  # requests.Session
         def __init__(self):
             self._session = requests.Session()
@@ -155,20 +331,33 @@ class HTTPSession:
             self._session.auth = (username, password)
 
         def _request(self, url, method, data, json, headers, **kw):
-            resp = self._session.request(method, url, data=data, json=json, headers=headers, **kw)
+            if json is not None:
+                headers = {'Content-Type': 'application/json', **(headers or {})}
+                data = _json_dumps(json)
+            if self.stats is not None:
+                self.stats._count(sent=len(data) if isinstance(data, bytes) else 0)
+            resp = self._session.request(method, url, data=data, headers=headers, **kw)
             return resp.raise_for_status() or resp
 
         def _parse_response(self, resp):
+            if self.stats is not None:
+                self.stats._count(received=len(resp.content))
             is_json = 'json' in resp.headers.get('content-type', '')
-            return resp.json() if is_json else resp.text
+            return _json_loads(resp.content) if is_json else resp.text
+
+        def _iter_content(self, resp):
+            return resp.iter_content(self.chunk_size)
 
         def _parse_error(self, err):
             resp = err.response
             return (resp.status_code, self._parse_response(resp)) if resp is not None else (0, 0)
 
+        def close(self):
+            self._session.close()
+
     else:  # urllib.request
         def __init__(self):
-            self._session = build_opener(HTTPCookieProcessor(), HTTPSHandler(context=http_context))
+            self._session = build_opener(HTTPCookieProcessor(), _KeepAliveHandler(context=http_context))
             self._session.addheaders = [('User-Agent', USER_AGENT), ('Accept', 'application/json')]
 
         def set_auth(self, uri, username, password):
@@ -177,37 +366,803 @@ class HTTPSession:
             auth.add_password(None, uri, username, password)
             self._session.add_handler(auth)
 
-        def _request(self, url, method, data, json, headers, _json=json, **kw):
+        def _request(self, url, method, data, json, headers, **kw):
             headers = dict(headers or ())
             if json is not None:
                 headers.setdefault('Content-Type', 'application/json')
             if method == 'POST':
-                data = (urlencode(data) if json is None else _json.dumps(json)).encode()
+                data = urlencode(data).encode() if json is None else _json_dumps(json)
             elif data is not None:
                 url, data = f'{url}?{urlencode(data)}', None
+            if self.stats is not None:
+                self.stats._count(sent=len(data or b''))
             return self._session.open(Request(url, data=data, headers=headers, method=method))
 
         def _parse_response(self, resp):
+            content = resp.read()
+            if self.stats is not None:
+                self.stats._count(received=len(content))
             is_json = 'json' in resp.headers.get('content-type', '')
-            return json.load(resp) if is_json else resp.read().decode()
+            return _json_loads(content) if is_json else content.decode()
 
-        def _parse_error(self, err):
-            return (err.code, self._parse_response(err)) if hasattr(err, 'code') else (0, 0)
+        def _iter_content(self, resp):
+            return iter(partial(resp.read1, self.chunk_size), b'')
 
-    def request(self, url, *, method='POST', data=None, json=None, headers=None):
+        def _parse_error(self, err):
+            if not hasattr(err, 'code'):
+                return (0, 0)
+            with err:  # Release the connection
+                return (err.code, self._parse_response(err))
+
+        def close(self):
+            for handler in self._session.handlers:
+                if isinstance(handler, _KeepAliveHandler):
+                    handler.close()
+
+    def request(self, url, **kwargs):
+        if self.cassette is not None:
+            return self.cassette(self._forward, url, kwargs)
+        return self._forward(url, **kwargs)
+
+    def _forward(self, url, **kwargs):
+        if self.limiter is None:
+            return self._send(url, **kwargs)
+        return self.limiter(partial(self._send, url, **kwargs))
+
+    def _send(self, url, *, method='POST', data=None, json=None, headers=None, stream=False):
         try:
+            if stream:  # Decode the JSON result while it is received
+                resp = self._request(url, method=method, data=data, json=json, headers=headers, stream=True)
+                return self._iter_response(resp)
             with self._request(url, method=method, data=data, json=json, headers=headers) as resp:
                 return resp if method == 'HEAD' else self._parse_response(resp)
         except OSError as exc:
             status_code, result = self._parse_error(exc)
             if result and status_code in (401, 403, 404, 422, 500):
-                # Unauthorized, Forbidden, NotFound, UnprocessableContent, InternalServerError
-                if isinstance(result, str):
-                    lines = re.findall(r'>([^>\n]+)<', result) or (status_code, result)
-                    result = {'name': exc.__class__.__name__, 'debug': None,
-                              'arguments': (f'{lines[0]} - {lines[-1]}',)}
-                raise ServerError({'code': status_code, 'data': result})
+                raise _server_error(status_code, result, exc.__class__.__name__)
+            raise
+
+    def _iter_response(self, resp):
+        chunks = self._iter_content(resp)
+        if self.stats is not None:
+            chunks = map(self._count_chunk, chunks)
+        with resp:
+            yield from _JsonStream(chunks)
+            for __ in chunks:  # Read until the end
+                pass
+
+    def _count_chunk(self, chunk):
+        self.stats._count(received=len(chunk))
+        return chunk
+
+
+class Cassette:
+    """Record the HTTP requests in a file, and replay them without server.
+
+    In ``record`` mode, the requests are sent to the server.  Each request
+    with its response or its error, and the elapsed time, is saved in the
+    gzip compressed file `path` on exit.  In ``replay`` mode, no request is
+    sent: the recorded responses are returned in order, and the last one
+    is repeated.  If `latency` is true, the recorded time is spent before
+    each response.  The default `mode` is ``replay`` if `path` exists.
+
+        >>> with Cassette('partners.json.gz'):
+        ...     client = Client('http://127.0.0.1:8069', 'demo', 'admin', 'admin')
+        ...     rows = client.env['res.partner'].search_read([], 'name')
+
+    The cassette applies to all the :class:`Client` instances in the
+    ``with`` block.  The file contains the credentials, as they are sent.
+    """
+
+    def __init__(self, path, mode=None, latency=False):
+        if mode is None:
+            mode = 'replay' if os.path.exists(path) else 'record'
+        if mode not in ('record', 'replay'):
+            raise ValueError(f"Invalid mode: {mode!r}")
+        (self.path, self.mode, self.latency) = (path, mode, latency)
+        (self._lock, self._entries, self._recorded) = (Lock(), {}, [])
+        if mode == 'replay':
+            with gzip.open(path, 'rt', encoding='utf-8') as f:
+                for entry in map(json.loads, f):
+                    self._entries.setdefault(entry['key'], deque()).append(entry)
+
+    def __enter__(self):
+        (self._previous, HTTPSession.cassette) = (HTTPSession.cassette, self)
+        return self
+
+    def __exit__(self, *args):
+        HTTPSession.cassette = self._previous
+        if self.mode == 'record':
+            self.save()
+
+    def save(self):
+        """Write the recorded requests to the file."""
+        with self._lock:
+            entries = [*self._recorded]
+        with gzip.open(self.path, 'wt', encoding='utf-8') as f:
+            f.writelines(json.dumps(entry) + '\n' for entry in entries)
+
+    def __call__(self, send, url, kwargs):
+        key = self._key(url, **kwargs)
+        if self.mode == 'replay':
+            return self._replay(key, stream=kwargs.get('stream'))
+        entry = {'key': key}
+        start = time.perf_counter()
+        try:
+            res = send(url, **kwargs)
+            if kwargs.get('stream'):
+                res = [*res]
+            if kwargs.get('method') == 'HEAD':
+                entry['url'] = res.url
+            else:
+                entry['result'] = res
+        except ServerError as exc:
+            entry['error'] = {'server_error': exc.args[0]}
+            raise
+        except OSError as exc:
+            entry['error'] = {'message': str(exc), 'code': _http_status(exc), 'headers': dict(_http_headers(exc) or ())}
             raise
+        finally:
+            entry['elapsed'] = time.perf_counter() - start
+            with self._lock:
+                self._recorded.append(entry)
+        return iter(res) if kwargs.get('stream') else res
+
+    def _replay(self, key, stream=False):
+        with self._lock:
+            queue = self._entries.get(key)
+            if not queue:
+                raise Error(f"Request not recorded: {key}")
+            entry = queue.popleft() if len(queue) > 1 else queue[0]
+        if self.latency:
+            time.sleep(entry['elapsed'])
+        if (error := entry.get('error')) is not None:
+            if 'server_error' in error:
+                raise ServerError(error['server_error'])
+            exc = OSError(error['message'])
+            (exc.code, exc.headers) = (error['code'], error['headers'])
+            raise exc
+        if 'url' in entry:
+            return SimpleNamespace(url=entry['url'])
+        res = deepcopy(entry['result'])
+        return iter(res) if stream else res
+
+    @staticmethod
+    def _key(url, method='POST', data=None, json=None, headers=None, stream=False):
+        if isinstance(json, dict) and 'jsonrpc' in json:
+            json = {**json, 'id': None}     # Unique request id
+        return _json_dumps([method, url, data, json]).decode()
+
+
+class NodePool:
+    """Spread the requests on several nodes of an Odoo cluster.
+
+    Argument `nodes` is the list of URLs of the nodes, like
+    ``['http://node1:8069', 'http://node2:8069']``.
+    The `strategy` is ``'round_robin'`` or ``'least_outstanding'``.
+    A node which cannot be reached is taken out of rotation.  It is
+    checked with ``version_info`` after `retry_after` seconds.
+    """
+    strategy = 'round_robin'
+    retry_after = 30.0      # Failed nodes are checked again after some time
+
+    def __init__(self, nodes, strategy=None, retry_after=None):
+        self.nodes = [urljoin(url, '/')[:-1] for url in nodes]
+        if not self.nodes:
+            raise ValueError("No node")
+        if strategy not in (None, 'round_robin', 'least_outstanding'):
+            raise ValueError(f"Unknown strategy {strategy!r}")
+        self.strategy = strategy or self.strategy
+        self.retry_after = retry_after or self.retry_after
+        self._outstanding = dict.fromkeys(self.nodes, 0)
+        self._down = {}     # Time of failure, for each node out of rotation
+        self._counter = -1
+        self._lock = Lock()
+
+    def __repr__(self):
+        return f"<NodePool {','.join(self.nodes)!r}>"
+
+    @classmethod
+    def _from_url(cls, url):
+        # Comma separated hosts: "http://node1:8069,node2:8069/web"
+        (scheme, netloc, path, query, __) = urlsplit(url)
+        pool = cls([f'{scheme}://{host}' for host in netloc.split(',')])
+        return pool, f"{pool.nodes[0]}{path}{query and '?' + query}"
+
+    def geturl(self, url):
+        """Return the `url` with the hosts of all the nodes."""
+        (scheme, __, path, query, __) = urlsplit(url)
+        hosts = ','.join(urlsplit(node).netloc for node in self.nodes)
+        return f"{scheme}://{hosts}{path}{query and '?' + query}"
+
+    def status(self):
+        """Return a dictionary of the outstanding requests per node,
+        or ``None`` if the node is out of rotation."""
+        with self._lock:
+            return {node: None if node in self._down else count
+                    for (node, count) in self._outstanding.items()}
+
+    def check(self, http=None):
+        """Check all the nodes and update the rotation."""
+        send = (http or HTTPSession()).request
+        return {node: self._check_node(send, node) for node in self.nodes}
+
+    def _check_node(self, send, node):
+        payload = {'jsonrpc': '2.0', 'method': 'call', 'params': {}, 'id': None}
+        try:
+            send(f'{node}/web/webclient/version_info', json=payload)
+        except OSError:
+            self._failed(node)
+            return False
+        with self._lock:
+            self._down.pop(node, None)
+        return True
+
+    def _failed(self, node):
+        with self._lock:
+            self._down[node] = time.monotonic()
+
+    def _select(self, send, exclude):
+        with self._lock:
+            self._counter = start = (self._counter + 1) % len(self.nodes)
+            nodes = [node for node in self.nodes[start:] + self.nodes[:start] if node not in exclude]
+            now = time.monotonic()
+            due = [node for node in nodes if self._down.get(node, now) < now - self.retry_after]
+            for node in due:
+                self._down[node] = now  # Not checked by another thread
+        up = [node for node in nodes if node not in self._down or
+              (node in due and self._check_node(send, node))]
+        if not up:  # Try anyway
+            up = [min(nodes, key=lambda node: self._down.get(node, 0))] if nodes else [None]
+        if self.strategy == 'least_outstanding':
+            return min(up, key=self._outstanding.get)
+        return up[0]
+
+    def request(self, send, url, state=None, **kwargs):
+        """Send the request to one of the nodes, with function `send`.
+
+        With session affinity, the `state` keeps the node of the Web session.
+        """
+        (scheme, netloc, path, query, __) = urlsplit(url)
+        if f'{scheme}://{netloc}' not in self._outstanding:
+            return send(url, **kwargs)
+        (path, tried, last_exc) = (f"{path}{query and '?' + query}", [], None)
+        while True:
+            if state and state.node:
+                node = state.node
+            elif (node := self._select(send, tried)) is None:
+                raise last_exc or Error('no available node')
+            elif state:
+                state.node = node
+            with self._lock:
+                self._outstanding[node] += 1
+            try:
+                return send(node + path, **kwargs)
+            except OSError as err:
+                if getattr(err, 'code', None) or getattr(err, 'response', None) is not None:
+                    raise   # HTTP error
+                self._failed(node)
+                if state:   # The Web session is lost
+                    (state.node, authenticated, state.session_uid) = (None, state.session_uid, None)
+                if (state and authenticated) or not _is_refused(err):
+                    raise   # The request might be processed
+                tried.append(node)
+                last_exc = err
+            finally:
+                with self._lock:
+                    self._outstanding[node] -= 1
+
+
+def _is_refused(exc):
+    while exc is not None:
+        if isinstance(exc, ConnectionRefusedError):
+            return True
+        exc = getattr(exc, 'reason', None) or exc.__cause__ or exc.__context__
+    return False
+
+
+class _NodeSession(HTTPSession):
+    """HTTP session which spreads the requests on a :class:`NodePool`."""
+
+    def __init__(self, pool, state=None):
+        super().__init__()
+        (self._pool, self._state) = (pool, state)
+
+    def set_auth(self, uri, username, password):
+        for node in self._pool.nodes:
+            super().set_auth(node, username, password)
+
+    def request(self, url, **kwargs):
+        return self._pool.request(super().request, url, self._state, **kwargs)
+
+
+class RetryPolicy:
+    """Retry the calls which fail with a transient error.
+
+    The idempotent `methods` are retried after a network error, or when the
+    server is overloaded (HTTP 429, 502, 503 or 504).  All methods are retried
+    after a serialization failure, because the transaction is rolled back.
+    The delay grows exponentially from `backoff` seconds, with jitter, unless
+    the server sends a ``Retry-After`` header.
+
+    After `failure_threshold` consecutive failures, the circuit of the server
+    is open: the calls fail fast during `reset_timeout` seconds.  Any answer
+    of the server, even an error, closes the circuit.
+    """
+    retries = 3             # Max retries for a call
+    backoff = 0.5           # First delay, doubled for each retry
+    max_delay = 30.0
+    methods = _readonly_methods
+    failure_threshold = 5
+    reset_timeout = 30.0
+
+    def __init__(self, **kwargs):
+        for (attr, value) in kwargs.items():
+            if attr[:1] == '_' or not hasattr(RetryPolicy, attr):
+                raise TypeError(f"Unexpected argument {attr!r}")
+            setattr(self, attr, value)
+        self._circuits = {}     # Consecutive failures, and time of opening
+        self._lock = Lock()
+
+    def __call__(self, server, method, func):
+        """Call `func` and retry on transient errors."""
+        for attempt in range(self.retries + 1):
+            self._check(server)
+            try:
+                res = func()
+            except Exception as exc:
+                if (delay := self._delay(server, method, exc, attempt)) is None:
+                    raise
+                time.sleep(delay)
+                continue
+            if isawaitable(res):
+                return self._await(server, method, func, res)
+            self._succeeded(server)
+            return res
+
+    async def _await(self, server, method, func, res):
+        for attempt in range(self.retries + 1):
+            try:
+                res = await res
+            except Exception as exc:
+                if (delay := self._delay(server, method, exc, attempt)) is None:
+                    raise
+                await asyncio.sleep(delay)
+                self._check(server)
+                res = func()
+                continue
+            self._succeeded(server)
+            return res
+
+    def _delay(self, server, method, exc, attempt):
+        retry_after = None
+        if isinstance(exc, OSError) and _http_status(exc) in (None, 429, 502, 503, 504):
+            self._failed(server)
+            if method not in self.methods:
+                return None
+            retry_after = _retry_after(exc)
+        elif isinstance(exc, (ServerError, OSError)):
+            self._succeeded(server)     # The server answered
+            if not isinstance(exc, ServerError) or not _is_serialization_failure(exc):
+                return None
+        else:
+            return None
+        if attempt >= self.retries or (retry_after or 0) > self.max_delay:
+            return None
+        if retry_after is not None:
+            return retry_after
+        delay = min(self.max_delay, self.backoff * 2 ** attempt)
+        return delay / 2 + random.uniform(0, delay / 2)
+
+    def _check(self, server):
+        with self._lock:
+            (failures, opened) = self._circuits.get(server, (0, None))
+            if opened is None:
+                return
+            if (remaining := opened + self.reset_timeout - time.monotonic()) > 0:
+                raise Error(f"Error: Server is unavailable, retry in {remaining:.0f} s")
+            # Half-open: other calls fail fast, while this one is a trial
+            self._circuits[server] = (failures, time.monotonic())
+
+    def _failed(self, server):
+        with self._lock:
+            (failures, opened) = self._circuits.get(server, (0, None))
+            if (failures := failures + 1) >= self.failure_threshold:
+                opened = time.monotonic()
+            self._circuits[server] = (failures, opened)
+
+    def _succeeded(self, server):
+        if server in self._circuits:
+            with self._lock:
+                self._circuits.pop(server, None)
+
+
+def _http_status(exc):
+    return getattr(exc, 'code', None) or getattr(getattr(exc, 'response', None), 'status_code', None)
+
+
+def _http_headers(exc):
+    if isinstance(exc, HTTPError):  # Attribute 'response' fails before Python 3.10
+        return exc.headers
+    return getattr(getattr(exc, 'response', None), 'headers', None)
+
+
+def _retry_after(exc):
+    if not (value := (headers := _http_headers(exc)) and headers.get('retry-after')):
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _is_serialization_failure(exc):
+    # Odoo already retries a few times, and the transaction is rolled back
+    error = exc.args[0] if exc.args and isinstance(exc.args[0], dict) else {}
+    name = (error.get('data') or {}).get('name') or ''
+    return name.rpartition('.')[2] in _serialization_errors
+
+
+class RateLimiter:
+    """Limit the rate and the concurrency of the HTTP requests.
+
+    It is shared by the threads of a :class:`Client`.  The token bucket
+    allows `max_rps` requests per second, with bursts of `burst` requests.
+    The concurrency limit adapts to the server (AIMD): it is halved when
+    the server is overloaded (HTTP 429, 502, 503, 504 or timeout), or when
+    the average latency exceeds `max_latency` seconds.  Otherwise it grows
+    by one after each round of successful requests, up to `max_concurrency`.
+    """
+    max_rps = None          # Requests per second
+    burst = None            # Size of the token bucket, default is `max_rps`
+    max_concurrency = 16
+    max_latency = None      # Seconds
+    min_concurrency = 1
+
+    def __init__(self, max_rps=None, max_concurrency=None, max_latency=None, burst=None):
+        self.max_rps = max_rps or self.max_rps
+        self.max_concurrency = int(max_concurrency or self.max_concurrency)
+        self.max_latency = max_latency or self.max_latency
+        self.burst = burst or self.burst
+        self.limit = float(self.max_concurrency)
+        self.latency = None     # Moving average
+        self._tokens = self.burst or self.max_rps or 0
+        self._updated = self._decreased = time.monotonic()
+        self._active = 0
+        self._cond = Condition()
+
+    def __repr__(self):
+        return (f"<RateLimiter max_rps={self.max_rps} limit={int(self.limit)}/"
+                f"{self.max_concurrency} active={self._active}>")
+
+    def __call__(self, func):
+        """Call `func` when the limits allow it."""
+        self._acquire()
+        start = time.monotonic()
+        try:
+            res = func()
+        except Exception as exc:
+            self._release(start, _is_overload(exc))
+            raise
+        self._release(start, False)
+        return res
+
+    def _acquire(self):
+        if self.max_rps:  # Take a token, or book the next one
+            with self._cond:
+                now = time.monotonic()
+                burst = self.burst or self.max_rps
+                self._tokens = min(burst, self._tokens + (now - self._updated) * self.max_rps) - 1
+                self._updated = now
+                delay = max(0, -self._tokens / self.max_rps)
+            if delay:   # Wait for the token before taking a slot
+                time.sleep(delay)
+        with self._cond:
+            while self._active >= int(self.limit):
+                self._cond.wait()
+            self._active += 1
+
+    def _release(self, start, overloaded):
+        with self._cond:
+            self._active -= 1
+            elapsed = (now := time.monotonic()) - start
+            self.latency = elapsed if self.latency is None else 0.8 * self.latency + 0.2 * elapsed
+            if overloaded or (self.max_latency and self.latency > self.max_latency):
+                # Multiplicative decrease, ignoring requests sent before the last one
+                if start > self._decreased:
+                    self.limit = max(self.min_concurrency, self.limit / 2)
+                    self._decreased = now
+            else:  # Additive increase
+                self.limit = min(self.max_concurrency, self.limit + 1 / self.limit)
+            if (available := int(self.limit) - self._active) > 0:
+                self._cond.notify(available)
+
+
+def _is_overload(exc):
+    return _http_status(exc) in (429, 502, 503, 504) or isinstance(getattr(exc, 'reason', exc), TimeoutError)
+
+
+class _Metric:
+    __slots__ = ('count', 'errors', 'total', 'sent', 'received', 'buckets')
+
+    def __init__(self):
+        self.count = self.errors = self.total = self.sent = self.received = 0
+        self.buckets = {}
+
+    def add(self, elapsed, sent, received, error):
+        self.count += 1
+        self.errors += error
+        self.total += elapsed
+        self.sent += sent
+        self.received += received
+        # Histogram with 4 buckets per power of 2, in microseconds
+        (mantissa, exponent) = math.frexp(elapsed * 1E6)
+        index = exponent * 4 + int(mantissa * 8) - 4
+        self.buckets[index] = self.buckets.get(index, 0) + 1
+
+    def percentile(self, q):
+        rank = q * self.count
+        for index in sorted(self.buckets):
+            if (rank := rank - self.buckets[index]) <= 0:
+                (exponent, quarter) = divmod(index, 4)
+                return 2 ** (exponent - 1) * (1 + (quarter + 1) / 4) / 1E6     # Upper bound
+        return 0.0
+
+
+class _IOCount(local):
+    sent = received = 0
+
+
+class Stats:
+    """Metrics of the calls and the requests of a :class:`Client`.
+
+    For each protocol, model and method, it counts the calls, the errors
+    and the bytes sent and received, and it keeps a histogram of the latency.
+    The calls are measured in :meth:`Env.execute`, and the requests are
+    measured on the endpoints.  Set attribute `enabled` to switch it off.
+    """
+    enabled = True
+
+    def __init__(self):
+        self._io = _IOCount()
+        self._lock = Lock()
+        self.reset()
+
+    def reset(self):
+        """Reset the metrics."""
+        with self._lock:
+            (self._calls, self._requests) = ({}, {})
+
+    def summary(self):
+        """Return the metrics as a list of dictionaries."""
+        rows = []
+        with self._lock:
+            tables = [('call', {**self._calls}), ('request', {**self._requests})]
+        for (kind, table) in tables:
+            for ((protocol, model, method), metric) in sorted(table.items()):
+                rows.append({
+                    'kind': kind, 'protocol': protocol, 'model': model, 'method': method,
+                    'count': metric.count, 'errors': metric.errors, 'total': metric.total,
+                    'p50': metric.percentile(0.5), 'p95': metric.percentile(0.95), 'p99': metric.percentile(0.99),
+                    'sent': metric.sent, 'received': metric.received,
+                })
+        return rows
+
+    def report(self):
+        """Return the metrics, formatted as a table."""
+        lines = [f"{'':8} {'protocol':9} {'model / method':42} {'count':>6} {'errors':>6} "
+                 f"{'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'sent':>9} {'received':>9}"]
+        for row in self.summary():
+            name = f"{row['model']} / {row['method']}"
+            lines.append(f"{row['kind']:8} {row['protocol']:9} {name:42} {row['count']:6} {row['errors']:6} "
+                         f"{row['p50'] * 1E3:8.1f} {row['p95'] * 1E3:8.1f} {row['p99'] * 1E3:8.1f} "
+                         f"{row['sent']:9} {row['received']:9}")
+        return '\n'.join(lines)
+
+    def _count(self, sent=0, received=0):
+        (io := self._io).sent += sent
+        io.received += received
+
+    def _measure(self, table, key, func):
+        if not self.enabled:
+            return func()
+        (io, start) = (self._io, time.perf_counter())
+        (sent, received) = (io.sent, io.received)
+        try:
+            res = func()
+        except Exception:
+            self._record(table, key, start, sent, received, True)
+            raise
+        if isawaitable(res):
+            return self._await(table, key, start, res)
+        self._record(table, key, start, sent, received, False)
+        return res
+
+    async def _await(self, table, key, start, res):
+        # Bytes are not counted, because the coroutines are interleaved
+        try:
+            res = await res
+        except Exception:
+            self._record(table, key, start, None, None, True)
+            raise
+        self._record(table, key, start, None, None, False)
+        return res
+
+    def _record(self, table, key, start, sent, received, error):
+        elapsed = time.perf_counter() - start
+        if sent is not None:
+            (sent, received) = (self._io.sent - sent, self._io.received - received)
+        table = getattr(self, table)
+        with self._lock:
+            if (metric := table.get(key)) is None:
+                metric = table[key] = _Metric()
+            metric.add(elapsed, sent or 0, received or 0, error)
+
+
+def _call_hooks(hooks, io, key, args, func):
+    """Call `func` and fire the hooks registered with :meth:`Client.add_hook`."""
+    hooks = [*hooks]
+    info = {'protocol': key[0], 'model': key[1], 'method': key[2], 'args': args}
+    for (on_request, __, __) in hooks:
+        if on_request:
+            on_request(info)
+    (start, sent, received) = (time.perf_counter(), io.sent, io.received)
+    try:
+        res = func()
+    except Exception as exc:
+        info.update(elapsed=time.perf_counter() - start, sent=io.sent - sent, received=io.received - received)
+        for (__, __, on_error) in hooks:
+            if on_error:
+                on_error(info, exc)
+        raise
+    info.update(elapsed=time.perf_counter() - start, sent=io.sent - sent, received=io.received - received)
+    for (__, on_response, __) in hooks:
+        if on_response:
+            on_response(info, res)
+    return res
+
+
+class _ThreadState(local):
+    """HTTP session and Web session of the current thread."""
+    session_uid = node = None
+
+    def __init__(self, auth=(), nodes=None, sticky=False, limiter=None, stats=None, sessions=None):
+        self.http = HTTPSession() if nodes is None else _NodeSession(nodes, sticky and self or None)
+        (self.http.limiter, self.http.stats) = (limiter, stats)
+        if sessions is not None:    # The sessions of all threads
+            sessions.add(self.http)
+        self.batches = {}
+        self.deferred = {}
+        if auth:
+            self.http.set_auth(*auth)
+
+
+class AsyncHTTPSession:
+    """HTTP/1.1 client for :mod:`asyncio`, with keep-alive connections.
+
+    The number of concurrent requests is limited by `max_connections`.
+    The session should be used with a single event loop.
+    """
+    max_connections = 8     # Concurrent requests
+    pool_timeout = 60.0     # Idle connections are closed after some time
+
+    def __init__(self, max_connections=None):
+        self.max_connections = max_connections or self.max_connections
+        self._pool = {}
+        self._slots = self._auth = None
+
+    def set_auth(self, uri, username, password):
+        self._auth = 'Basic ' + base64.b64encode(f'{username}:{password}'.encode()).decode()
+
+    async def request(self, url, *, method='POST', data=None, json=None, headers=None, cookies=None):
+        """Send a request and return the decoded response.
+
+        The optional `cookies` dictionary is sent, and updated with
+        the cookies received.
+        """
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_connections)
+        rsvr = urlsplit(url)
+        (target, body) = (rsvr.path or '/', b'')
+        head = {'Host': rsvr.netloc, 'User-Agent': USER_AGENT, 'Accept': 'application/json'}
+        if json is not None:
+            (head['Content-Type'], body) = ('application/json', _json_dumps(json))
+        elif method == 'POST':
+            (head['Content-Type'], body) = ('application/x-www-form-urlencoded', urlencode(data or {}).encode())
+        elif data:
+            rsvr = rsvr._replace(query='&'.join(filter(None, [rsvr.query, urlencode(data)])))
+        if rsvr.query:
+            target += f'?{rsvr.query}'
+        if self._auth:
+            head['Authorization'] = self._auth
+        if cookies:
+            head['Cookie'] = '; '.join(f'{key}={val}' for (key, val) in cookies.items())
+        head.update(headers or ())
+        head['Content-Length'] = str(len(body))
+        message = ''.join([f'{method} {target} HTTP/1.1\r\n', *(f'{key}: {val}\r\n' for (key, val) in head.items()),
+                           '\r\n']).encode('latin-1') + body
+        key = (rsvr.scheme, rsvr.hostname, rsvr.port or (443 if rsvr.scheme == 'https' else 80))
+        async with self._slots:
+            (status, reason, resp_headers, content) = await self._send(key, message, method)
+        if cookies is not None:
+            for value in resp_headers.get('set-cookie', ()):
+                (name, __, value) = value.split(';', 1)[0].partition('=')
+                cookies[name.strip()] = value.strip()
+        is_json = 'json' in ''.join(resp_headers.get('content-type', ()))
+        result = _json_loads(content) if is_json and content else content.decode()
+        if status >= 300:
+            if result and status in (401, 403, 404, 422, 500):
+                raise _server_error(status, result, 'HTTPError')
+            exc = OSError(f'HTTP Error {status}: {reason}')
+            (exc.code, exc.headers) = (status, {name: values[-1] for (name, values) in resp_headers.items()})
+            raise exc
+        return result
+
+    async def _send(self, key, message, method):
+        while True:
+            (reader, writer, reused) = await self._get_conn(key)
+            try:
+                writer.write(message)
+                await writer.drain()
+                (status, reason, headers, content, keep_alive) = await self._read_response(reader, method)
+            except BaseException as exc:
+                writer.close()
+                if reused and isinstance(exc, (ConnectionError, EOFError)):
+                    continue    # Stale connection, closed by the server
+                raise
+            if keep_alive:
+                self._pool.setdefault(key, []).append((reader, writer, time.monotonic()))
+            else:
+                writer.close()
+            return status, reason, headers, content
+
+    async def _get_conn(self, key):
+        idle = self._pool.get(key) or []
+        while idle:
+            (reader, writer, idle_since) = idle.pop()
+            if time.monotonic() - idle_since < self.pool_timeout and not reader.at_eof():
+                return reader, writer, True
+            writer.close()
+        (scheme, host, port) = key
+        ssl_context = (http_context or True) if scheme == 'https' else None
+        (reader, writer) = await asyncio.open_connection(host, port, ssl=ssl_context)
+        return reader, writer, False
+
+    @staticmethod
+    async def _read_response(reader, method):
+        if not (line := await reader.readline()):
+            raise ConnectionResetError('Connection closed by the server')
+        (version, status, reason) = (line.decode('latin-1').rstrip('\r\n').split(' ', 2) + [''])[:3]
+        headers = {}
+        while (line := await reader.readline()).strip():
+            (name, __, value) = line.decode('latin-1').partition(':')
+            headers.setdefault(name.strip().lower(), []).append(value.strip())
+        (status, keep_alive) = (int(status), version == 'HTTP/1.1')
+        keep_alive = keep_alive and 'close' not in ','.join(headers.get('connection', ())).lower()
+        if method == 'HEAD' or status in (204, 304) or status < 200:
+            content = b''
+        elif 'chunked' in ','.join(headers.get('transfer-encoding', ())).lower():
+            chunks = []
+            while size := int((await reader.readline()).split(b';')[0], 16):
+                chunks.append((await reader.readexactly(size + 2))[:-2])
+            while (await reader.readline()).strip():
+                pass    # Trailer
+            content = b''.join(chunks)
+        elif 'content-length' in headers:
+            content = await reader.readexactly(int(headers['content-length'][0]))
+        else:
+            (content, keep_alive) = (await reader.read(), False)
+        return status, reason, headers, content, keep_alive
+
+    async def close(self):
+        """Close the idle connections."""
+        (pool, self._pool) = (self._pool, {})
+        for (__, writer, __) in [conn for conns in pool.values() for conn in conns]:
+            writer.close()
 
 
 Ids, Id1 = type('ids', (list,), {'__slots__': ()}), type('id1', (int,), {'__slots__': ()})
@@ -253,6 +1208,23 @@ def format_params(params, hide=('passw', 'pwd')):
             for (key, v) in {**params, **secret}.items()]
 
 
+def _hide_secrets(args, endpoint=None, hide=('passw', 'pwd')):
+    """Return the arguments of a request, without the passwords."""
+    if isinstance(args, dict):
+        return {key: '*' if any(sub in key for sub in hide) else value for (key, value) in args.items()}
+    if endpoint == 'db':    # Master password
+        return ('*', *args[1:]) if args else args
+    return args[:2] + ('*',) + args[3:] if len(args) > 2 else args
+
+
+def _server_error(status_code, result, name):
+    # Unauthorized, Forbidden, NotFound, UnprocessableContent, InternalServerError
+    if isinstance(result, str):
+        lines = re.findall(r'>([^>\n]+)<', result) or (status_code, result)
+        result = {'name': name, 'debug': None, 'arguments': (f'{lines[0]} - {lines[-1]}',)}
+    return ServerError({'code': status_code, 'data': result})
+
+
 def format_exception(exc_type, exc, tb, limit=None, chain=True,
                      _format_exception=traceback.format_exception, **kw):
     """Format a stack trace and the exception information.
@@ -296,6 +1268,7 @@ def read_config(section=None):
     ``scheme / host / port / protocol``.
     Default values are read from the ``[DEFAULT]`` section.  If the ``password``
     is not set or is empty, it is requested on login.
+    Optional ``max_rps`` and ``max_concurrency`` configure a :class:`RateLimiter`.
     Return tuple ``(server, db or None, user, password or None, api_key or None)``.
     Without argument, it returns the list of configured environments.
     """
@@ -393,6 +1366,74 @@ def extract_http_response(method, result, regex):
     return found and (found.group(1) if regex else json.loads(found.group(1)))
 
 
+class _JsonStream:
+    """Iterate on a JSON array, or on the "result" array of a JSON-RPC
+    response, and yield each item as soon as it is received.
+
+    Argument `chunks` is an iterable of UTF-8 encoded bytes.
+    """
+    _decode = json.JSONDecoder().raw_decode
+    _skip_ws = re.compile(r'[ \t\n\r]*').match
+
+    def __init__(self, chunks):
+        self._chunks = iter(chunks)
+        self._text = codecs.getincrementaldecoder('utf-8')()
+        self._buf, self._pos = '', 0
+
+    def _read(self):
+        if (chunk := next(self._chunks, None)) is None:
+            raise ValueError('Unexpected end of JSON data')
+        self._buf = self._buf[self._pos:] + self._text.decode(chunk)
+        self._pos = 0
+
+    def _next_char(self):
+        while (pos := self._skip_ws(self._buf, self._pos).end()) >= len(self._buf):
+            self._read()
+        self._pos = pos
+        return self._buf[pos]
+
+    def _expect(self, chars):
+        if (char := self._next_char()) not in chars:
+            raise ValueError(f'Unexpected {char!r} at position {self._pos}')
+        self._pos += 1
+        return char
+
+    def _value(self):
+        self._next_char()
+        while True:
+            try:
+                (value, end) = self._decode(self._buf, self._pos)
+                if end < len(self._buf):  # A number could be truncated
+                    self._pos = end
+                    return value
+            except ValueError:
+                pass
+            self._read()
+
+    def __iter__(self):
+        if self._next_char() == '{':    # JSON-RPC response
+            self._expect('{')
+            while True:
+                key = self._value()
+                self._expect(':')
+                if key == 'result' and self._next_char() == '[':
+                    break
+                value = self._value()
+                if key == 'error':
+                    raise ServerError(value)
+                if key == 'result':
+                    yield value
+                if self._expect(',}') == '}':
+                    return
+        self._expect('[')
+        if self._next_char() == ']':
+            return
+        while True:
+            yield self._value()
+            if self._expect(',]') == ']':
+                return
+
+
 class partial(functools.partial):
     __slots__ = ()
 
@@ -401,6 +1442,372 @@ class partial(functools.partial):
         return f"{self.__class__.__name__}({self.func!r}, ...)"
 
 
+class _Future(Future):
+    """Result of a call in a :class:`Batch`.
+
+    Pending calls are executed when the result is requested.
+    """
+
+    def __init__(self, flush):
+        super().__init__()
+        self._flush = flush
+
+    def result(self, timeout=None):
+        if not self.done():
+            self._flush()
+        return super().result(timeout)
+
+    def then(self, func):
+        """Return a new :class:`Future` for ``func(self.result())``."""
+        future = _Future(self._flush)
+
+        def callback(source):
+            try:
+                future.set_result(func(source.result()))
+            except Exception as exc:
+                future.set_exception(exc)
+        self.add_done_callback(callback)
+        return future
+
+
+def _then(result, func):
+    if isinstance(result, _Future):
+        return result.then(func)
+    return _await_then(result, func) if isawaitable(result) else func(result)
+
+
+async def _await_then(result, func):
+    return func(await result)
+
+
+class _SingleFlight:
+    """Share the result of identical calls which are in flight.
+
+    The first caller sends the request.  The other callers wait for
+    its result.  When the result is shared, each caller receives its
+    own copy, because the records are converted in place.
+    """
+    max_ids = 1000      # Calls on more ids are not shared
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = Lock()
+
+    def _key(self, env, obj, method, params, kw):
+        if params and isinstance(params[0], list) and len(params[0]) > self.max_ids:
+            return None
+        try:
+            return (env.db_name, env.uid, obj, method, _json_dumps([params, kw]))
+        except (TypeError, ValueError):
+            return None     # Not serializable, like a date in local mode
+
+    def __call__(self, key, func):
+        with self._lock:
+            if first := (flight := self._calls.get(key)) is None:
+                self._calls[key] = flight = Future()
+                flight.waiters = 0
+            else:
+                flight.waiters += 1
+        copy = partial(self._copy, flight)
+        if first:
+            try:
+                res = func()
+            except BaseException as exc:
+                self._land(key, flight.set_exception, exc)
+                raise
+            if not isawaitable(res):
+                return copy(self._land(key, flight.set_result, res))
+            flight.set_result(res := asyncio.ensure_future(res))
+            res.add_done_callback(lambda __: self._calls.pop(key, None))
+        else:
+            res = flight.result()
+        return _await_then(asyncio.shield(res), copy) if isawaitable(res) else copy(res)
+
+    def _land(self, key, set_result, value):
+        with self._lock:
+            del self._calls[key]
+        set_result(value)
+        return value
+
+    @staticmethod
+    def _copy(flight, res):
+        # The raw result is never returned when it is shared
+        return deepcopy(res) if flight.waiters else res
+
+
+class MetadataCache:
+    """Persistent cache of the metadata of the models, in directory `path`.
+
+    It keeps the fields of the models, the list of models and the
+    arguments of the JSON-2 methods, in one file per server and database.
+    When a database is used first, three small requests check the registry:
+    if a module was installed, upgraded or removed, its cache is cleared.
+    If some fields were changed, only their models are discarded.
+    Without access to the registry, the cache is not used by this user.
+    The changes are saved on exit, or with :meth:`save`.
+    """
+    _sections = ('fingerprint', 'model_names', 'fields', 'methods')
+    _unavailable = set()    # Server, database and uid without access to the registry
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self._stores = {}
+        self._lock = Lock()
+        _metadata_caches.add(self)
+
+    def save(self):
+        """Write the changes to the disk."""
+        with self._lock:
+            changed = [store for store in self._stores.values() if store['dirty']]
+            for store in changed:
+                store['dirty'] = False
+            data = [{'key': store['key'], **{name: store[name] and {**store[name]} for name in self._sections}}
+                    for store in changed]
+        for values in data:
+            self.path.mkdir(parents=True, exist_ok=True)
+            (tmp := (path := self._file(values['key'])).with_suffix('.tmp')).write_bytes(
+                gzip.compress(_json_dumps(values), 1))
+            os.replace(tmp, path)
+
+    def clear(self):
+        """Discard the metadata of all databases."""
+        with self._lock:
+            self._stores.clear()
+        for path in self.path.glob('*.json.gz'):
+            path.unlink()
+
+    def _file(self, key):
+        return self.path / f"{hashlib.sha1(' '.join(key).encode()).hexdigest()[:20]}.json.gz"
+
+    def _load(self, key):
+        store = {'key': [*key], 'fingerprint': {}, 'model_names': None, 'fields': {}, 'methods': {}}
+        try:
+            values = _json_loads(gzip.decompress(self._file(key).read_bytes()))
+            if values.get('key') == store['key']:
+                store.update({name: values[name] for name in self._sections})
+        except (OSError, ValueError, KeyError):
+            pass
+        store.update(valid=False, dirty=False)
+        return store
+
+    def _open(self, env):
+        """Load and check the metadata of the database of `env`."""
+        key = (env.client._server, env.db_name)
+        if (store := self._stores.get(key)) is not None and store['valid']:
+            return True
+        if (*key, env.uid) in self._unavailable:
+            return False
+        with self._lock:
+            if (store := self._stores.get(key)) is None:
+                store = self._stores[key] = self._load(key)
+            if not store['valid']:
+                try:
+                    self._check(env, store)
+                except (Error, ServerError, OSError):
+                    self._unavailable.add((*key, env.uid))
+                    return False    # No access to the registry
+        return store['valid']
+
+    def _check(self, env, store):
+        # Bypass the batch of the Env: these requests are sent immediately
+        (old, call) = (store['fingerprint'], env._execute_kw)
+        last = {'order': 'write_date desc', 'limit': 1}
+        [module] = call('ir.module.module', 'search_read', ([], ['write_date']), last) or [{}]
+        count = call('ir.model.fields', 'search_count', ([],))
+        if not (date := old.get('date')):
+            [field] = call('ir.model.fields', 'search_read', ([], ['write_date']), last) or [{}]
+            date = field.get('write_date')
+        # The fields of the last second are returned again, unless they are on the edge
+        rows = date and call('ir.model.fields', 'search_read', ([('write_date', '>=', date)],
+                             ['model', 'create_date', 'write_date']), {'order': 'write_date desc'}) or []
+        edge = {*old.get('edge', ())}
+        changed = [row for row in rows if row['id'] not in edge or row['write_date'] != date]
+        created = sum(row['id'] not in edge and row['create_date'] >= date for row in changed)
+        date = rows[0]['write_date'] if rows else date
+        fingerprint = {'modules': module.get('write_date'), 'fields': count, 'date': date,
+                       'edge': [row['id'] for row in rows if row['write_date'] == date]}
+        if not old or old['modules'] != fingerprint['modules'] or old['fields'] + created != count:
+            store.update(model_names=None, fields={}, methods={})
+        elif stale := {row['model'] for row in changed}:
+            for name in stale:
+                store['fields'].pop(name, None)
+                store['methods'].pop(name, None)
+            if store['model_names'] is not None and stale - store['model_names'].keys():
+                store['model_names'] = None     # New models
+        store.update(fingerprint=fingerprint, valid=True, dirty=fingerprint != old)
+
+    def _get(self, key, section, name=None):
+        if (store := self._stores.get(key)) is None or not store['valid']:
+            return None
+        return store[section] if name is None else store[section].get(name)
+
+    def _set(self, key, section, value, name=None):
+        with self._lock:
+            if (store := self._stores.get(key)) is None or not store['valid']:
+                return
+            if name is None:
+                store[section] = value
+            else:
+                store[section][name] = value
+            store['dirty'] = True
+
+    def _invalidate(self, key):
+        if (store := self._stores.get(key)) is not None:
+            store['valid'] = False
+
+
+_metadata_caches = WeakSet()    # Saved on exit
+
+
+@atexit.register
+def _save_metadata_caches():
+    for cache in [*_metadata_caches]:
+        cache.save()
+
+
+def _sizeof(obj, depth=4):
+    """Approximate size of nested containers, in bytes."""
+    size = sys.getsizeof(obj)
+    if not depth:
+        return size
+    if isinstance(obj, dict):
+        return size + sum(_sizeof(key, 0) + _sizeof(value, depth - 1) for (key, value) in obj.items())
+    if isinstance(obj, (list, tuple, set, frozenset)):
+        return size + sum(_sizeof(value, depth - 1) for value in obj)
+    if hasattr(obj, '__dict__'):
+        return size + _sizeof(obj.__dict__, 1)
+    return size
+
+
+class EnvCache(MutableMapping):
+    """Cache of the environments, the fields and the credentials.
+
+    It is shared by all instances of :class:`Env`, as ``Env._cache``.
+    The least recently used entries are evicted when there are more than
+    `maxsize` entries, or when their approximate size exceeds `maxbytes`.
+    An entry larger than `maxbytes` is not stored.  The credentials, the
+    model names and the root :class:`Env` of each database are never
+    evicted.  The size of an :class:`Env` includes its cached records,
+    which are bounded by ``Env._max_records`` too.
+    """
+    maxsize = 1024
+    maxbytes = 64 << 20
+
+    def __init__(self, maxsize=None, maxbytes=None):
+        if maxsize is not None:
+            self.maxsize = int(maxsize)
+        if maxbytes is not None:
+            self.maxbytes = int(maxbytes)
+        self._data = OrderedDict()
+        self._sizes = {}
+        self._lock = RLock()
+        self.size = self.hits = self.misses = self.evictions = 0
+
+    def __repr__(self):
+        return f"<EnvCache entries={len(self._data)} size={self.size} maxsize={self.maxsize}>"
+
+    def __getitem__(self, key):
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                raise
+            self._data.move_to_end(key)
+            self.hits += 1
+        return value
+
+    def __setitem__(self, key, value):
+        with self._lock:
+            self._discard(key)
+            size = _sizeof(value) + getattr(value, '_records_size', 0)
+            if size > self.maxbytes and not self._pinned(key):
+                self.evictions += 1     # Too large to be cached
+                return
+            self._data[key] = value
+            self._sizes[key] = size
+            self.size += size
+            self._evict(key)
+
+    def __delitem__(self, key):
+        with self._lock:
+            if not self._discard(key):
+                raise KeyError(key)
+
+    def __iter__(self):
+        return iter([*self._data])
+
+    def __len__(self):
+        return len(self._data)
+
+    def __contains__(self, key):
+        return key in self._data
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def setdefault(self, key, default=None):
+        with self._lock:
+            if key in self._data:
+                return self[key]
+            self[key] = default
+        return default
+
+    def pop(self, key, *default):
+        with self._lock:
+            value = self._data.get(key, *default) if default else self._data[key]
+            self._discard(key)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+            self._sizes.clear()
+            self.size = 0
+
+    def copy(self):
+        return dict(self._data)
+
+    def cache_info(self):
+        """Return the counters of the cache, as a dictionary."""
+        return {'entries': len(self._data), 'size': self.size, 'hits': self.hits,
+                'misses': self.misses, 'evictions': self.evictions}
+
+    @staticmethod
+    def _pinned(key):
+        # Credentials, model names and root Env
+        return not isinstance(key[0], (bytes, tuple))
+
+    def _resize(self, key, delta):
+        # An entry grows or shrinks, like the records of an Env
+        with self._lock:
+            if key in self._sizes:
+                self._sizes[key] += delta
+                self.size += delta
+                if delta > 0:
+                    self._evict(key)
+
+    def _discard(self, key):
+        if key not in self._data:
+            return False
+        del self._data[key]
+        self.size -= self._sizes.pop(key)
+        return True
+
+    def _evict(self, keep):
+        while len(self._data) > self.maxsize or self.size > self.maxbytes:
+            # The new entry is evicted last
+            last = keep if keep in self._data and not self._pinned(keep) else None
+            key = next((key for key in self._data if key != keep and not self._pinned(key)), last)
+            if key is None:
+                return
+            self._discard(key)
+            self.evictions += 1
+
+
 class Error(Exception):
     """An Odooly error."""
 
@@ -452,6 +1859,8 @@ class WebAPI:
         self._endpoint = f'/{endpoint}'
         self._methods = [*methods]
         self._printer = client._printer
+        self._stats = client.stats
+        self._hooks = client._hooks
 
     def __repr__(self):
         return f"<WebAPI '{self._server[:-1]}{self._endpoint}'>"
@@ -464,16 +1873,24 @@ class WebAPI:
             return self._request(f'{name}/{_func}' if _func else name, params)
         return _memoize(self, name, wrapper)
 
-    def _request(self, path, params=None):
+    def _request(self, path, params=None, stream=False):
+        dispatch = partial(self._dispatch, path, params)
+        if stream:
+            dispatch = partial(dispatch, stream=True)
+        key = ('Web API', *((params['model'], params['method']) if path == 'call_kw' else (self._endpoint[1:], path)))
+        dispatch = partial(self._stats._measure, '_requests', key, dispatch)
+        if self._hooks:
+            dispatch = partial(_call_hooks, self._hooks, self._stats._io, key, params and _hide_secrets(params), dispatch)
         if not self._printer:
-            return self._dispatch(path, params)
+            return dispatch()
         if self._endpoint == '/doc':
             snt = [f'GET /doc/{path}.json']
         else:
             snt = [f'POST {self._endpoint}/{path}'] + format_params(params)
         with self._printer as log:
             log.print_sent(' '.join(snt))
-            log.print_recv(repr(res := self._dispatch(path, params)))
+            res = dispatch()
+            log.print_recv('<stream>' if stream else repr(res))
         return res
 
 
@@ -495,6 +1912,9 @@ class Service:
         self._endpoint = endpoint
         self._methods = methods
         self._printer = client._printer
+        self._stats = client.stats
+        self._hooks = client._hooks
+        self._protocol = client._proxy._protocol_name
 
     def __repr__(self):
         return f"<Service '{self._rpcpath}|{self._endpoint}'>"
@@ -511,12 +1931,21 @@ class Service:
                 args = args[:2] + ('*',) + args[3:]
             return ', '.join(repr(arg) for arg in args)
 
-        def wrapper(self, *args):
+        def wrapper(self, *args, stream=False):
+            dispatch = partial(self._dispatch, name, args)
+            if stream:
+                dispatch = partial(dispatch, stream=True)
+            key = (self._protocol, *(args[3:5] if name in ('execute', 'execute_kw') else (self._endpoint, name)))
+            dispatch = partial(self._stats._measure, '_requests', key, dispatch)
+            if self._hooks:
+                secure_args = _hide_secrets(args, self._endpoint)
+                dispatch = partial(_call_hooks, self._hooks, self._stats._io, key, secure_args, dispatch)
             if not self._printer:
-                return self._dispatch(name, args)
+                return dispatch()
             with self._printer as log:
                 log.print_sent(f"{self._endpoint}.{name}({sanitize(args)})")
-                log.print_recv(repr(res := self._dispatch(name, args)))
+                res = dispatch()
+                log.print_recv('<stream>' if stream else repr(res))
             return res
         return _memoize(self, name, wrapper)
 
@@ -531,7 +1960,7 @@ class Json2:
     _doc_endpoint = '/doc-bearer'
 
     def __init__(self, client, database, api_key):
-        self._http = HTTPSession()
+        self._set_http(client)
         self._server = urljoin(client._server, '/')
         self._headers = {
             'Authorization': f'Bearer {api_key}',
@@ -539,19 +1968,35 @@ class Json2:
             'X-Odoo-Database': database or '',
         }
         self._method_params = {'base': dict(_base_method_params)}
+        (self._metadata, self._metadata_key) = (client.metadata_cache, (client._server, database))
         self._printer = client._printer
+        self._stats = client.stats
+        self._hooks = client._hooks
+
+    @property
+    def _http(self):
+        return self._local.http
+
+    def _set_http(self, client):
+        # The sessions are closed with the client
+        self._local = _ThreadState(nodes=client.nodes, limiter=client.limiter, stats=client.stats,
+                                   sessions=client._sessions)
 
     def doc(self, model):
         """Documentation of the `model`."""
         model_doc = self._request(f'{self._doc_endpoint}/{model}.json')
         if model not in self._method_params:
-            method_params = Model._parse_doc_methods(model_doc)
-            self._method_params[model] = dict(method_params)
+            method_params = self._method_params[model] = dict(Model._parse_doc_methods(model_doc))
+            if self._metadata:
+                self._metadata._set(self._metadata_key, 'methods', method_params, model)
         return model_doc
 
     def _methods(self, model):
         if model not in self._method_params:
-            self.doc(model)
+            if self._metadata and (method_params := self._metadata._get(self._metadata_key, 'methods', model)):
+                self._method_params[model] = method_params
+            else:
+                self.doc(model)
         return self._method_params[model]
 
     def _prepare_params(self, model, method, args, kwargs):
@@ -567,10 +2012,10 @@ class Json2:
             print(f"Method {method!r} on {model!r} called with extra args: {args[len(arg_names):]}")
         return params
 
-    def __call__(self, model, method, args, kw=None):
+    def __call__(self, model, method, args, kw=None, stream=False):
         """Execute API call on the `model`."""
         params = self._prepare_params(model, method, args, kw or {})
-        return self._request(f'{self._endpoint}/{model}/{method}', params)
+        return self._request(f'{self._endpoint}/{model}/{method}', params, stream=stream)
 
     def __repr__(self):
         return f"<Json2 '{self._server[:-1]}{self._endpoint}'>"
@@ -583,18 +2028,199 @@ class Json2:
             return False
         return self if (not uid or uid == context['uid']) else False
 
-    def _request(self, path, params=None):
+    def _request(self, path, params=None, stream=False):
         url = urljoin(self._server, path)
         verb = 'GET' if params is None else 'POST'
+        request = partial(self._http.request, url, method=verb, json=params, headers=self._headers)
+        if stream:
+            request = partial(request, stream=True)
+        key = (self._protocol_name, *path.rsplit('/', 2)[-2:])
+        request = partial(self._stats._measure, '_requests', key, request)
+        if self._hooks:
+            request = partial(_call_hooks, self._hooks, self._stats._io, key, params and _hide_secrets(params), request)
         if not self._printer:
-            return self._http.request(url, method=verb, json=params, headers=self._headers)
+            return request()
         with self._printer as log:
             log.print_sent(' '.join([verb, path] + format_params(params or {})))
-            res = self._http.request(url, method=verb, json=params, headers=self._headers)
-            log.print_recv(repr(res))
+            res = request()
+            log.print_recv('<stream>' if stream else repr(res))
         return res
 
 
+class Batch:
+    """Queue of calls executed on the server in a single round trip.
+
+    Use :meth:`Env.batch` to create it.  The methods ``create``, ``read``,
+    ``search``, ``search_count``, ``search_read``, ``write`` and ``unlink``
+    return a :class:`~concurrent.futures.Future` instead of the result.
+    The queued calls are sent when the block exits, or when :meth:`flush`
+    is called, or when the result of a Future is requested.
+    They run in order, in a single transaction per flush.
+    """
+    batch_size = 1000   # Flush automatically when the queue is full
+
+    def __init__(self, env):
+        self.env = env
+        self._calls = []
+
+    def __repr__(self):
+        return f"<Batch {self.env!r} pending={len(self._calls)}>"
+
+    def __enter__(self):
+        self.env._batch = self
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.env._batch = None
+        if exc_type is None:
+            self.flush()
+        for (__, future) in self._calls:
+            future.cancel()
+        self._calls = []
+
+    def _add(self, obj, method, params, kw, finish=None):
+        self._calls.append(((obj, method, params, kw), future := _Future(self.flush)))
+        if len(self._calls) >= self.batch_size:
+            self.flush()
+        return future.then(finish) if finish else future
+
+    def flush(self):
+        """Execute the pending calls and set the results."""
+        if not (calls := self._calls):
+            return
+        (self._calls, batch, self.env._batch) = ([], self.env._batch, None)
+        try:
+            results = self.env._run_batch([call for (call, __) in calls])
+        except Exception as exc:
+            for (__, future) in calls:
+                future.set_exception(exc)
+            raise
+        finally:
+            self.env._batch = batch
+        for ((__, future), result) in zip(calls, results):
+            future.set_result(result)
+
+
+class DeferredWrites:
+    """Buffer of the values assigned to the attributes of the records.
+
+    Use :meth:`Env.deferred_writes` to create it.  The values assigned to
+    the same record are merged, and the records with identical values are
+    written together, with one ``write`` call per chunk of :attr:`chunk_size`
+    records.  The writes are sent when the block exits, or when :meth:`flush`
+    is called, or before any other call to the server.
+    """
+    chunk_size = 1000   # Records per write
+
+    def __init__(self, env):
+        self.env = env
+        self._pending = {}
+
+    def __repr__(self):
+        return f"<DeferredWrites {self.env!r} pending={len(self._pending)}>"
+
+    def __enter__(self):
+        self.env._deferred = self
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.env._deferred = None
+        if exc_type is None:
+            self.flush()
+        self._pending = {}
+
+    def _add(self, record, values):
+        self._pending.setdefault((record._model, record.id), {}).update(values)
+        if cached := self.env._records.get((record._name, record.id)):
+            for key in values.keys() & cached.keys():
+                del cached[key]
+
+    def flush(self):
+        """Write the pending values."""
+        (pending, self._pending, groups) = (self._pending, {}, {})
+        for ((model, id_), values) in pending.items():
+            values = model._unbrowse_values(values)
+            groups.setdefault((model, repr(sorted(values.items()))), ([], values))[0].append(id_)
+        size = self.chunk_size
+        for ((model, __), (ids, values)) in groups.items():
+            for idx in range(0, len(ids), size):
+                RecordList(model, ids[idx:idx + size]).write(values)
+
+
+class _BulkCreate:
+    """Chunks and results of :meth:`Model.create_bulk`.
+
+    The pending calls are futures or tasks, mapped to their chunk.
+    They are cancelled on exit.
+    """
+
+    def __init__(self, model, values, chunk_size, progress, errors):
+        (self.model, self.values, self.chunk_size) = (model, values, chunk_size)
+        (self.progress, self.errors) = (progress, errors)
+        (self.start, self.results, self.pending) = (time.perf_counter(), {}, {})
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        for future in self.pending:
+            future.cancel()
+
+    def chunks(self):
+        (iterator, offset) = (iter(self.values), 0)
+        while chunk := [*islice(iterator, self.chunk_size)]:
+            yield (offset, chunk)
+            offset += len(chunk)
+
+    def create(self, chunk):
+        # In the task, so the errors are reported with the offset of the chunk
+        return self.model._execute('create', [self.model._unbrowse_values(vals) for vals in chunk])
+
+    def collect(self, done):
+        for future in sorted(done, key=lambda future: self.pending[future][0]):
+            (offset, chunk) = self.pending.pop(future)
+            if (exc := future.exception()) is None:
+                self.results[offset] = future.result()
+            elif self.errors is None:
+                raise exc
+            else:
+                self.errors.append((offset, chunk, exc))
+            if self.progress:
+                self.progress(sum(map(len, self.results.values())), time.perf_counter() - self.start)
+
+    def records(self):
+        ids = [id_ for offset in sorted(self.results) for id_ in self.results[offset]]
+        return RecordList(self.model, ids)
+
+
+class _SearchPages:
+    """Pagination of :meth:`Model.search_iter`, with ``id > last_id``.
+
+    Iterate over the calls, and convert their results with :meth:`items`.
+    """
+
+    def __init__(self, model, domain, fields, batch_size):
+        ([self.domain], self.last_id) = (searchargs((domain or [],)), 0)
+        (self.model, self.fields, self.batch_size) = (model, fields, batch_size)
+        if fields is not None:
+            (self.fields, self.fmt) = model._parse_format(fields, browse=False)
+
+    def __iter__(self):
+        while self.last_id is not None:
+            (keyset, kwargs) = ([('id', '>', self.last_id), *self.domain], {'order': 'id', 'limit': self.batch_size})
+            if self.fields is None:
+                yield partial(self.model._execute, 'search', keyset, **kwargs)
+            else:
+                yield partial(self.model._execute, 'search_read', keyset, self.fields, **kwargs)
+
+    def items(self, result):
+        ids = result if self.fields is None else [row['id'] for row in result]
+        self.last_id = ids[-1] if len(ids) >= self.batch_size else None
+        if self.fields is None:
+            return [self.model.browse(ids)] if ids else []
+        return self.fmt(result)
+
+
 class Env:
     """An environment wraps data for Odoo models and records:
 
@@ -607,9 +2233,13 @@ class Env:
         >>> env["some.model"]
     """
 
-    name = uid = user = session_info = _api_key = _doc = _json2 = _access_models = None
+    name = uid = user = session_info = _api_key = _doc = _json2 = _access_models = _cache_key = None
     _class_ids = Ids, Id1
-    _cache = {}
+    _cache = EnvCache()
+    _max_records = 10_000
+    _records_size = 0       # Counted in the size of the Env in EnvCache
+    _prefetch_index = (None, None)  # Last prefetch group, and the positions of its ids
+    _prefetch_max = 1000
 
     def __new__(cls, client, db_name=()):
         if db_name:
@@ -619,6 +2249,7 @@ class Env:
         if not db_name or client.env.db_name:
             env = object.__new__(cls)
             env.client, env.db_name, env.context = client, db_name, {}
+            env._records = OrderedDict()
         else:
             env, env.db_name = client.env, db_name
         if db_name:
@@ -626,6 +2257,28 @@ class Env:
             env._models = {}
         return env
 
+    @property
+    def _batch(self):
+        return self.client._local.batches.get(self)
+
+    @_batch.setter
+    def _batch(self, batch):
+        if batch is None:
+            self.client._local.batches.pop(self, None)
+        else:
+            self.client._local.batches[self] = batch
+
+    @property
+    def _deferred(self):
+        return self.client._local.deferred.get(self)
+
+    @_deferred.setter
+    def _deferred(self, deferred):
+        if deferred is None:
+            self.client._local.deferred.pop(self, None)
+        else:
+            self.client._local.deferred[self] = deferred
+
     def __contains__(self, name):
         """Test wether this model exists."""
         return name in self.models(name)
@@ -692,6 +2345,7 @@ class Env:
             self.refresh()
         if not self.uid:
             # Cache the unauthenticated Env and the client
+            self._cache_key = (Env, self.db_name, self.client._server)
             self._cache_set(Env, self)
         # Update credentials in cache
         auth_cache[user] = uid, password
@@ -720,10 +2374,11 @@ class Env:
         return api_key
 
     def _configure(self, uid, user, password, api_key, context, session):
-        env = Env(self.client)
+        env = type(self)(self.client)
         (env.db_name, env.name) = (self.db_name, self.name)
         env._model_names = self._model_names
         env._models = {}
+        env._cache_key = (self._env_key(uid, context), self.db_name, self.client._server)
 
         # Setup uid and user
         if isinstance(user, Record):
@@ -769,11 +2424,12 @@ class Env:
             (uid, user, session) = (self.uid, self.user, self.session_info)
         else:
             return self
-        env_key = bytes.fromhex(f"{uid:08x}{hash(json.dumps(context, sort_keys=1)) % 2**32:08x}")
-        if (env := self._cache_get(env_key)) is None:
-            env = self._configure(uid, user, password, api_key, context, session)
-            env._cache_set(env_key, env)
-        return env
+        configure = partial(self._configure, uid, user, password, api_key, context, session)
+        return self._cache_get(self._env_key(uid, context), configure)
+
+    @staticmethod
+    def _env_key(uid, context):
+        return bytes.fromhex(f"{uid:08x}{hash(_json_dumps(context, sort_keys=True)) % 2**32:08x}")
 
     def sudo(self, user=None):
         """Attach to the provided user, or Superuser."""
@@ -793,6 +2449,11 @@ class Env:
             assert len(data) == 1
             return Record(self[data[0]['model']], data[0]['res_id'])
 
+    @property
+    def stats(self):
+        """Metrics of the :class:`Client`, see :class:`Stats`."""
+        return self.client.stats
+
     @property
     def lang(self):
         """Return the current language code."""
@@ -801,26 +2462,86 @@ class Env:
     def refresh(self):
         db_key, preserve = (self.db_name, self.client._server), ('auth', Env)
         for key in [*self._cache]:
-            if key[1:] == db_key and key[0] not in preserve and self._cache[key] != self:
-                del self._cache[key]
+            if key[1:] == db_key and key[0] not in preserve and self._cache.get(key, self) != self:
+                self._cache.pop(key, None)
         self._access_models = None
         self._model_names = self._cache_set('model_names', {})
         self._models = {}
+        self._clear_records()
         if self._json2:
             self._json2._method_params = {'base': dict(_base_method_params)}
+        if self.client.metadata_cache:
+            self.client.metadata_cache._invalidate(db_key)
 
     def _cache_get(self, key, func=None):
         try:
             return self._cache[key, self.db_name, self.client._server]
         except KeyError:
             pass
-        if func is not None:
-            return self._cache_set(key, func())
+        if func is not None:  # Atomic, when threads share the cache
+            return self._cache.setdefault((key, self.db_name, self.client._server), func())
 
     def _cache_set(self, key, value, db_name=None):
         self._cache[key, db_name or self.db_name, self.client._server] = value
         return value
 
+    def _cached_values(self, name, id_):
+        """Return the cached values of the record, or None."""
+        if (values := self._records.get((name, id_))) is not None:
+            try:
+                self._records.move_to_end((name, id_))    # Least recently used
+            except KeyError:
+                pass    # Evicted by another thread
+        return values
+
+    def _record_values(self, name, id_):
+        """Return the cached values of the record, shared by all instances."""
+        if (values := self._cached_values(name, id_)) is not None:
+            return values
+        if len(self._records) >= self._max_records:
+            try:
+                self._resize_records(-_sizeof(self._records.popitem(last=False)[1]))
+            except KeyError:
+                pass
+        self._resize_records(_sizeof(values := {}))
+        return self._records.setdefault((name, id_), values)
+
+    def _store_values(self, name, id_, new_values):
+        """Update the cached values of the record, and count their size."""
+        values = self._record_values(name, id_)
+        size = _sizeof(values)
+        values.update(new_values)
+        self._resize_records(_sizeof(values) - size)
+
+    def _resize_records(self, delta):
+        self._records_size += delta
+        self._cache._resize(self._cache_key, delta)
+
+    def _clear_records(self):
+        self._records.clear()
+        self._resize_records(-self._records_size)
+
+    def _invalidate_records(self, name, ids):
+        for id_ in ids:
+            if (values := self._records.pop((name, id_), None)) is not None:
+                self._resize_records(-_sizeof(values))
+
+    def _invalidate_for(self, method, name, params):
+        """Invalidate the cached records which the `method` may change."""
+        if method in ('write', 'unlink') and params and isinstance(params[0], (list, int)):
+            self._invalidate_records(name, params[0] if isinstance(params[0], list) else params[:1])
+        else:   # The computed and related fields of any model
+            self._clear_records()
+
+    def _metadata_get(self, section, name=None):
+        if (cache := self.client.metadata_cache) is None or not self.uid or not cache._open(self):
+            return None
+        return cache._get((self.client._server, self.db_name), section, name)
+
+    def _metadata_set(self, section, value, name=None):
+        if (cache := self.client.metadata_cache) is not None:
+            cache._set((self.client._server, self.db_name), section, value, name)
+
     def _is_identitycheck(self, result):
         return hasattr(result, 'get') and result.get('res_model') == 'res.users.identitycheck'
 
@@ -850,14 +2571,17 @@ class Env:
             print("Security Control - PASSED")
         return result
 
-    def _call_kw(self, model, method, args, kw=None):
+    def _call_kw(self, model, method, args, kw=None, stream=False):
         if self.uid != self.client._session_uid:
             password = self._cache_get('auth')[self.user.login][1]
             if self.user.login == SYSTEM_USER and not password:
                 self.client._authenticate_system()
             else:
                 self.client._authenticate_session(self.db_name, self.user.login, password)
-        return self.client.web_dataset.call_kw(model=model, method=method, args=args, kwargs=kw or {})
+        params = {'model': model, 'method': method, 'args': args, 'kwargs': kw or {}}
+        if stream:
+            return self.client.web_dataset._request('call_kw', params, stream=True)
+        return self.client.web_dataset.call_kw(**params)
     _call_kw._protocol_name = 'Web API'
 
     def execute(self, obj, method, *params, **kwargs):
@@ -868,10 +2592,14 @@ class Env:
         or a specific method available on this `obj`.
         Method `params` are accepted.  If needed, keyword
         arguments are collected in `kwargs`.
+        Identical calls of a read-only method, like ``read`` or ``fields_get``,
+        share the same request while it is in flight.
         """
         assert self.uid, 'Not connected'
         assert isinstance(obj, str) and isinstance(method, str) and method != 'browse'
-        order_ids = single_id = False
+        if (deferred := self._deferred) is not None and deferred._pending:
+            deferred.flush()
+        order_ids = single_id = stream = False
         if method == 'read':
             assert params, 'Missing parameter'
             if not isinstance(params[0], list):
@@ -895,11 +2623,55 @@ class Env:
             params = searchargs(params)
         elif method == 'search_read':
             params = searchargs(params[:1]) + params[1:]
+            stream = kwargs.pop('stream', False)
+        if method not in _readonly_methods:
+            self._invalidate_for(method, obj, params)
+        if (method in _chunked_methods and (size := self.client.chunk_size) and self._batch is None and
+                params and isinstance(params[0], list) and len(params[0]) > size):
+            return self._execute_chunks(obj, method, params, kwargs, size, order_ids)
         kw = ((dict(kwargs, context=self.context),)
               if self.context else (kwargs and (kwargs,) or ()))
-        res = self._execute_kw(obj, method, params, *kw)
+        if self._batch is not None and method in _batch_methods:
+            if stream:
+                raise Error("Method 'search_read' does not stream in a batch")
+            finish = (order_ids or single_id) and partial(self._read_result, order_ids, single_id)
+            return self._batch._add(obj, method, params, {**kw[0]} if kw else {}, finish)
+        if stream:
+            res = self._execute_kw(obj, method, params, *kw, stream=True)
+        else:
+            call = partial(self._execute_kw, obj, method, params, *kw)
+            if retry_policy := self.client.retry_policy:
+                call = partial(retry_policy, self.client._server, method, call)
+            if method in _readonly_methods and (key := self.client._inflight._key(self, obj, method, params, kw)):
+                call = partial(self.client._inflight, key, call)
+            protocol = getattr(self._execute_kw, '_protocol_name', '')
+            res = self.client.stats._measure('_calls', (protocol, obj, method), call)
         if self._is_identitycheck(res):
             res = self._identitycheck(res)
+        return _then(res, partial(self._read_result, order_ids, single_id))
+
+    def _execute_chunks(self, obj, method, params, kwargs, size, order_ids):
+        (ids, args) = (params[0], params[1:])
+        calls = [partial(self.execute, obj, method, ids[idx:idx + size], *args, **kwargs)
+                 for idx in range(0, len(ids), size)]
+
+        def merge(results):
+            if method in ('write', 'unlink'):
+                return all(results)
+            return self._read_result(order_ids, False, [row for res in results for row in res])
+        return _then(self._run_chunks(calls), merge)
+
+    def _run_chunks(self, calls):
+        if (workers := self.client.chunk_workers or 1) > 1:
+            return [*self.client._thread_pool(workers).map(lambda call: call(), calls)]
+        return [call() for call in calls]
+
+    @staticmethod
+    def _resolve(value):
+        return value
+
+    @staticmethod
+    def _read_result(order_ids, single_id, res):
         if order_ids:
             # Results were not in the same order as the IDs
             # in case of missing records or duplicate ID
@@ -928,8 +2700,10 @@ class Env:
         try:
             return self._models[name]
         except KeyError:
-            self._models[name] = Model._new(self, name)
-        return self._models[name]
+            return self._models.setdefault(name, self._new_model(name))
+
+    def _new_model(self, name):
+        return Model._new(self, name)
 
     def models(self, name='', transient=False):
         """Search Odoo models.
@@ -940,15 +2714,19 @@ class Env:
         The return value is a sorted list of model names.
         """
         if self._access_models is None:
-            ir_model = self._get('ir.model', False)
-            domain = [('abstract', '=', False)] if 'abstract' in ir_model._keys else []  # Odoo 19
-            try:
-                models = ir_model.search_read(domain, ('model', 'transient'))
-            except ServerError:
-                # Only Odoo 15 prevents non-admin user to retrieve models
-                models = ir_model.get_available_models() if self.client.version_info >= 16.0 else {}
-            self._model_names.update({m['model']: m.get('transient', False) for m in models})
-            self._access_models = bool(models)
+            if (model_names := self._metadata_get('model_names')) is None:
+                ir_model = self._get('ir.model', False)
+                domain = [('abstract', '=', False)] if 'abstract' in ir_model._keys else []  # Odoo 19
+                try:
+                    models = ir_model.search_read(domain, ('model', 'transient'))
+                except ServerError:
+                    # Only Odoo 15 prevents non-admin user to retrieve models
+                    models = ir_model.get_available_models() if self.client.version_info >= 16.0 else {}
+                model_names = {m['model']: m.get('transient', False) for m in models}
+                if model_names:
+                    self._metadata_set('model_names', model_names)
+            self._model_names.update(model_names)
+            self._access_models = bool(model_names)
         return sorted(mod for mod, is_transient in self._model_names.items()
                       if name in mod and transient == is_transient)
 
@@ -1119,11 +2897,11 @@ class Env:
         assert res['res_model'] == "res.users.apikeys.show"
         return self.set_api_key(res['context']['default_key'])
 
-    def _get_sql_action(self, _external_id="__odooly__.sql"):
+    def _get_sql_action(self, _external_id="__odooly__.sql", _name='SQL Execute'):
         act_model = self._get('ir.actions.server', False)
         if not (action := act_model.get(_external_id)):
             logg_model = self._get('ir.model', False).get('base.model_ir_logging')
-            values = {'name': 'SQL Execute', 'state': 'code', 'model_id': logg_model.id}
+            values = {'name': _name, 'state': 'code', 'model_id': logg_model.id}
             (action := act_model.create(values).ensure_one())._set_external_id(_external_id)
         return action.with_context(lang=None)
 
@@ -1145,6 +2923,44 @@ class Env:
         logg = self._get('ir.logging', False).get([f"func = {vals['name']}"])
         return eval(logg.message, {"datetime": datetime}) if logg else None
 
+    def batch(self):
+        """Return a :class:`Batch` to queue calls in a ``with`` block.
+
+        The calls of this environment are executed on the server
+        in a single round trip, with a server action.
+        It requires administrator rights to install the server action.
+
+            >>> with env.batch():
+            ...     partner = env['res.partner'].create({'name': 'Joe'})
+            ...     count = env['res.partner'].search_count([])
+            >>> partner.result(), count.result()
+        """
+        return Batch(self)
+
+    def deferred_writes(self):
+        """Return :class:`DeferredWrites` to buffer the assignments in a ``with`` block.
+
+        The values assigned to the attributes of the records of this
+        environment are merged, and written together on exit.
+
+            >>> with env.deferred_writes():
+            ...     for partner in env['res.partner'].search([]):
+            ...         partner.ref = partner.name.upper()
+            ...         partner.comment = 'Updated'
+        """
+        return DeferredWrites(self)
+
+    def _run_batch(self, calls):
+        if not (action_id := self.__dict__.get('_batch_action_id')):
+            action = self._get_sql_action("__odooly__.batch", 'Batch Execute')
+            if action.code != _batch_action_code:
+                action.write({'code': _batch_action_code})
+            action_id = _memoize(self, '_batch_action_id', action.id)
+        # Method 'run' has no parameter: the calls are passed in the context,
+        # and the action removes them before it runs the calls
+        context = {**(self.context or {}), 'lang': None, '__batch': calls}
+        return self._execute_kw('ir.actions.server', 'run', ([action_id],), {'context': context})['results']
+
 
 class Client:
     """Connection to an Odoo instance.
@@ -1156,15 +2972,33 @@ class Client:
     The `db` is the name of the database and the `user` should exist in the
     table ``res.users``.  If the `password` is not provided, it will be
     asked on login.
+
+    The ids of ``read``, ``write``, ``unlink`` and ``exists`` are sent by
+    chunks of `chunk_size`, and `chunk_workers` chunks are sent concurrently.
+    The chunks are disabled with ``chunk_size=None`` or ``0``.
+    With ``retry=True`` or a :class:`RetryPolicy`, the calls are retried
+    after a transient error.
     """
     _config_file = CONF_FILE
     _saved_config = {}
     _globals = None
+    chunk_size = 10_000     # Ids per call, or None (or 0) to disable the chunks
+    chunk_workers = 1
 
-    def __init__(self, server, db=None, user=None, password=None, api_key=None, verbose=False):
-        self._http = HTTPSession()
+    def __init__(self, server, db=None, user=None, password=None, api_key=None, verbose=False,
+                 *, max_rps=None, max_concurrency=None, cache_dir=None, chunk_size=_DEFAULT, chunk_workers=None,
+                 retry=None):
         self._printer = Printer()
-        self._session_uid = None
+        if chunk_size is not _DEFAULT:
+            self.chunk_size = chunk_size
+        self.chunk_workers = chunk_workers or self.chunk_workers
+        self.metadata_cache = MetadataCache(cache_dir) if cache_dir else None
+        self._inflight = _SingleFlight()
+        self.retry_policy = RetryPolicy() if retry is True else (retry or None)
+        self.limiter = RateLimiter(max_rps, max_concurrency) if (max_rps or max_concurrency) else None
+        self.stats = Stats()
+        self._hooks = []
+        (self._pools, self._sessions) = ({}, WeakSet())
         self.verbose = verbose
         self._set_services(server, db)
         self.env = Env(self)
@@ -1181,7 +3015,67 @@ class Client:
         self._printer.cols = cols and max(36, cols) or None
         PP_FORMAT['width'] = cols and max(79, cols) or PP_FORMAT['width']
 
+    @property
+    def _http(self):
+        return self._local.http
+
+    @property
+    def _session_uid(self):
+        return self._local.session_uid
+
+    @_session_uid.setter
+    def _session_uid(self, uid):
+        self._local.session_uid = uid
+
+    def _thread_pool(self, workers):
+        # The threads are reused, with their connections and their Webclient session
+        if (pool := self._pools.get(workers)) is None:
+            pool = self._pools.setdefault(workers, ThreadPoolExecutor(workers, thread_name_prefix='odooly'))
+        return pool
+
+    def close(self):
+        """Stop the worker threads, and close the HTTP connections.
+
+        The metadata cache, if any, is saved.
+        """
+        (pools, self._pools) = (self._pools, {})
+        for pool in pools.values():
+            pool.shutdown()
+        for http in [*self._sessions]:
+            http.close()
+        if self.metadata_cache is not None:
+            self.metadata_cache.save()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def add_hook(self, on_request=None, on_response=None, on_error=None):
+        """Register functions which are called for each request.
+
+        Function ``on_request(info)`` is called before the request.
+        The `info` dictionary contains ``protocol``, ``model``,
+        ``method`` and ``args``, where the passwords are hidden.
+        It can be updated by the hooks, to keep a tracing span for
+        example.  Then it receives
+        ``elapsed``, ``sent`` and ``received`` (bytes), and it is passed
+        to ``on_response(info, result)`` or ``on_error(info, exc)``.
+        Return the hook, for :meth:`remove_hook`.
+        """
+        hook = (on_request, on_response, on_error)
+        self._hooks.append(hook)
+        return hook
+
+    def remove_hook(self, hook):
+        """Unregister a hook returned by :meth:`add_hook`."""
+        self._hooks.remove(hook)
+
     def _set_services(self, server, db):
+        (auth, self.nodes) = ((), None)
+        if isinstance(server, NodePool):
+            (self.nodes, server) = (server, server.nodes[0])
         if isinstance(server, list):
             appname = Path(__file__).name.rstrip('co')
             server = start_odoo_services(server, appname=appname)
@@ -1190,11 +3084,16 @@ class Client:
             if "@" in rsvr.netloc:
                 [username, password] = rsvr._userinfo
                 rsvr = rsvr._replace(netloc=rsvr.netloc.rsplit("@", 1)[1])
-                self._http.set_auth(server, username, password)
+                auth = (server, username, password)
             if rsvr.path[-1:] == '/':
                 rsvr = rsvr._replace(path=rsvr.path.rstrip('/'))
             server = rsvr.geturl()
+            if ',' in rsvr.netloc:
+                (self.nodes, server) = NodePool._from_url(server)
         self._server = server
+        # Session affinity: the Web session is stored on the node
+        sticky = isinstance(server, str) and '/jsonrpc' not in server
+        self._local = _ThreadState(auth, self.nodes, sticky, self.limiter, self.stats, self._sessions)
 
         if not isinstance(server, str):
             self._proxy = self._proxy_odoo
@@ -1247,21 +3146,27 @@ class Client:
             log.print_recv(str(parsed))
         return res, parsed
 
-    def _post_jsonrpc(self, endpoint='', params=None):
+    def _post_jsonrpc(self, endpoint='', params=None, stream=False):
         req_id = f"{os.getpid():04x}{int(time.time() * 1E6) % 2**40:010x}"
         payload = {'jsonrpc': '2.0', 'method': 'call', 'params': params or {}, 'id': req_id}
+        if stream:  # Iterate on the "result" array
+            return self._http.request(urljoin(self._server, endpoint), json=payload, stream=True)
         resp = self._http.request(urljoin(self._server, endpoint), json=payload)
         if r_error := resp.get('error'):
             raise ServerError(r_error)
         return resp.get('result')
 
     def _proxy_odoo(self, name):
-        return partial(self._server.http.dispatch_rpc, name)
+        def dispatch_odoo(method, args, stream=False):
+            res = self._server.http.dispatch_rpc(name, method, args)
+            return iter(res) if stream else res
+        return dispatch_odoo
     _proxy_odoo._protocol_name = 'Odoo'
 
     def _proxy_jsonrpc(self, name):
-        def dispatch_jsonrpc(method, args):
-            return self._post_jsonrpc(params={'service': name, 'method': method, 'args': args})
+        def dispatch_jsonrpc(method, args, stream=False):
+            params = {'service': name, 'method': method, 'args': args}
+            return self._post_jsonrpc(params=params, stream=stream)
         return dispatch_jsonrpc
     _proxy_jsonrpc._protocol_name = 'JSON-RPC'
 
@@ -1275,17 +3180,18 @@ class Client:
                     return self._http.request(urljoin(self._server, f"{name}/{method}"), data=params)
                 return self._post_jsonrpc(f"{name}/{method}", params=params)
         else:
-            def dispatch_web(method, params):
+            def dispatch_web(method, params, stream=False):
                 if method == 'call_kw' and name == 'web/dataset':
                     method = f"{method}/{params['model']}/{params['method']}"
-                return self._post_jsonrpc(f"{name}/{method}", params=params)
+                return self._post_jsonrpc(f"{name}/{method}", params=params, stream=stream)
         return dispatch_web
 
     def save(self, environment=None, skip=False):
         """Save environment settings with this name, or current name"""
         self.env.name = environment or self.env.name or self.env.db_name
         if not skip and self.env.uid:
-            config = (self._server, self.env.db_name, self.env.user.login, None, self.env._api_key)
+            server = self.nodes.geturl(self._server) if self.nodes else self._server
+            config = (server, self.env.db_name, self.env.user.login, None, self.env._api_key)
             self._saved_config[self.env.name] = config
         if self._globals and self._globals.get('client', self) is self:
             self._set_prompt()
@@ -1327,9 +3233,26 @@ class Client:
             client.verbose = verbose
             client.login(user or conf_user, password=password, api_key=api_key)
         except KeyError:
-            client = cls(server, db, user or conf_user, password=password, api_key=api_key, verbose=verbose)
+            client = cls(server, db, user or conf_user, password=password, api_key=api_key, verbose=verbose,
+                         **cls._read_options(environment))
         return client.save(environment, skip=skip_save)
 
+    @classmethod
+    def _read_options(cls, environment):
+        # Optional settings 'max_rps' and 'max_concurrency' of the RateLimiter, 'cache_dir',
+        # 'chunk_size', 'chunk_workers' and 'retry'
+        if not (p := ConfigParser()).read(cls._config_file) or not p.has_section(environment):
+            return {}
+        options = {key: p.getfloat(environment, key) for key in ('max_rps', 'max_concurrency')
+                   if p.has_option(environment, key)}
+        options.update({key: p.getint(environment, key) for key in ('chunk_size', 'chunk_workers')
+                        if p.has_option(environment, key)})
+        if p.has_option(environment, 'cache_dir'):
+            options['cache_dir'] = os.path.expanduser(p.get(environment, 'cache_dir'))
+        if p.has_option(environment, 'retry'):
+            options['retry'] = p.getboolean(environment, 'retry')
+        return options
+
     def __repr__(self):
         return f"<Client '{self._server}?db={self.env.db_name or ''}'>"
 
@@ -1673,6 +3596,8 @@ class Model(BaseModel):
         """Search for records in the `domain`."""
         if kwargs.get('count'):
             return self.search_count(domain)
+        if self.env._batch is not None:
+            return _then(self._execute('search', domain, **kwargs), self.browse)
         return RecordList._prepared(self, domain, kwargs)
 
     def search_count(self, domain=None):
@@ -1680,10 +3605,59 @@ class Model(BaseModel):
         return self._execute('search_count', domain or [])
 
     def search_read(self, domain=None, fields=None, **kwargs):
-        """Combine search and read."""
+        """Combine search and read.
+
+        If argument `stream` is true, return an iterator.  The rows are
+        decoded one by one, while the response is received.
+        """
         fields, fmt = self._parse_format(fields, browse=False)
         res = self._execute('search_read', domain or [], fields, **kwargs)
-        return fmt(res)
+        if kwargs.get('stream'):
+            return (fmt([row])[0] for row in res)
+        return _then(res, fmt)
+
+    def parallel_search_read(self, domain=None, fields=None, partitions=4, ordered=True):
+        """Combine search and read, with `partitions` concurrent requests.
+
+        The range of ids of the `domain` is split in disjoint intervals,
+        and each interval is read with :meth:`search_read` on a pool of
+        threads, so the server can use several workers.
+        If `ordered` is true, return the rows sorted by id.  Else return
+        an iterator of the rows, as the partitions are received.
+        """
+        ([domain], executor) = (searchargs((domain or [],)), self.env.client._thread_pool(partitions))
+        bounds = executor.map(lambda call: call(), self._bounds(domain))
+        futures = [executor.submit(self.search_read, part, fields, order='id')
+                   for part in self._partitions(domain, *bounds, partitions)]
+        if ordered:
+            return [row for future in futures for row in future.result()]
+        return (row for future in as_completed(futures) for row in future.result())
+
+    def _bounds(self, domain):
+        # Search the first and the last record of the domain
+        return [partial(self._execute, 'search', domain, order=order, limit=1) for order in ('id', 'id desc')]
+
+    @staticmethod
+    def _partitions(domain, first, last, partitions):
+        # Split the domain in intervals of ids between the first and the last record
+        if not first:
+            return []
+        (low, high) = (first[0], last[0] + 1)
+        step = -(-(high - low) // partitions)
+        return [[('id', '>=', start), ('id', '<', min(start + step, high)), *domain]
+                for start in range(low, high, step)]
+
+    def search_iter(self, domain=None, fields=None, batch_size=2000):
+        """Iterate over the records in the `domain`, by batches.
+
+        The batches are paginated by id, with the condition ``id > last_id``
+        instead of an offset, so each query is fast on large tables.
+        If `fields` is None, yield a :class:`RecordList` per batch.
+        Else yield the rows one by one, like :meth:`search_read`.
+        """
+        pages = _SearchPages(self, domain, fields, batch_size)
+        for call in pages:
+            yield from pages.items(call())
 
     def get(self, domain, *args, **kwargs):
         """Return a single :class:`Record`.
@@ -1725,7 +3699,31 @@ class Model(BaseModel):
         else:  # Odoo >= 12
             values = [self._unbrowse_values(vals) for vals in values]
         new_ids = self._execute('create', values)
-        return self.browse(new_ids)
+        return _then(new_ids, self.browse)
+
+    def create_bulk(self, values, chunk_size=1000, workers=4, progress=None, errors=None):
+        """Create many records, by chunks sent concurrently.
+
+        The argument `values` is an iterable of dictionaries, which is
+        consumed lazily.  Each chunk of `chunk_size` dictionaries is sent
+        in one ``create`` call, and up to `workers` calls run in parallel.
+        The `progress` callable, if any, receives the number of records
+        created and the elapsed time in seconds, when a chunk is done.
+        If `errors` is a list, the failed chunks are appended as tuples
+        ``(offset, values, exception)`` and the other chunks are created.
+        Else the first error stops the creation and it is raised.
+
+        Return a :class:`RecordList` of the new records, in input order.
+        """
+        (bulk, executor) = (_BulkCreate(self, values, chunk_size, progress, errors),
+                            self.env.client._thread_pool(workers))
+        with bulk:
+            for (offset, chunk) in bulk.chunks():
+                bulk.pending[executor.submit(bulk.create, chunk)] = (offset, chunk)
+                if len(bulk.pending) >= workers:    # Consume the values as they are sent
+                    bulk.collect(wait(bulk.pending, return_when=FIRST_COMPLETED)[0])
+            bulk.collect(wait(bulk.pending)[0])
+        return bulk.records()
 
     def read(self, *params, **kwargs):
         """Wrapper for ``client.execute(model, 'read', [...], ('a', 'b'))``.
@@ -1757,7 +3755,7 @@ class Model(BaseModel):
         if arg is not None:
             params = (params[0], fields) + params[2:]
         res = self._execute('read', *params, **kwargs)
-        return fmt(res) if isinstance(res, list) else fmt([res])[0]
+        return _then(res, lambda res: fmt(res) if isinstance(res, list) else fmt([res])[0])
 
     def _parse_format(self, arg, browse=True):
         if not isinstance(arg, str):
@@ -1844,6 +3842,63 @@ class Model(BaseModel):
                     new_values[key] = [(6, 0, value)]
         return new_values
 
+    def _store(self, rows):
+        """Wrap the values, and share them with the Record instances."""
+        related = {}
+        for row in rows:
+            if row and len(row) > 1:
+                values = self._browse_values({**row})
+                for (key, value) in values.items():
+                    if isinstance(value, BaseRecord):
+                        related.setdefault(key, []).append(value)
+                self.env._store_values(self._name, row['id'], values)
+        # The related records are prefetched together
+        for records in related.values():
+            prefetch = [*dict.fromkeys(id_ for rec in records for id_ in rec.ids)]
+            for rec in records:
+                rec.__dict__['_prefetch'] = prefetch
+        return rows
+
+    def _specification(self, fields):
+        """Compile the dotted paths of `fields` into a specification.
+
+        Return None if a path contains an unknown field, or crosses a
+        field which is not relational.
+        """
+        spec = {}
+        for path in fields:
+            (model, node, names) = (self, spec, path.split('.'))
+            for (index, name) in enumerate(names, 1):
+                if (field := model._fields.get(name)) is None:
+                    return None
+                node = node.setdefault(name, {})
+                if field['type'] == 'many2one':
+                    node.setdefault('fields', {}).setdefault('display_name', {})
+                if index == len(names):
+                    break
+                if field['type'] not in _RELATIONAL_TYPES:
+                    return None
+                (model, node) = (self.env._get(field['relation'], False), node.setdefault('fields', {}))
+        return spec
+
+    def _hydrate(self, rows):
+        """Cache the rows returned by ``web_read``, with the nested records."""
+        nested = {}
+        for row in rows:
+            for (key, value) in row.items():
+                if not value or (ftype := self._fields.get(key, {}).get('type')) not in _RELATIONAL_TYPES:
+                    continue
+                if ftype == 'many2one' and isinstance(value, dict):
+                    nested.setdefault(key, []).append(value)
+                    name = value.get('display_name')
+                    row[key] = [value['id'], name] if isinstance(name, str) else value['id']
+                elif ftype != 'many2one' and isinstance(value[0], dict):
+                    nested.setdefault(key, []).extend(value)
+                    row[key] = [val['id'] for val in value]
+        for (key, values) in nested.items():
+            self.env._get(self._fields[key]['relation'], False)._hydrate(values)
+        return self._store(rows)
+
     def _get_external_ids(self, ids=None):
         """Retrieve the External IDs of the records.
 
@@ -1859,7 +3914,9 @@ class Model(BaseModel):
     def __getattr__(self, attr):
         if attr == '_fields':
             if (vals := self.env._cache_get((attr, self._name))) is None:
-                vals = self._doc['fields'] if self.__dict__.get('_doc') else self._execute('fields_get')
+                if (vals := self.env._metadata_get('fields', self._name)) is None:
+                    vals = self._doc['fields'] if self.__dict__.get('_doc') else self._execute('fields_get')
+                    self.env._metadata_set('fields', vals, self._name)
                 self.env._cache_set((attr, self._name), vals)
             return _memoize(self, attr, vals)
         if attr == '_keys':
@@ -1895,10 +3952,13 @@ class BaseRecord(BaseModel):
 
     def __getitem__(self, key):
         idname = self._idnames[key]
-        return self._model.browse(idname) if idname is not False else False
+        if isinstance(key, slice):
+            return self._model.browse(idname)
+        return Record(self._model, idname, self._prefetch_ids) if idname is not False else False
 
     def __iter__(self):
-        yield from (Record(self._model, idname) for idname in self._idnames)
+        prefetch = self._prefetch_ids
+        yield from (Record(self._model, idname, prefetch) for idname in self._idnames)
 
     def __contains__(self, item):
         if isinstance(item, BaseRecord):
@@ -1956,6 +4016,10 @@ class BaseRecord(BaseModel):
     def _keys(self):
         return self._model._keys
 
+    @property
+    def _prefetch_ids(self):
+        return self.__dict__.get('_prefetch') or self.ids
+
     @property
     def _fields(self):
         return self._model._fields
@@ -1964,7 +4028,39 @@ class BaseRecord(BaseModel):
         return self._model._methods(name)
 
     def _invalidate_cache(self):
-        pass
+        self.env._invalidate_records(self._name, self.ids)
+
+    def _prefetch_field(self, attr):
+        """Read the field `attr` of the records, and of the next records of the prefetch group."""
+        (group, records, ids) = (self._prefetch_ids, self.env._records, {})
+        if (last := self.env._prefetch_index)[0] is group:
+            positions = last[1]
+        else:
+            positions = {id_: index for (index, id_) in reversed([*enumerate(group)])}
+            self.env._prefetch_index = (group, positions)
+        if positions is None:
+            return      # The group failed already
+        for id_ in self.ids:
+            if id_ and attr not in records.get((self._name, id_), ()):
+                ids[id_] = None
+        start = positions.get(self.ids[0], 0) if self.ids else 0
+        for index in range(start, len(group)):
+            if len(ids) >= self.env._prefetch_max:
+                break
+            if (id_ := group[index]) and attr not in records.get((self._name, id_), ()):
+                ids[id_] = None
+        if len(ids) > 1:
+            try:
+                RecordList(self._model, [*ids]).read([attr])
+            except ServerError:
+                # Some records are missing: read the others, once
+                try:
+                    if len(existing := RecordList(self._model, [*ids]).exists()) < len(ids):
+                        existing.read([attr])
+                        return
+                except ServerError:
+                    pass
+                self.env._prefetch_index = (group, None)    # Do not prefetch this group again
 
     def ensure_one(self):
         """Return the single record in this recordset.
@@ -2040,14 +4136,61 @@ class BaseRecord(BaseModel):
             return cls.union(*args)
         return args
 
-    def _filter(self, attrs):
-        ids, rels = [], []
-        for (rec, rel) in zip(self, self.read(attrs.pop(0))):
+    def fetch(self, fields):
+        """Read the `fields` of the records, and store them in the cache.
+
+        The argument `fields` is a list of field names, or a space separated
+        string.  A name can be a path through the relational fields, like
+        ``parent_id.country_id.code``: the related records are read too.
+        Since Odoo 17, all the values are read in one request, with
+        ``web_read``.  Before, the fields are read level by level.
+        Return the records.
+        """
+        if isinstance(fields, str):
+            fields = fields.split()
+
+        def hydrate(rows):
+            self._model._hydrate(rows)
+            return self
+        if self.env.client.version_info >= 17.0 and (spec := self._model._specification(fields)) is not None:
+            if 'id' not in self.__dict__:     # Search and read in one request
+                params = {**self._search_args}
+                res = params.pop('model')._execute('web_search_read', params.pop('domain'), spec, **params)
+                return _then(res, lambda res: hydrate(self._set_ids(res['records'])))
+            ids = [*dict.fromkeys(id_ for id_ in self.ids if id_)]
+            return _then(ids and self._execute('web_read', ids, spec), hydrate)
+        tree = {}
+        for path in fields:
+            node = tree
+            for name in path.split('.'):
+                node = node.setdefault(name, {})
+        if self.ids:
+            RecordList(self._model, self.ids)._fetch_tree(tree)
+        return self
+
+    def _fetch_tree(self, tree):
+        rows = self.read([*tree])
+        for (name, subtree) in tree.items():
+            if subtree and (related := self._union([row[name] for row in rows if row and row[name]])):
+                related._fetch_tree(subtree)
+
+    def _use_cache(self, path):
+        # Fetch a dotted path in one request, then walk through the cache
+        if '.' not in path or not self.env._prefetch_max or self.env.client.version_info < 17.0:
+            return False
+        self.fetch([path])
+        return True
+
+    def _filter(self, attrs, cached=False):
+        (ids, rels, name) = ([], [], attrs.pop(0))
+        if not cached or (values := self._cached(name)) is None:
+            values = self.read(name)
+        for (rec, rel) in zip(self, values):
             if rel and (not hasattr(rel, 'ids') or rel.id):
                 ids.append(rec._idnames[0])
                 rels.append(rel)
         if ids and attrs:
-            relids = {idn[0] for idn in BaseRecord.union(*rels)._filter(attrs)}
+            relids = {idn[0] for idn in BaseRecord.union(*rels)._filter(attrs, cached)}
             ids = [rec_id for (rec_id, rel) in zip(ids, rels)
                    if any(rel_id in relids for rel_id in rel.ids)]
         return ids
@@ -2058,8 +4201,11 @@ class BaseRecord(BaseModel):
             return self._union([func(rec) for rec in self])
         # func is a path
         vals = self[:]
+        cached = vals._use_cache(func)
         for name in func.split('.'):
-            vals = self._union(vals.read(name))
+            if not cached or (values := vals._cached(name)) is None:
+                values = vals.read(name)
+            vals = self._union(values)
         return vals
 
     def filtered(self, func):
@@ -2072,8 +4218,11 @@ class BaseRecord(BaseModel):
             ids = [rec._idnames[0] for rec in self if func(rec)]
         elif isinstance(func, list):
             return self & self._model.search([('id', 'in', self.ids)] + func)
+        elif func:
+            records = self[:]
+            ids = records._filter(func.split('.'), records._use_cache(func))
         else:
-            ids = self[:]._filter(func.split('.')) if func else self._idnames
+            ids = self._idnames
         return RecordList(self._model, ids)
 
     def sorted(self, key=None, reverse=False):
@@ -2098,7 +4247,7 @@ class BaseRecord(BaseModel):
         See :meth:`Model.create` for details.
         """
         if not self.id:
-            return True
+            return self.env._resolve(True)
         values = self._model._unbrowse_values(values)
         self._invalidate_cache()
         return self._execute('write', self.ids, values)
@@ -2106,7 +4255,7 @@ class BaseRecord(BaseModel):
     def unlink(self):
         """Delete the record(s) from the database."""
         if not self.id:
-            return True
+            return self.env._resolve(True)
         self._invalidate_cache()
         return self._execute('unlink', self.ids)
 
@@ -2173,6 +4322,18 @@ class RecordList(BaseRecord):
             return super().with_env(env)
         return RecordList(env[self._name], None, {**self._search_args})
 
+    def iter_batches(self, batch_size=2000):
+        """Iterate over the :class:`RecordList`, by batches.
+
+        A search which is not resolved yet, without `offset`, `limit` or
+        `order`, is paginated with :meth:`Model.search_iter`.  Otherwise,
+        the ids are split in batches of `batch_size`.
+        """
+        params = {**(self._search_args or {})}
+        if 'id' not in self.__dict__ and not any(params.get(key) for key in ('offset', 'limit', 'order')):
+            return params['model'].search_iter(params['domain'], batch_size=batch_size)
+        return (self[idx:idx + batch_size] for idx in range(0, len(self.ids), batch_size))
+
     def read(self, fields=None):
         """Read the `fields` of the :class:`RecordList`.
 
@@ -2182,20 +4343,29 @@ class RecordList(BaseRecord):
         fields, fmt = self._model._parse_format(fields)
 
         if fields == ['id']:
-            values = [{'id': res_id} for res_id in self.ids]
+            values = self.env._resolve([{'id': res_id} for res_id in self.ids])
         elif 'id' not in self.__dict__:
             params = {**self._search_args}
             values = params.pop('model').search_read(params.pop('domain'), fields, **params)
-            ids = idnames = [val['id'] for val in values]
-            if values and 'display_name' in values[0]:
-                idnames = [(val['id'], val['display_name']) for val in values]
-            Ids, __ = self.env._class_ids
-            self.__dict__.update({'id': Ids(ids), 'ids': Ids(ids), '_idnames': idnames})
+            return _then(values, lambda values: self._store(self._set_ids(values), fmt))
         else:
-            values = self._model.read(self.ids, fields, order=True) if self.ids else []
+            values = self._model.read(self.ids, fields, order=True) if self.ids else self.env._resolve([])
+            return _then(values, lambda values: self._store(values, fmt))
 
+        return _then(values, fmt)
+
+    def _store(self, values, fmt):
+        self._model._store(values)  # Before the rows are converted
         return fmt(values)
 
+    def _set_ids(self, values):
+        ids = idnames = [val['id'] for val in values]
+        if values and 'display_name' in values[0]:
+            idnames = [(val['id'], val['display_name']) for val in values]
+        Ids, __ = self.env._class_ids
+        self.__dict__.update({'id': Ids(ids), 'ids': Ids(ids), '_idnames': idnames})
+        return values
+
     def copy(self, default=None):
         """Copy records and return :class:`RecordList`.
 
@@ -2220,6 +4390,25 @@ class RecordList(BaseRecord):
                    self._model._get_external_ids(self.ids).items()}
         return [xml_ids.get(res_id, False) for res_id in self.id]
 
+    def _cached(self, attr):
+        """Return the values of the field `attr` from the cache, or None."""
+        values = []
+        for id_ in self.ids:
+            if not id_:
+                values.append(False)
+            elif (cached := self.env._cached_values(self._name, id_)) and attr in cached:
+                values.append(cached[attr])
+            else:
+                return None
+        if (field := self._model._fields[attr])['type'] in _RELATIONAL_TYPES:
+            rel_model = self.env._get(field['relation'], False)
+            if field['type'] == 'many2one':
+                return RecordList(rel_model, [val and val._idnames[0] for val in values])
+            if not values:
+                return RecordList(rel_model, ())
+            return [val or RecordList(rel_model, ()) for val in values]
+        return values
+
     def __getattr__(self, attr):
         if attr in ('id', 'ids', '_idnames'):
             params = {**self._search_args}
@@ -2228,6 +4417,14 @@ class RecordList(BaseRecord):
             self.__dict__.update({'id': Ids(ids), 'ids': Ids(ids), '_idnames': ids})
             return self.__dict__[attr]
         if attr in self._model._keys:
+            if 'id' in self.__dict__ and self.env._prefetch_max and self.env._batch is None:
+                if (values := self._cached(attr)) is None:
+                    self._prefetch_field(attr)
+                    values = self._cached(attr)
+                if values is not None:
+                    return values
+            if isinstance(self.env, AsyncEnv):
+                raise Error(f"Field {attr!r} is not loaded: 'await records.read({attr!r})'")
             return self.read(attr)
         if attr.startswith('_'):
             errmsg = f"'RecordList' object has no attribute {attr!r}"
@@ -2255,18 +4452,23 @@ class Record(BaseRecord):
     The ``many2one``, ``one2many`` and ``many2many`` attributes are wrapped in
     ``Record`` and ``RecordList`` objects.  These attributes support writing
     too.
-    The attributes are evaluated lazily, and they are cached in the record.
-    The Record's cache is invalidated if any attribute is changed.
+    The attributes are evaluated lazily, and they are cached in the
+    :class:`Env`: all the instances of the same record share the values.
+    The values read with :meth:`RecordList.read` are cached too.
+    The cache of the records is invalidated when they are changed.
+    The records of a :class:`RecordList`, or the records reached through
+    the same relational field, are prefetched together: the first access
+    to a field reads it for the next 1000 records of the group.
     """
 
-    def __init__(self, res_model, arg):
+    def __init__(self, res_model, arg, prefetch=None):
         super().__init__(res_model, arg)
         if isinstance(arg, int):
             name, idnames = None, [arg]
         else:
             idnames = [(arg, name)] = [arg]
         Ids, Id1 = self.env._class_ids
-        attrs = {'id': Id1(arg), 'ids': Ids([arg]), '_idnames': idnames, '_cached_keys': {*()}}
+        attrs = {'id': Id1(arg), 'ids': Ids([arg]), '_idnames': idnames, '_prefetch': prefetch}
         if name is not None:
             attrs['_Record__name'] = attrs['display_name'] = name
         self.__dict__.update(attrs)
@@ -2286,16 +4488,10 @@ class Record(BaseRecord):
         """Force refreshing the record's data."""
         self._invalidate_cache()
 
-    def _invalidate_cache(self):
-        self._cached_keys.discard('id')
-        for key in self._cached_keys:
-            delattr(self, key)
-        self._cached_keys.clear()
-
     def _update(self, values):
         new_values = self._model._browse_values(values)
-        self.__dict__.update(new_values)
-        self._cached_keys.update(new_values)
+        if self.id:
+            self.env._store_values(self._name, self.id, new_values)
         return new_values
 
     def read(self, fields=None):
@@ -2304,12 +4500,13 @@ class Record(BaseRecord):
         The argument `fields` accepts different kinds of values.
         See :meth:`Model.read` for details.
         """
-        rv = self._model.read(self.id, fields)
-        if rv is not None and isinstance(fields, str) and fields in self._model._keys:
-            return self._update({fields: rv})[fields]
-        if isinstance(rv, dict):
-            return self._update(rv)
-        return rv
+        def update(rv):
+            if rv is not None and isinstance(fields, str) and fields in self._model._keys:
+                return self._update({fields: rv})[fields]
+            if isinstance(rv, dict):
+                return self._update(rv)
+            return rv
+        return _then(self._model.read(self.id, fields), update)
 
     def copy(self, default=None):
         """Copy a record and return the new :class:`Record`.
@@ -2346,6 +4543,14 @@ class Record(BaseRecord):
 
     def __getattr__(self, attr):
         if attr in self._model._keys:
+            if (values := self.env._cached_values(self._name, self.id)) and attr in values:
+                return values[attr]
+            if self._prefetch and self.env._prefetch_max and self.env._batch is None:
+                self._prefetch_field(attr)
+                if (values := self.env._cached_values(self._name, self.id)) and attr in values:
+                    return values[attr]
+            if isinstance(self.env, AsyncEnv):
+                raise Error(f"Field {attr!r} is not loaded: 'await record.read({attr!r})'")
             return self.read(attr)
         if attr == '_Record__name':
             return self._get_name()
@@ -2368,8 +4573,380 @@ class Record(BaseRecord):
             raise AttributeError(f"'Record' object has no attribute {attr!r}")
         if attr == 'id':
             raise AttributeError("'Record' object attribute 'id' is read-only")
+        if (deferred := self.env._deferred) is not None and self.id:
+            return deferred._add(self, {attr: value})
         self.write({attr: value})
 
+    def __delattr__(self, attr):
+        if attr not in self.__dict__ and attr in self._model._keys:
+            if attr in (values := self.env._records.get((self._name, self.id)) or {}):
+                size = _sizeof(values)
+                del values[attr]
+                self.env._resize_records(_sizeof(values) - size)
+                return
+        super().__delattr__(attr)
+
+
+class AsyncJson2(Json2):
+    """A connection to Json-2 API, for :class:`AsyncClient`."""
+    _http = None
+
+    def _set_http(self, client):
+        self._http = client._http
+
+    async def doc(self, model):
+        """Documentation of the `model`."""
+        model_doc = await self._request(f'{self._doc_endpoint}/{model}.json')
+        if model not in self._method_params:
+            self._method_params[model] = dict(Model._parse_doc_methods(model_doc))
+        return model_doc
+
+    async def __call__(self, model, method, args, kw=None):
+        """Execute API call on the `model`."""
+        if args and method not in self._method_params['base'] and model not in self._method_params:
+            await self.doc(model)
+        params = self._prepare_params(model, method, args, kw or {})
+        return await self._request(f'{self._endpoint}/{model}/{method}', params)
+
+    async def _request(self, path, params=None):
+        url = urljoin(self._server, path)
+        verb = 'GET' if params is None else 'POST'
+        if not self._printer:
+            return await self._http.request(url, method=verb, json=params, headers=self._headers)
+        with self._printer as log:
+            log.print_sent(' '.join([verb, path] + format_params(params or {})))
+            res = await self._http.request(url, method=verb, json=params, headers=self._headers)
+            log.print_recv(repr(res))
+        return res
+
+
+class AsyncEnv(Env):
+    """An environment for :class:`AsyncClient`.
+
+    Methods :meth:`execute`, :meth:`access` and :meth:`ref` are coroutines,
+    as well as the methods of the models and records which call the server.
+    Use :meth:`AsyncClient.login` to switch user.
+    """
+    _batch = _deferred = None
+    _prefetch_max = 0
+
+    def __call__(self, user=None, password=None, api_key=None, context=None):
+        """Return an environment based on ``self`` with modified `context`."""
+        if user is not None:
+            raise Error("Use 'await client.login(user)' instead")
+        return super().__call__(context=context)
+
+    @staticmethod
+    def _env_key(uid, context):
+        return AsyncEnv, Env._env_key(uid, context)
+
+    async def _login(self, user, password=None, api_key=None):
+        auth_cache = self._cache_get('auth', dict)
+        password = password or (auth_cache.get(user) or (None, None))[1]
+        if not password and not api_key:
+            password = getpass(f"Password for '{color_bold(user)}': ")
+        info = await self.client._authenticate(self.db_name, user, password, api_key)
+        if not (uid := info['uid']):
+            auth_cache.pop(user, None)
+            raise Error('Error: Invalid username or password')
+        auth_cache[user] = uid, password
+        context = info.get('user_context') or {}
+        if (env := self._cache_get(env_key := self._env_key(uid, context))) is None:
+            env = self._configure(uid, user, password, api_key, context, info)
+            env._cache_set(env_key, env)
+        if env._access_models is None:
+            await env._load_models()
+        return env
+
+    async def _load_models(self):
+        ir_model = self._get('ir.model', False)
+        domain = [('abstract', '=', False)] if self.client.version_info >= 19.0 else []
+        try:
+            models = await ir_model.search_read(domain, ('model', 'transient'))
+        except ServerError:
+            # Only Odoo 15 prevents non-admin user to retrieve models
+            models = await ir_model.get_available_models() if self.client.version_info >= 16.0 else {}
+        self._model_names.update({m['model']: m.get('transient', False) for m in models})
+        self._access_models = bool(models)
+
+    def set_api_key(self, api_key, store=True):
+        """Configure methods to use an API key."""
+        if self.client._jsonrpc:
+            self._execute_kw = partial(self.client._execute_jsonrpc, self.db_name, self.uid, api_key)
+        elif store and self.client.version_info >= 19.0:
+            self._execute_kw = self._json2 = AsyncJson2(self.client, self.db_name, api_key)
+        else:
+            self._execute_kw = self._call_kw
+        self._api_key = api_key if store else None
+        return api_key
+
+    async def _call_kw(self, model, method, args, kw=None):
+        if self.uid != self.client._session_uid:
+            password = self._cache_get('auth')[self.user.login][1]
+            await self.client._authenticate_session(self.db_name, self.user.login, password)
+        params = {'model': model, 'method': method, 'args': args, 'kwargs': kw or {}}
+        return await self.client._post_jsonrpc(f'web/dataset/call_kw/{model}/{method}', params)
+
+    async def execute(self, obj, method, *params, **kwargs):
+        """Coroutine to execute the `method` of the `obj` model.
+
+        See :meth:`Env.execute`.
+        """
+        res = super().execute(obj, method, *params, **kwargs)
+        return (await res) if isawaitable(res) else res
+
+    def _run_chunks(self, calls):
+        return asyncio.gather(*[call() for call in calls])
+
+    @staticmethod
+    async def _resolve(value):
+        return value
+
+    async def access(self, model_name, mode="read"):
+        """Check if the user has access to this model."""
+        try:
+            await self.execute('ir.model.access', 'check', model_name, mode)
+            return True
+        except Exception:
+            return False
+
+    async def ref(self, xml_id):
+        """Return the record for the given ``xml_id`` external ID."""
+        (module, name) = xml_id.split('.')
+        data = await self._get('ir.model.data', False).read(
+            [('module', '=', module), ('name', '=', name)], 'model res_id')
+        if data:
+            assert len(data) == 1
+            return Record(self[data[0]['model']], data[0]['res_id'])
+
+    def _new_model(self, name):
+        return AsyncModel._new(self, name)
+
+
+class AsyncModel(Model):
+    """The class for Odoo models of an :class:`AsyncEnv`.
+
+    The fields are loaded on first call to the server.  Then the
+    records can be used: ``await records.read(fields)``.
+    """
+
+    async def _load(self):
+        if self.env._cache_get(('_fields', self._name)) is None:
+            self.env._cache_set(('_fields', self._name), await self._execute('fields_get'))
+
+    async def fields(self, names=None, attributes=None):
+        """Return a dictionary of the fields of the model."""
+        await self._load()
+        return super().fields(names, attributes)
+
+    async def search(self, domain, **kwargs):
+        """Search for records in the `domain`."""
+        if kwargs.get('count'):
+            return await self.search_count(domain)
+        (__, ids) = await asyncio.gather(self._load(), self._execute('search', domain, **kwargs))
+        return self.browse(ids)
+
+    async def get(self, domain, *args, **kwargs):
+        """Return a single :class:`Record`."""
+        if args or kwargs:
+            return await self._execute('get', domain, *args, **kwargs)
+        await self._load()
+        if isinstance(domain, int):
+            return Record(self, domain)
+        if isinstance(domain, str):
+            rec = await self.env.ref(domain)
+            assert not rec or rec._model is self, f'Model mismatch {rec!r} {self!r}'
+            return rec
+        assert issearchdomain(domain)
+        if len(ids := await self._execute('search', domain)) > 1:
+            raise ValueError(f'domain matches too many records ({len(ids)})')
+        return Record(self, ids[0]) if ids else None
+
+    async def create(self, values):
+        """Create one :class:`Record` or many."""
+        await self._load()
+        return await super().create(values)
+
+    async def parallel_search_read(self, domain=None, fields=None, partitions=4):
+        """Combine search and read, with `partitions` concurrent requests.
+
+        Return the rows sorted by id.  See :meth:`Model.parallel_search_read`.
+        """
+        [domain] = searchargs((domain or [],))
+        bounds = await asyncio.gather(*[call() for call in self._bounds(domain)])
+        results = await asyncio.gather(*[self.search_read(part, fields, order='id')
+                                         for part in self._partitions(domain, *bounds, partitions)])
+        return [row for rows in results for row in rows]
+
+    async def search_iter(self, domain=None, fields=None, batch_size=2000):
+        """Iterate over the records in the `domain`, by batches.
+
+        Asynchronous generator, see :meth:`Model.search_iter`.
+        """
+        await self._load()
+        pages = _SearchPages(self, domain, fields, batch_size)
+        for call in pages:
+            for item in pages.items(await call()):
+                yield item
+
+    async def create_bulk(self, values, chunk_size=1000, workers=4, progress=None, errors=None):
+        """Create many records, by chunks sent concurrently."""
+        await self._load()
+        bulk = _BulkCreate(self, values, chunk_size, progress, errors)
+
+        async def create(chunk):
+            return await bulk.create(chunk)
+        with bulk:
+            for (offset, chunk) in bulk.chunks():
+                bulk.pending[asyncio.ensure_future(create(chunk))] = (offset, chunk)
+                if len(bulk.pending) >= workers:
+                    bulk.collect((await asyncio.wait(bulk.pending, return_when=asyncio.FIRST_COMPLETED))[0])
+            if bulk.pending:
+                bulk.collect((await asyncio.wait(bulk.pending))[0])
+        return bulk.records()
+
+    def __getattr__(self, attr):
+        if attr == '_fields' and self.env._cache_get((attr, self._name)) is None:
+            raise Error(f"Fields of {self._name!r} are not loaded: 'await model.fields()'")
+        return super().__getattr__(attr)
+
+
+class AsyncClient:
+    """Connection to an Odoo instance, for :mod:`asyncio`.
+
+    The arguments are the same as :class:`Client`, but the connection
+    is done with ``await client.login(...)`` or ``async with`` statement.
+    The requests share a pool of HTTP connections, and the number of
+    concurrent requests is limited by `max_connections`.  To share
+    this pool between clients, pass the same :class:`AsyncHTTPSession`
+    as `session` argument.
+
+        >>> async with AsyncClient(server, 'prod', 'admin', 'secret') as client:
+        ...     rows = await client.env['res.partner'].search_read([], 'name')
+
+    The local mode is not supported.
+    """
+    server_version = version_info = _object = nodes = limiter = metadata_cache = None
+    verbose = Client.verbose
+    chunk_size = Client.chunk_size
+
+    def __init__(self, server, db=None, user=None, password=None, api_key=None, verbose=False,
+                 *, max_connections=None, session=None, retry=None):
+        self._http = session or AsyncHTTPSession(max_connections)
+        self._inflight = _SingleFlight()
+        self.retry_policy = RetryPolicy() if retry is True else (retry or None)
+        self.stats = Stats()
+        self._hooks = []
+        self._printer = Printer()
+        self._cookies = {}
+        self._session_uid = None
+        self.verbose = verbose
+        rsvr = urlsplit(server)
+        if "@" in rsvr.netloc:
+            self._http.set_auth(server, *rsvr._userinfo)
+            rsvr = rsvr._replace(netloc=rsvr.netloc.rsplit("@", 1)[1])
+        server = rsvr._replace(path=rsvr.path.rstrip('/')).geturl()
+        self._jsonrpc = '/jsonrpc' in server
+        self._server = server if self._jsonrpc or server.endswith('/web') else urljoin(server, '/web')
+        self._credentials = (user, password, db, api_key)
+        self.env = AsyncEnv(self)
+
+    @classmethod
+    async def from_config(cls, environment, user=None, verbose=False):
+        """Create a connection to a defined environment.
+
+        See :meth:`Client.get_config`
+        Return a connected :class:`AsyncClient`.
+        """
+        (server, db, conf_user, password, api_key) = Client.get_config(environment)
+        if user and user != conf_user:
+            password = None
+        client = cls(server, db, verbose=verbose)
+        await client.login(user or conf_user, password=password, api_key=api_key)
+        return client
+
+    def __repr__(self):
+        return f"<AsyncClient '{self._server}?db={self.env.db_name or ''}'>"
+
+    async def __aenter__(self):
+        if self._credentials[0]:
+            await self.login(*self._credentials)
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def close(self):
+        """Close the HTTP connections."""
+        await self._http.close()
+
+    async def _post_jsonrpc(self, endpoint='', params=None):
+        req_id = f"{os.getpid():04x}{int(time.time() * 1E6) % 2**40:010x}"
+        payload = {'jsonrpc': '2.0', 'method': 'call', 'params': params or {}, 'id': req_id}
+        url = urljoin(self._server, endpoint)
+        if not self._printer:
+            resp = await self._http.request(url, json=payload, cookies=self._cookies)
+        else:
+            with self._printer as log:
+                log.print_sent(' '.join([f'POST {urlsplit(url).path}'] + format_params(params or {})))
+                resp = await self._http.request(url, json=payload, cookies=self._cookies)
+                log.print_recv(repr(resp.get('result', resp.get('error'))))
+        if r_error := resp.get('error'):
+            raise ServerError(r_error)
+        return resp.get('result')
+
+    def _execute_jsonrpc(self, *args):
+        return self._post_jsonrpc(params={'service': 'object', 'method': 'execute_kw', 'args': args})
+
+    async def _set_version(self):
+        if self._jsonrpc:
+            info = await self._post_jsonrpc(params={'service': 'common', 'method': 'version', 'args': ()})
+        else:
+            info = await self._post_jsonrpc('web/webclient/version_info')
+        self.server_version = info['server_version']
+        major_minor = re.search(r'\d+\.?\d*', self.server_version).group()
+        self.version_info = float(major_minor)
+        assert self.version_info > 8.0, f'Not supported: Odoo {major_minor}'
+
+    async def _authenticate(self, db, login, password, api_key):
+        if self._jsonrpc:
+            params = {'service': 'common', 'method': 'login', 'args': (db, login, api_key or password)}
+            if not (uid := await self._post_jsonrpc(params=params)):
+                return {'uid': uid}
+            context = await self._execute_jsonrpc(db, uid, api_key or password, 'res.users', 'context_get', ())
+            return {'uid': uid, 'user_context': context}
+        if api_key and not password and self.version_info >= 19.0:
+            context = await AsyncJson2(self, db, api_key)('res.users', 'context_get', ())
+            return {'uid': context['uid'], 'user_context': context, 'db': db}
+        return await self._authenticate_session(db, login, password)
+
+    async def _authenticate_session(self, db, login, password):
+        params = {'db': db, 'login': login, 'password': password}
+        try:
+            info = await self._post_jsonrpc('web/session/authenticate', params)
+        except ServerError as exc:
+            # Ignore: odoo.exceptions.AccessDenied
+            if exc.args[0]['code'] not in (0, 200):
+                raise
+            info = {'uid': None}
+        self._session_uid = info.get('uid')
+        return info
+
+    async def login(self, user, password=None, database=None, api_key=None):
+        """Switch `user` and (optionally) `database`."""
+        if self.server_version is None:
+            await self._set_version()
+        env = self.env
+        if not (database := database or env.db_name or self._credentials[2]):
+            dbs = await self._post_jsonrpc('web/database/list')
+            if len(dbs) != 1:
+                raise Error(f"Database name is required: {dbs}")
+            [database] = dbs
+        if env.db_name != database:
+            env = AsyncEnv(self, database)
+        self.env = await env._login(user, password=password, api_key=api_key)
+        return self.env.uid
+
 
 def _interact(global_vars, use_pprint=True, usage=USAGE):
     import builtins
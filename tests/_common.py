@@ -1,3 +1,10 @@
+import datetime
+import json
+import re
+import secrets
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Lock, Thread
 from urllib.request import urljoin
 from unittest import mock, TestCase
 from unittest.mock import ANY, call, sentinel
@@ -24,6 +31,122 @@ def OBJ(model, method, *params, **kw):
     return ('object.execute_kw', sentinel.AUTH, model, method, params) + ((kw,) if kw else ())
 
 
+FIELDS = {
+    'name': {'type': 'char'},
+    'parent_id': {'type': 'many2one', 'relation': 'res.partner'},
+    'category_ids': {'type': 'many2many', 'relation': 'res.partner.category'},
+}
+PARTNERS = {1: 'Joe', 2: 'Jane', 3: 'Jack'}
+USERS = {'admin': 2, 'demo': 3}
+
+
+class OdooHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+    server_version = '17.0'
+    calls = ports = sessions = None   # Reset for each server
+    unavailable = 0     # Number of calls which fail with HTTP 503
+    chunk_size = 10     # Chunked transfer encoding for 'search_read'
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        params = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+        self.ports.add(self.client_address[1])
+        headers = {}
+        if self.path.startswith('/json/2/'):
+            assert self.headers['Authorization'] == 'Bearer secret-key'
+            (model, method) = self.path.split('/')[3:]
+            self.calls.append((model, method, params))
+            return self._reply(self._execute(model, method, params.get('ids'), params))
+        params = params['params']
+        if self.path == '/web/webclient/version_info':
+            result = {'server_version': self.server_version}
+        elif self.path == '/web/database/list':
+            result = ['db']
+        elif self.path == '/web/session/authenticate':
+            uid = USERS.get(params['login']) if params['password'] == 'passwd' else None
+            result = {'uid': uid, 'user_context': {'lang': 'en_US', 'tz': 'Europe/Zurich'}}
+            session_id = secrets.token_hex(8)
+            self.sessions[session_id] = uid
+            headers['Set-Cookie'] = f'session_id={session_id}; Path=/; HttpOnly'
+        elif OdooHandler.unavailable:
+            OdooHandler.unavailable -= 1
+            return self._reply('Service Unavailable', {'Retry-After': '0'}, status=503)
+        else:
+            [session_id] = re.findall(r'session_id=(\w+)', self.headers['Cookie'])
+            (model, method) = (params['model'], params['method'])
+            self.calls.append((model, method, params['args']))
+            if method == 'unknown':
+                error = {'name': 'builtins.AttributeError', 'debug': '', 'arguments': [method]}
+                return self._reply({'jsonrpc': '2.0', 'id': None, 'error': {'code': 200, 'data': error}})
+            kwargs = {**params['kwargs'], 'uid': self.sessions[session_id]}
+            result = self._execute(model, method, (params['args'] or [None])[0], kwargs)
+        self._reply({'jsonrpc': '2.0', 'id': None, 'result': result}, headers)
+
+    def _execute(self, model, method, ids, kwargs):
+        if model == 'ir.model':
+            return [{'model': 'res.partner', 'transient': False}]
+        if method == 'fields_get':
+            return FIELDS
+        if method == 'search':
+            return [*PARTNERS]
+        if method == 'search_count':
+            return len(PARTNERS)
+        if method in ('read', 'search_read'):
+            ids = None if method == 'search_read' else ids    # The domain is ignored
+            return [{'id': id_, 'name': PARTNERS[id_], 'parent_id': False} for id_ in ids or PARTNERS]
+        if method == 'create':
+            return 42 if isinstance(ids, dict) else [*range(42, 42 + len(ids))]
+        if method == 'context_get':
+            return {'uid': kwargs.get('uid', 2), 'lang': 'en_US', 'tz': 'Europe/Zurich'}
+        return True
+
+    def _reply(self, result, headers=(), status=200):
+        data = json.dumps(result).encode()
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        for (key, value) in dict(headers).items():
+            self.send_header(key, value)
+        if self.chunk_size and self.path.endswith('/search_read'):
+            self.send_header('Transfer-Encoding', 'chunked')
+            self.end_headers()
+            for idx in range(0, len(data), size := self.chunk_size):
+                self.wfile.write(b'%x\r\n%s\r\n' % (len(data[idx:idx + size]), data[idx:idx + size]))
+            self.wfile.write(b'0\r\n\r\n')
+        else:
+            self.send_header('Content-Length', str(len(data)))
+            self.end_headers()
+            self.wfile.write(data)
+
+
+def start_http_server(testcase, handler=OdooHandler):
+    """Start a local HTTP server, and return its URL."""
+    server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+    Thread(target=server.serve_forever, daemon=True).start()
+    testcase.addCleanup(server.server_close)
+    testcase.addCleanup(server.shutdown)
+    if handler is OdooHandler:
+        patcher = mock.patch.multiple(handler, calls=[], ports=set(), sessions={})
+        patcher.start()
+        testcase.addCleanup(patcher.stop)
+    return 'http://127.0.0.1:%d' % server.server_address[1]
+
+
+def close_sessions(testcase):
+    """Close the HTTP sessions created during the test, in all threads."""
+    (sessions, init) = ([], odooly.HTTPSession.__init__)
+
+    def __init__(self, *args, **kwargs):
+        init(self, *args, **kwargs)
+        sessions.append(self)
+    patcher = mock.patch.object(odooly.HTTPSession, '__init__', __init__)
+    patcher.start()
+    testcase.addCleanup(lambda: [session.close() for session in sessions])
+    testcase.addCleanup(patcher.stop)
+
+
 class OdooTestCase(TestCase):
     server_version = None
     server = "http://192.0.2.199:9999"
@@ -138,3 +261,438 @@ class JsonRpcTestCase(OdooTestCase):
                     args = expected[1:]
                 expected_calls[idx] = getattr(call, rpcmethod)(*args)
         self.assertMockCalls(self.service, expected_calls)
+
+
+class HTTPTestCase(OdooTestCase):
+    """Send the requests to a local HTTP server, with the real sessions.
+
+    The server is started on demand: an :class:`OdooHandler`, or a
+    :class:`FakeOdoo` if `fake_odoo` is set.
+    """
+    server = odoo = None
+    (database, user, password) = ('db', 'admin', 'passwd')
+    fake_odoo = False
+
+    def _patch_http_request(self, uid=None, context=None):
+        close_sessions(self)
+
+    def start_server(self, handler=OdooHandler):
+        """Start a server, and return its URL."""
+        if self.fake_odoo:
+            self.odoo = FakeOdoo().start()
+            self.addCleanup(self.odoo.stop)
+            return self.odoo.url
+        return start_http_server(self, handler)
+
+    def connect(self, server=None, **kwargs):
+        """Return a :class:`odooly.Client` logged in the `server`, or the local server."""
+        if server is None:
+            server = self.server = self.server or self.start_server()
+        return odooly.Client(server, self.database, self.user, self.password, **kwargs)
+
+
+# A fake Odoo server with in-memory tables, for load tests and benchmarks
+
+M2O = 'many2one'
+CHAR = {'type': 'char'}
+MODEL_FIELDS = {
+    'ir.model': {'model': CHAR, 'name': CHAR, 'transient': {'type': 'boolean'}},
+    'ir.model.fields': {'model': CHAR, 'name': CHAR, 'ttype': CHAR},
+    'ir.module.module': {'name': CHAR, 'state': CHAR, 'latest_version': CHAR},
+    'res.country': {'name': CHAR, 'code': CHAR},
+    'res.partner': {
+        'name': CHAR, 'email': CHAR, 'ref': CHAR,
+        'active': {'type': 'boolean'},
+        'credit_limit': {'type': 'float'},
+        'parent_id': {'type': M2O, 'relation': 'res.partner'},
+        'child_ids': {'type': 'one2many', 'relation': 'res.partner', 'relation_field': 'parent_id'},
+        'country_id': {'type': M2O, 'relation': 'res.country'},
+        'category_id': {'type': 'many2many', 'relation': 'res.partner.category'},
+    },
+    'res.partner.category': {'name': CHAR},
+    'res.users': {'name': CHAR, 'login': CHAR, 'partner_id': {'type': M2O, 'relation': 'res.partner'}},
+}
+INSTALL_DATE = '2026-01-01 00:00:00'
+COUNTRIES = [('Belgium', 'BE'), ('France', 'FR'), ('Switzerland', 'CH'), ('Germany', 'DE')]
+OPERATORS = {
+    '=': lambda a, b: a == b,
+    '!=': lambda a, b: a != b,
+    '<': lambda a, b: a is not False and a < b,
+    '>': lambda a, b: a is not False and a > b,
+    '<=': lambda a, b: a is not False and a <= b,
+    '>=': lambda a, b: a is not False and a >= b,
+    'in': lambda a, b: (set(a) & set(b)) if isinstance(a, list) else a in b,
+    'not in': lambda a, b: not (set(a) & set(b)) if isinstance(a, list) else a not in b,
+    'like': lambda a, b: str(b) in (a or ''),
+    'ilike': lambda a, b: str(b).lower() in (a or '').lower(),
+    'not like': lambda a, b: str(b) not in (a or ''),
+    'not ilike': lambda a, b: str(b).lower() not in (a or '').lower(),
+}
+
+
+class OdooFault(Exception):
+    """An error returned to the client, like Odoo exceptions."""
+
+    def __init__(self, message, name='odoo.exceptions.UserError', status=422):
+        super().__init__(message)
+        (self.name, self.status) = (name, status)
+
+    def to_dict(self):
+        return {'name': self.name, 'message': str(self), 'arguments': [str(self)], 'debug': ''}
+
+
+class FakeOdoo:
+    """In-memory Odoo server, started in a background thread.
+
+    It speaks enough of the Webclient API, of ``/jsonrpc`` and of
+    ``/json/2/<model>/<method>`` to back the usual methods of the models.
+    An artificial `latency` is spent on each request.
+
+        >>> with FakeOdoo(latency=0.002) as server:
+        ...     server.populate(10000)
+        ...     client = odooly.Client(server.url, 'db', 'admin', 'admin')
+    """
+
+    def __init__(self, latency=0, server_version='17.0', users=None, database='db', port=0):
+        (self.latency, self.server_version, self.database) = (latency, server_version, database)
+        self.tables = {model: {} for model in MODEL_FIELDS}
+        self.sessions = {}
+        self.calls = 0
+        self._lock = Lock()
+        self._next_id = {model: 1 for model in MODEL_FIELDS}
+        dates = {'create_date': INSTALL_DATE, 'write_date': INSTALL_DATE}
+        self._load('ir.model', [{'model': model, 'name': model, 'transient': False, **dates} for model in MODEL_FIELDS])
+        self._load('ir.model.fields', [{'model': model, 'name': name, 'ttype': fld['type'], **dates}
+                                       for (model, fields) in MODEL_FIELDS.items() for (name, fld) in fields.items()])
+        self._load('ir.module.module', [{'name': 'base', 'state': 'installed', 'latest_version': server_version,
+                                         **dates}])
+        self._load('res.country', [{'name': name, 'code': code} for (name, code) in COUNTRIES])
+        self._users = {}
+        for (login, password) in (users or {'admin': 'admin'}).items():
+            [partner_id] = self._load('res.partner', [{'name': login.title(), 'active': True}])
+            self._next_id['res.users'] = max(self._next_id['res.users'], 2)
+            [uid] = self._load('res.users', [{'name': login.title(), 'login': login, 'partner_id': partner_id}])
+            self._users[login] = (uid, password)
+        handler = type('FakeOdooHandler', (FakeOdooHandler,), {'odoo': self})
+        self._httpd = ThreadingHTTPServer(('127.0.0.1', port), handler)
+        self._thread = None
+
+    @property
+    def url(self):
+        return f'http://127.0.0.1:{self._httpd.server_address[1]}'
+
+    def start(self):
+        self._thread = Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *args):
+        self.stop()
+
+    def populate(self, partners=1000, categories=20):
+        """Create `partners` with their categories, countries and parents."""
+        categ_ids = self._load('res.partner.category', [{'name': f'Category {idx}'} for idx in range(categories)])
+        country_ids = [*self.tables['res.country']]
+        rows = [{
+            'name': f'Partner {idx}', 'email': f'partner{idx}@example.com', 'ref': f'P{idx:06}',
+            'active': idx % 10 != 0, 'credit_limit': float(idx % 1000),
+            'country_id': country_ids[idx % len(country_ids)],
+            'category_id': [categ_ids[idx % categories]] if categories else [],
+        } for idx in range(partners)]
+        ids = self._load('res.partner', rows)
+        for (idx, id_) in enumerate(ids):     # Each 10th partner is a company
+            if idx % 10:
+                self.tables['res.partner'][id_]['parent_id'] = ids[idx - idx % 10]
+        return ids
+
+    def _load(self, model, rows):
+        fields = MODEL_FIELDS[model]
+        ids = []
+        now = _now()
+        for values in rows:
+            ids.append(id_ := self._next_id[model])
+            self._next_id[model] += 1
+            record = {name: [] if fld['type'] == 'many2many' else name == 'active'
+                      for (name, fld) in fields.items() if fld['type'] != 'one2many'}
+            self.tables[model][id_] = {**record, 'create_date': now, 'write_date': now, **values, 'id': id_}
+        return ids
+
+    # Protocols
+
+    def authenticate(self, login, password):
+        (uid, secret) = self._users.get(login, (None, None))
+        return uid if uid and password == secret else None
+
+    def check_api_key(self, api_key):
+        return next((uid for (uid, secret) in self._users.values() if secret == api_key), None)
+
+    def execute(self, uid, model, method, args, kwargs):
+        """Call `method` on the `model` table."""
+        if model not in self.tables:
+            raise OdooFault(f"Object {model} doesn't exist", 'builtins.KeyError')
+        kwargs = {**kwargs}
+        context = kwargs.pop('context', None) or {}
+        if method == 'context_get':
+            return {'lang': 'en_US', 'tz': 'Europe/Brussels', 'uid': uid}
+        if method == 'fields_get':
+            return self.fields_get(model)
+        if not (func := getattr(self, f'_{method}', None)) or method.startswith('_'):
+            raise OdooFault(f"The method '{method}' does not exist on the model '{model}'",
+                            'builtins.AttributeError')
+        with self._lock:
+            self.calls += 1
+            return func(model, *args, **kwargs, context=context)
+
+    def fields_get(self, model):
+        dates = dict.fromkeys(['create_date', 'write_date'], {'type': 'datetime', 'readonly': True})
+        fields = {**MODEL_FIELDS[model], **dates, 'display_name': {**CHAR, 'readonly': True}}
+        return {name: {'string': name.replace('_', ' ').title(), **fld} for (name, fld) in fields.items()}
+
+    def doc(self, model):
+        methods = {name: {'api': api, 'parameters': {arg: {} for arg in params}}
+                   for (name, api, params) in _DOC_METHODS}
+        return {'name': model, 'model': model, 'fields': self.fields_get(model), 'methods': methods}
+
+    # Model methods
+
+    def _search(self, model, domain=(), offset=0, limit=None, order=None, count=False, context=None):
+        table = self.tables[model]
+        domain = [*domain]
+        if ('active' in MODEL_FIELDS[model] and (context or {}).get('active_test', True) and
+                not any(term[0] == 'active' for term in domain if len(term) == 3)):
+            domain = ['&', ('active', '=', True), *domain] if domain else [('active', '=', True)]
+        ids = [id_ for (id_, rec) in table.items() if self._match(model, rec, domain)]
+        if count:
+            return len(ids)
+        for spec in reversed([spec.split() for spec in (order or 'id').split(',') if spec.strip()]):
+            name = spec[0]
+            reverse = len(spec) > 1 and spec[1].lower() == 'desc'
+            ids.sort(key=lambda id_: _sort_key(table[id_].get(name)), reverse=reverse)
+        return ids[offset:offset + limit if limit else None]
+
+    def _search_count(self, model, domain=(), limit=None, context=None):
+        return len(self._search(model, domain, limit=limit, context=context))
+
+    def _read(self, model, ids, fields=None, load='_classic_read', context=None):
+        table = self.tables[model]
+        if missing := [id_ for id_ in ids if id_ not in table]:
+            raise OdooFault(f"Record does not exist or has been deleted: {model}{missing}",
+                            'odoo.exceptions.MissingError')
+        (fields, raw) = (fields or [*MODEL_FIELDS[model]], load is None)
+        return [{'id': id_, **{name: self._value(model, table[id_], name, raw) for name in fields}} for id_ in ids]
+
+    def _search_read(self, model, domain=(), fields=None, offset=0, limit=None, order=None, context=None):
+        return self._read(model, self._search(model, domain, offset, limit, order, context=context), fields)
+
+    def _web_read(self, model, ids, specification, context=None):
+        rows = self._read(model, ids, [*specification], load=None)
+        for (name, spec) in specification.items():
+            field = MODEL_FIELDS[model].get(name, CHAR)
+            if field['type'] not in (M2O, 'one2many', 'many2many') or 'fields' not in spec:
+                continue
+            co_ids = sorted({id_ for row in rows for id_ in (row[name] if field['type'] != M2O else [row[name]]) if id_})
+            data = {vals['id']: vals for vals in self._web_read(field['relation'], co_ids, spec['fields'])}
+            for row in rows:
+                if field['type'] != M2O:
+                    row[name] = [data[id_] for id_ in row[name]]
+                elif row[name] and spec['fields']:
+                    row[name] = data[row[name]]
+        return rows
+
+    def _web_search_read(self, model, domain, specification, offset=0, limit=None, order=None, count_limit=None,
+                         context=None):
+        records = self._web_read(model, self._search(model, domain, offset, limit, order, context=context),
+                                 specification)
+        if limit and len(records) == limit:
+            length = self._search_count(model, domain, context=context)
+        else:
+            length = offset + len(records)
+        return {'length': length, 'records': records}
+
+    def _exists(self, model, ids, context=None):
+        return [id_ for id_ in ids if id_ in self.tables[model]]
+
+    def _create(self, model, vals_list, context=None):
+        rows = [self._convert(model, vals) for vals in (vals_list if isinstance(vals_list, list) else [vals_list])]
+        ids = self._load(model, rows)
+        return ids if isinstance(vals_list, list) else ids[0]
+
+    def _write(self, model, ids, vals, context=None):
+        table = self.tables[model]
+        for id_ in ids:
+            table[id_].update(self._convert(model, vals, table[id_]), write_date=_now())
+        return True
+
+    def _unlink(self, model, ids, context=None):
+        for id_ in ids:
+            self.tables[model].pop(id_, None)
+        return True
+
+    # Helpers
+
+    def _match(self, model, record, domain):
+        stack = []
+        for term in reversed(domain):
+            if term == '!':
+                stack.append(not stack.pop())
+            elif term in ('&', '|'):
+                (left, right) = (stack.pop(), stack.pop())
+                stack.append((left and right) if term == '&' else (left or right))
+            else:
+                (name, operator, value) = term
+                if name not in record and name not in MODEL_FIELDS[model]:
+                    raise OdooFault(f"Invalid field {model}.{name} in leaf {term}", 'builtins.ValueError')
+                if operator not in OPERATORS:
+                    raise OdooFault(f"Invalid operator {operator!r}", 'builtins.ValueError')
+                stack.append(bool(OPERATORS[operator](self._value(model, record, name, raw=True), value)))
+        return all(stack)
+
+    def _value(self, model, record, name, raw=False):
+        field = MODEL_FIELDS[model].get(name) or {'type': 'integer' if name == 'id' else 'char'}
+        if name == 'display_name':
+            return record.get('name') or f'{model},{record["id"]}'
+        if field['type'] == 'one2many':
+            inverse = field['relation_field']
+            return [id_ for (id_, rec) in self.tables[field['relation']].items() if rec.get(inverse) == record['id']]
+        value = record.get(name, False)
+        if field['type'] == M2O and value and not raw:
+            return [value, self.tables[field['relation']][value].get('name') or '']
+        return value
+
+    def _convert(self, model, vals, record=None):
+        values = {}
+        for (name, value) in vals.items():
+            field = MODEL_FIELDS[model].get(name)
+            if field is None:
+                raise OdooFault(f"Invalid field '{name}' on model '{model}'", 'builtins.ValueError')
+            if field['type'] == 'one2many':
+                continue
+            if field['type'] == 'many2many':
+                ids = [*(record or {}).get(name, ())]
+                for command in value:
+                    if isinstance(command, int):
+                        ids.append(command)
+                    elif command[0] == 6:
+                        ids = [*command[2]]
+                    elif command[0] == 5:
+                        ids = []
+                    elif command[0] == 4 and command[1] not in ids:
+                        ids.append(command[1])
+                    elif command[0] == 3 and command[1] in ids:
+                        ids.remove(command[1])
+                value = ids
+            values[name] = value
+        return values
+
+
+_DOC_METHODS = [
+    ('create', ['model'], ['vals_list']),
+    ('exists', [], []),
+    ('fields_get', ['model'], ['allfields', 'attributes']),
+    ('read', [], ['fields', 'load']),
+    ('search', ['model'], ['domain', 'offset', 'limit', 'order']),
+    ('search_count', ['model'], ['domain', 'limit']),
+    ('search_read', ['model'], ['domain', 'fields', 'offset', 'limit', 'order']),
+    ('unlink', [], []),
+    ('web_read', [], ['specification']),
+    ('web_search_read', ['model'], ['domain', 'specification', 'offset', 'limit', 'order', 'count_limit']),
+    ('write', [], ['vals']),
+]
+
+
+def _now():
+    return datetime.datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+
+
+def _sort_key(value):
+    return (1, 0) if value is False or value is None else (0, value)
+
+
+class FakeOdooHandler(OdooHandler):
+    chunk_size = 0
+    odoo = None     # FakeOdoo instance
+
+    def do_GET(self):
+        found = re.fullmatch(r'/doc(?:-bearer)?/([\w.]+)\.json', self.path)
+        if found and found.group(1) in self.odoo.tables:
+            return self._reply(self.odoo.doc(found.group(1)))
+        error = OdooFault(f'Not found: {self.path}', 'werkzeug.exceptions.NotFound', 404)
+        self._reply(error.to_dict(), status=error.status)
+
+    def do_HEAD(self):
+        self.send_response(200)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def do_POST(self):
+        payload = json.loads(self.rfile.read(int(self.headers['Content-Length'])) or b'null')
+        if self.odoo.latency:
+            time.sleep(self.odoo.latency)
+        try:
+            if self.path.startswith('/json/2/'):
+                return self._reply(self._json2(payload))
+            (result, headers) = self._jsonrpc(payload['params'])
+        except OdooFault as exc:
+            if self.path.startswith('/json/2/'):
+                return self._reply(exc.to_dict(), status=exc.status)
+            error = {'code': 200, 'message': 'Odoo Server Error', 'data': exc.to_dict()}
+            return self._reply({'jsonrpc': '2.0', 'id': payload.get('id'), 'error': error})
+        self._reply({'jsonrpc': '2.0', 'id': payload.get('id'), 'result': result}, headers)
+
+    def _json2(self, params):
+        api_key = self.headers.get('Authorization', '').partition('Bearer ')[2]
+        if not (uid := self.odoo.check_api_key(api_key)):
+            raise OdooFault('Invalid apikey', 'werkzeug.exceptions.Unauthorized', 401)
+        (model, method) = self.path.split('/')[3:5]
+        params = {**params}
+        args = [params.pop('ids')] if 'ids' in params else []
+        return self.odoo.execute(uid, model, method, args, params)
+
+    def _jsonrpc(self, params):
+        odoo = self.odoo
+        if self.path == '/jsonrpc':
+            (service, method, args) = (params['service'], params['method'], params['args'])
+            if service == 'common' and method == 'version':
+                return self._version_info(), ()
+            if service == 'common' and method in ('login', 'authenticate'):
+                return odoo.authenticate(args[1], args[2]) or False, ()
+            if service == 'db' and method == 'list':
+                return [odoo.database], ()
+            if service == 'object' and method in ('execute', 'execute_kw'):
+                (__, uid, password, model, name) = args[:5]
+                if odoo.authenticate(odoo.tables['res.users'].get(uid, {}).get('login'), password) != uid:
+                    raise OdooFault('Access Denied', 'odoo.exceptions.AccessDenied')
+                if method == 'execute':
+                    return odoo.execute(uid, model, name, args[5:], {}), ()
+                kwargs = args[6] if len(args) > 6 else {}
+                return odoo.execute(uid, model, name, args[5], kwargs), ()
+            raise OdooFault(f'Unknown method {service}.{method}', 'builtins.NameError')
+        if self.path == '/web/webclient/version_info':
+            return self._version_info(), ()
+        if self.path == '/web/database/list':
+            return [odoo.database], ()
+        if self.path == '/web/session/authenticate':
+            uid = odoo.authenticate(params['login'], params['password'])
+            session_id = secrets.token_hex(16)
+            odoo.sessions[session_id] = uid
+            context = {'lang': 'en_US', 'tz': 'Europe/Brussels', 'uid': uid}
+            info = {'uid': uid, 'db': odoo.database, 'username': params['login'], 'user_context': context}
+            return info, {'Set-Cookie': f'session_id={session_id}; Path=/; HttpOnly'}
+        if self.path.startswith('/web/dataset/call_kw'):
+            session_id = ''.join(re.findall(r'session_id=(\w+)', self.headers.get('Cookie') or ''))
+            if not (uid := odoo.sessions.get(session_id)):
+                raise OdooFault('Session expired', 'odoo.http.SessionExpiredException')
+            return odoo.execute(uid, params['model'], params['method'], params['args'], params['kwargs']), ()
+        raise OdooFault(f'Not found: {self.path}', 'werkzeug.exceptions.NotFound', 404)
+
+    def _version_info(self):
+        version_info = [int(part) for part in self.odoo.server_version.split('.')] + [0, 'final', 0, '']
+        return {'server_version': self.odoo.server_version, 'server_version_info': version_info,
+                'server_serie': self.odoo.server_version, 'protocol_version': 1}
@@ -0,0 +1,152 @@
+import asyncio
+from unittest import IsolatedAsyncioTestCase, mock
+
+import odooly
+from ._common import OdooHandler, start_http_server
+
+
+class TestAsyncClient(IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.server = start_http_server(self)
+        self.addCleanup(mock.patch.stopall)
+        mock.patch.dict('odooly.Env._cache', clear=True).start()
+        mock.patch('odooly.getpass', side_effect=RuntimeError).start()
+
+    async def test_login(self):
+        async with odooly.AsyncClient(self.server, 'db', 'admin', 'passwd') as client:
+            self.assertEqual(client.version_info, 17.0)
+            self.assertEqual(client.env.uid, 2)
+            self.assertIsInstance(client.env, odooly.AsyncEnv)
+            self.assertEqual(client.env.context, {'lang': 'en_US', 'tz': 'Europe/Zurich'})
+            self.assertIn('res.partner', client.env.models())
+            self.assertIsInstance(client.env['res.partner'], odooly.AsyncModel)
+            self.assertIs(client.env.user.env, client.env)
+            self.assertEqual(await client.login('admin'), 2)
+
+            with self.assertRaises(odooly.Error):
+                await client.login('admin', 'wrong')
+            self.assertRaises(odooly.Error, client.env.sudo)
+        self.assertEqual(client._http._pool, {})
+
+    async def test_model(self):
+        async with odooly.AsyncClient(self.server, 'db', 'admin', 'passwd') as client:
+            Partner = client.env['res.partner']
+            self.assertEqual(await Partner.search_count([]), 3)
+            self.assertEqual(await Partner.search_read([], 'name'), ['Joe', 'Jane', 'Jack'])
+            self.assertEqual(await Partner.read([2, 1], 'name', order=True), ['Jane', 'Joe'])
+            self.assertEqual(await Partner.read(3, 'name'), 'Jack')
+
+            records = await Partner.search([])
+            self.assertEqual(records.ids, [1, 2, 3])
+            self.assertEqual(await records.read('name'), ['Joe', 'Jane', 'Jack'])
+            with self.assertRaisesRegex(odooly.Error, r"await records.read\('name'\)"):
+                records.name
+            self.assertEqual(await records[:2].read('name parent_id'),
+                             [{'id': 1, 'name': 'Joe', 'parent_id': False},
+                              {'id': 2, 'name': 'Jane', 'parent_id': False}])
+            self.assertEqual(await records[:0].read('name'), [])
+
+            rec = await Partner.create({'name': 'Jill', 'parent_id': records[0], 'category_ids': [7]})
+            self.assertEqual(rec, Partner.browse(42))
+            self.assertIs(await records[1].write({'parent_id': rec}), True)
+            self.assertIs(await records[:0].unlink(), True)
+            joe = records[0]
+            with self.assertRaisesRegex(odooly.Error, r"await record.read\('category_ids'\)"):
+                joe.category_ids
+            self.assertEqual(await joe.read('name'), 'Joe')
+            self.assertEqual(joe.name, 'Joe')   # Cached
+            with self.assertRaises(ValueError):
+                await Partner.get(['name = Joe'])
+            self.assertEqual(await Partner.get(1), records[0])
+
+        self.assertEqual(OdooHandler.calls[:3], [
+            ('ir.model', 'search_read', [[], ['model', 'transient']]),
+            ('res.partner', 'search_count', [[]]),
+            ('res.partner', 'search_read', [[], ['name']]),
+        ])
+        self.assertIn(('res.partner', 'create', [{'name': 'Jill', 'parent_id': 1, 'category_ids': [[6, 0, [7]]]}]),
+                      OdooHandler.calls)
+        self.assertIn(('res.partner', 'write', [[2], {'parent_id': 42}]), OdooHandler.calls)
+
+    async def test_create_bulk(self):
+        async with odooly.AsyncClient(self.server, 'db', 'admin', 'passwd') as client:
+            Partner = client.env['res.partner']
+            (progress, errors) = ([], [])
+            values = ({'name': f'Partner {idx}'} for idx in range(10))
+            records = await Partner.create_bulk(values, chunk_size=4, workers=2, errors=errors,
+                                                progress=lambda count, elapsed: progress.append(count))
+        self.assertEqual(records.ids, [42, 43, 44, 45, 42, 43, 44, 45, 42, 43])
+        self.assertEqual(progress, [4, 8, 10])
+        self.assertEqual(errors, [])
+        self.assertEqual(sum(call[1] == 'create' for call in OdooHandler.calls), 3)
+
+    async def test_chunks(self):
+        async with odooly.AsyncClient(self.server, 'db', 'admin', 'passwd') as client:
+            client.chunk_size = 2
+            Partner = client.env['res.partner']
+            self.assertEqual(await Partner.read([3, 1, 2], 'name', order=True), ['Jack', 'Joe', 'Jane'])
+            self.assertIs(await Partner.browse([1, 2, 3]).unlink(), True)
+        # The chunks are sent concurrently
+        self.assertEqual(sorted(call for call in OdooHandler.calls if call[1] in ('read', 'unlink')), [
+            ('res.partner', 'read', [[1, 2], ['name']]),
+            ('res.partner', 'read', [[3], ['name']]),
+            ('res.partner', 'unlink', [[1, 2]]),
+            ('res.partner', 'unlink', [[3]]),
+        ])
+
+    async def test_search_iter(self):
+        async with odooly.AsyncClient(self.server, 'db', 'admin', 'passwd') as client:
+            Partner = client.env['res.partner']
+            batches = [batch async for batch in Partner.search_iter(['name like J'], batch_size=5)]
+        self.assertEqual(batches, [Partner.browse([1, 2, 3])])
+        self.assertIn(('res.partner', 'search', [[['id', '>', 0], ['name', 'like', 'J']], 0, 5, 'id']),
+                      OdooHandler.calls)
+
+    async def test_parallel_search_read(self):
+        async with odooly.AsyncClient(self.server, 'db', 'admin', 'passwd') as client:
+            Partner = client.env['res.partner']
+            rows = await Partner.parallel_search_read(['name like J'], 'name', partitions=2)
+        self.assertEqual(rows, ['Joe', 'Jane', 'Jack'])
+        self.assertIn(('res.partner', 'search', [[['name', 'like', 'J']], 0, 1, 'id desc']), OdooHandler.calls)
+        self.assertIn(('res.partner', 'search_read', [[['id', '>=', 1], ['id', '<', 2], ['name', 'like', 'J']],
+                                                      ['name']]), OdooHandler.calls)
+
+    async def test_concurrency(self):
+        async with odooly.AsyncClient(self.server, 'db', 'admin', 'passwd', max_connections=3) as client:
+            Partner = client.env['res.partner']
+            counts = await asyncio.gather(*[Partner.search_count([('id', '!=', idx)]) for idx in range(30)])
+        self.assertEqual(counts, [3] * 30)
+        self.assertLessEqual(len(OdooHandler.ports), 3)
+
+    async def test_retry(self):
+        async with odooly.AsyncClient(self.server, 'db', 'admin', 'passwd', retry=True) as client:
+            with mock.patch.object(OdooHandler, 'unavailable', 2):
+                Partner = client.env['res.partner']
+                self.assertEqual(await Partner.search_count([]), 3)
+                self.assertEqual(OdooHandler.unavailable, 0)
+                await Partner.fields()
+                OdooHandler.unavailable = 1
+                with self.assertRaisesRegex(OSError, 'HTTP Error 503'):
+                    await Partner.create({'name': 'Jill'})
+
+    async def test_single_flight(self):
+        async with odooly.AsyncClient(self.server, 'db', 'admin', 'passwd') as client:
+            Partner = client.env['res.partner']
+            rows = await asyncio.gather(*[Partner.search_read([], 'name parent_id') for __ in range(3)])
+            self.assertEqual(await asyncio.gather(Partner.search_count([]), Partner.search_count([])), [3, 3])
+        self.assertEqual(rows[0], rows[2])
+        self.assertIsNot(rows[0][0], rows[2][0])
+        calls = [method for (model, method, __) in OdooHandler.calls if model == 'res.partner']
+        self.assertEqual(calls, ['search_read', 'search_count'])
+
+    async def test_json2(self):
+        with mock.patch.object(OdooHandler, 'server_version', '19.0'):
+            client = odooly.AsyncClient(self.server, 'db')
+            await client.login('admin', api_key='secret-key')
+            self.assertIsInstance(client.env._execute_kw, odooly.AsyncJson2)
+            self.assertNotIn('_local', vars(client.env._execute_kw))
+            self.assertEqual(await client.env['res.partner'].read(1, 'name'), 'Joe')
+            await client.close()
+        context = {'uid': 2, 'lang': 'en_US', 'tz': 'Europe/Zurich'}
+        self.assertEqual(OdooHandler.calls[-1], ('res.partner', 'read', {'ids': [1], 'fields': ['name'], 'context': context}))
@@ -1,8 +1,20 @@
+import gc
+import socket
+import tempfile
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from email.utils import formatdate
+from pathlib import Path
+from functools import partial
 from unittest import mock
 from unittest.mock import call, sentinel, ANY
+from http.client import HTTPMessage
+from urllib.error import HTTPError, URLError
 
 import odooly
-from ._common import JsonRpcTestCase, OBJ
+from ._common import HTTPTestCase, JsonRpcTestCase, OBJ, OdooHandler
 
 AUTH = sentinel.AUTH
 ID1, ID2 = 4001, 4002
@@ -59,6 +71,8 @@ class TestServiceJsonRpc(JsonRpcTestCase):
         proxy = getattr(odooly.Client, '_proxy_%s' % self.protocol)
         client = mock.Mock()
         client._printer = mock.MagicMock(name='Printer')
+        client.stats = odooly.Stats()
+        client._hooks = []
         client._proxy = proxy.__get__(client, odooly.Client)
         client._server = f"{self.server}/{self.protocol}"
         client._post_jsonrpc = odooly.Client._post_jsonrpc.__get__(client, odooly.Client)
@@ -157,8 +171,8 @@ class TestCreateClient(JsonRpcTestCase):
         self.service.database.list.return_value = ['newdb']
         self.service.common.login.return_value = 1
 
-        s_context = '{"lang": "en_US", "tz": "Europe/Zurich"}'
-        key_1 = b"\0\0\0\1" + bytes.fromhex(f'{hash("{}")%2**32:08x}')
+        s_context = odooly._json_dumps({'tz': 'Europe/Zurich', 'lang': 'en_US'}, sort_keys=True)
+        key_1 = b"\0\0\0\1" + bytes.fromhex(f'{hash(b"{}")%2**32:08x}')
         key_2 = b"\0\0\0\1" + bytes.fromhex(f'{hash(s_context)%2**32:08x}')
         client = odooly.Client(self.server, 'newdb', 'usr', 'pss')
         expected_calls = self.startup_calls + (
@@ -618,3 +632,706 @@ class TestClientApi18(TestClientApi):
 class TestClientApi19(TestClientApi):
     """Test the Client API for Odoo 19."""
     server_version = '19.0'
+
+
+class TestThreads(HTTPTestCase):
+    """Share a Client between threads."""
+
+    def test_threads(self):
+        client = self.connect()
+        (admin, demo) = (client.env, client.env(user='demo', password='passwd'))
+        self.assertEqual(len(OdooHandler.sessions), 2)
+
+        def work(env):
+            uids = {env.execute('res.users', 'context_get')['uid'] for __ in range(10)}
+            self.assertEqual(env['res.partner'].search_count([]), 3)
+            return uids
+
+        # Each thread authenticates its own Web session
+        with ThreadPoolExecutor(16) as executor:
+            self.assertEqual([*executor.map(work, [admin, demo] * 32)], [{2}, {3}] * 32)
+            self.assertGreater(len(OdooHandler.sessions), 2)
+
+            with admin.batch() as batch:
+                self.assertIs(admin._batch, batch)
+                self.assertIsNone(executor.submit(getattr, admin, '_batch').result())
+            self.assertIsNone(admin._batch)
+
+
+class TestNodePool(HTTPTestCase):
+    """Spread the requests on several nodes."""
+
+    def start_node(self):
+        # Each node has its own Web sessions
+        handler = type('NodeHandler', (OdooHandler,), {'calls': [], 'ports': set(), 'sessions': {}})
+        return self.start_server(handler), handler
+
+    def test_nodes(self):
+        ((server1, node1), (server2, node2)) = (self.start_node(), self.start_node())
+        hosts = f"{server1[7:]},{server2[7:]}"
+        client = self.connect(f'http://{hosts}')
+        self.assertEqual(client.nodes.nodes, [server1, server2])
+        self.assertEqual(client.nodes.geturl(client._server), f'http://{hosts}/web')
+        self.assertEqual(repr(client), f"<Client '{server1}/web?db=db'>")
+
+        # Session affinity: the Web session stays on the same node
+        for __ in range(4):
+            self.assertEqual(client.env['res.partner'].search_count([]), 3)
+        self.assertEqual(len(node1.sessions), 1)
+        self.assertEqual((node2.sessions, node2.calls), ({}, []))
+
+        with ThreadPoolExecutor(8) as executor:
+            counts = executor.map(client.env['res.partner'].search_count, [[]] * 64)
+            self.assertEqual([*counts], [3] * 64)
+        self.assertTrue(node1.sessions and node2.sessions)
+        self.assertEqual(client.nodes.status(), {server1: 0, server2: 0})
+
+    def test_failover(self):
+        (server, node) = self.start_node()
+        with socket.socket() as sock:   # Nobody listens on this port
+            sock.bind(('127.0.0.1', 0))
+            offline = 'http://127.0.0.1:%d' % sock.getsockname()[1]
+        pool = odooly.NodePool([offline, server])
+        client = self.connect(pool)
+        for __ in range(4):
+            self.assertEqual(client.env['res.partner'].search_count([]), 3)
+        self.assertEqual(pool.status(), {offline: None, server: 0})
+        self.assertEqual(pool.check(), {offline: False, server: True})
+
+    def test_strategy(self):
+        sent = []
+        pool = odooly.NodePool(['http://node1:8069', 'http://node2:8069/web'], 'least_outstanding')
+        pool._outstanding['http://node1:8069'] = 3
+        for __ in range(3):
+            pool.request(sent.append, 'http://node1:8069/web/dataset/call_kw')
+        pool.request(sent.append, 'http://example.com/web')
+        self.assertEqual(sent, ['http://node2:8069/web/dataset/call_kw'] * 3 + ['http://example.com/web'])
+
+        pool = odooly.NodePool(['http://node1:8069', 'http://node2:8069'])
+        for __ in range(4):
+            pool.request(sent.append, 'http://node2:8069/jsonrpc')
+        self.assertEqual(sent[4:], ['http://node1:8069/jsonrpc', 'http://node2:8069/jsonrpc'] * 2)
+        self.assertRaises(ValueError, odooly.NodePool, ['http://node1:8069'], 'random')
+
+    def test_refused(self):
+        def send(url, **kw):
+            sent.append(url)
+            if url.startswith('http://node1:'):
+                raise URLError(ConnectionRefusedError())
+            return 42
+
+        (sent, state) = ([], odooly._ThreadState())
+        pool = odooly.NodePool(['http://node1:8069', 'http://node2:8069'])
+        self.assertEqual(pool.request(send, 'http://node1:8069/jsonrpc'), 42)
+        self.assertEqual(pool.request(send, 'http://node1:8069/jsonrpc'), 42)
+        self.assertEqual(sent, ['http://node1:8069/jsonrpc', 'http://node2:8069/jsonrpc',
+                                'http://node2:8069/jsonrpc'])
+
+        # Session affinity
+        pool._down.clear()
+        state.node, state.session_uid = 'http://node1:8069', 2
+        with self.assertRaises(URLError):
+            pool.request(send, 'http://node1:8069/web/dataset/call_kw', state)
+        self.assertEqual((state.node, state.session_uid), (None, None))
+        self.assertEqual(pool.request(send, 'http://node1:8069/web/session/authenticate', state), 42)
+        self.assertEqual(state.node, 'http://node2:8069')
+
+        # All nodes refuse the connection
+        pool = odooly.NodePool(['http://node1:8069', 'http://node1:8169'])
+        with self.assertRaises(URLError):
+            pool.request(send, 'http://node1:8069/jsonrpc')
+        self.assertEqual(sent[-2:], ['http://node1:8069/jsonrpc', 'http://node1:8169/jsonrpc'])
+
+
+class TestRetryPolicy(HTTPTestCase):
+    """Retry the calls on transient errors."""
+
+    def http_error(self, status, retry_after=None):
+        headers = HTTPMessage()
+        if retry_after is not None:
+            headers['Retry-After'] = retry_after
+        return HTTPError('http://127.0.0.1/web', status, 'Error', headers, None)
+
+    def test_retry(self):
+        policy = odooly.RetryPolicy(backoff=0.001)
+        func = mock.Mock(side_effect=[self.http_error(503), ConnectionResetError(), 42])
+        self.assertEqual(policy('server', 'read', func), 42)
+        self.assertEqual(func.call_count, 3)
+
+        # Not idempotent
+        func = mock.Mock(side_effect=[self.http_error(503), 42])
+        self.assertRaises(HTTPError, policy, 'server', 'create', func)
+        # Not transient
+        func = mock.Mock(side_effect=[self.http_error(400), 42])
+        self.assertRaises(HTTPError, policy, 'server', 'read', func)
+        func = mock.Mock(side_effect=odooly.ServerError({'code': 200, 'data': {'name': 'odoo.exceptions.UserError'}}))
+        self.assertRaises(odooly.ServerError, policy, 'server', 'read', func)
+        self.assertRaises(TypeError, odooly.RetryPolicy, max_retries=3)
+
+        # Too many retries
+        func = mock.Mock(side_effect=ConnectionResetError())
+        self.assertRaises(ConnectionResetError, policy, 'server', 'search', func)
+        self.assertEqual(func.call_count, 4)
+
+    def test_serialization_failure(self):
+        policy = odooly.RetryPolicy(backoff=0.001)
+        error = {'code': 200, 'data': {'name': 'psycopg2.errors.SerializationFailure'}}
+        func = mock.Mock(side_effect=[odooly.ServerError(error), True])
+        self.assertIs(policy('server', 'write', func), True)
+        self.assertEqual(func.call_count, 2)
+
+    def test_retry_after(self):
+        policy = odooly.RetryPolicy()
+        with mock.patch('odooly.time.sleep') as mock_sleep:
+            func = mock.Mock(side_effect=[self.http_error(429, '2'), self.http_error(503), 42])
+            self.assertEqual(policy('server', 'read', func), 42)
+            func = mock.Mock(side_effect=[self.http_error(503, '120'), 42])
+            self.assertRaises(HTTPError, policy, 'server', 'read', func)
+        self.assertEqual(mock_sleep.call_args_list[0], call(2.0))
+        self.assertTrue(0.5 <= mock_sleep.call_args_list[1][0][0] <= 1.0)
+        self.assertEqual(mock_sleep.call_count, 2)
+
+        # HTTP date
+        self.assertTrue(3.0 < odooly._retry_after(self.http_error(503, formatdate(time.time() + 5))) <= 5.0)
+        self.assertEqual(odooly._retry_after(self.http_error(503, formatdate(time.time() - 60))), 0.0)
+        self.assertIsNone(odooly._retry_after(self.http_error(503, 'tomorrow')))
+        self.assertIsNone(odooly._retry_after(self.http_error(503)))
+
+    def test_circuit_breaker(self):
+        policy = odooly.RetryPolicy(retries=0, failure_threshold=2, reset_timeout=0.05)
+        func = mock.Mock(side_effect=ConnectionRefusedError())
+        self.assertRaises(ConnectionRefusedError, policy, 'server', 'read', func)
+        self.assertRaises(ConnectionRefusedError, policy, 'server', 'read', func)
+        # Fail fast
+        with self.assertRaisesRegex(odooly.Error, 'Server is unavailable'):
+            policy('server', 'read', func)
+        self.assertEqual(func.call_count, 2)
+        self.assertEqual(policy('other', 'read', mock.Mock(return_value=42)), 42)
+
+        # After some time, a trial call closes the circuit
+        time.sleep(0.06)
+        self.assertEqual(policy('server', 'read', mock.Mock(return_value=42)), 42)
+        self.assertRaises(ConnectionRefusedError, policy, 'server', 'read', func)
+        self.assertEqual(policy._circuits, {'server': (1, None)})
+
+        # An error of the server closes the circuit too
+        self.assertRaises(ConnectionRefusedError, policy, 'server', 'read', func)
+        time.sleep(0.06)
+        error = odooly.ServerError({'code': 200, 'data': {'name': 'odoo.exceptions.UserError'}})
+        self.assertRaises(odooly.ServerError, policy, 'server', 'read', mock.Mock(side_effect=error))
+        self.assertEqual(policy._circuits, {})
+
+    def test_client(self):
+        client = self.connect(retry=True)
+        self.assertIsInstance(client.retry_policy, odooly.RetryPolicy)
+        with mock.patch.object(OdooHandler, 'unavailable', 2):
+            self.assertEqual(client.env['res.partner'].search_count([]), 3)
+        client.retry_policy = None
+        with mock.patch.object(OdooHandler, 'unavailable', 1):
+            self.assertRaises(HTTPError, client.env['res.partner'].search_count, [])
+        # Disabled by default
+        self.assertIsNone(odooly.Client(self.server, 'db').retry_policy)
+
+
+class TestRateLimiter(HTTPTestCase):
+    """Limit the rate and the concurrency of the requests."""
+
+    def test_rate(self):
+        limiter = odooly.RateLimiter(max_rps=200, burst=1)
+        start = time.monotonic()
+        self.assertEqual([limiter(lambda: 42) for __ in range(11)], [42] * 11)
+        self.assertGreaterEqual(time.monotonic() - start, 0.045)
+
+        # The slot is taken after the token
+        limiter = odooly.RateLimiter(max_rps=10, burst=1, max_concurrency=1)
+        limiter(lambda: None)
+        with ThreadPoolExecutor(1) as executor:
+            future = executor.submit(limiter, lambda: limiter._active)
+            time.sleep(0.02)
+            self.assertEqual(limiter._active, 0)
+            self.assertEqual(future.result(), 1)
+
+    def test_concurrency(self):
+        (limiter, active, lock) = (odooly.RateLimiter(max_concurrency=3), [0], threading.Lock())
+
+        def func():
+            with lock:
+                active[0] += 1
+                peak.append(active[0])
+            time.sleep(0.005)
+            with lock:
+                active[0] -= 1
+
+        peak = []
+        with ThreadPoolExecutor(8) as executor:
+            [*executor.map(limiter, [func] * 40)]
+        self.assertEqual(max(peak), 3)
+        self.assertEqual(limiter._active, 0)
+
+    def test_aimd(self):
+        limiter = odooly.RateLimiter(max_concurrency=8)
+        error = HTTPError('http://127.0.0.1/web', 503, 'Error', HTTPMessage(), None)
+        with self.assertRaises(HTTPError):
+            limiter(mock.Mock(side_effect=error))
+        self.assertEqual(limiter.limit, 4)
+        # Requests sent before the decrease are ignored
+        limiter._decreased += 1
+        self.assertRaises(HTTPError, limiter, mock.Mock(side_effect=error))
+        self.assertEqual(limiter.limit, 4)
+        limiter._decreased -= 1
+        # Other errors are not a sign of overload
+        self.assertRaises(ValueError, limiter, mock.Mock(side_effect=ValueError))
+        for __ in range(12):
+            limiter(mock.Mock())
+        self.assertTrue(6 < limiter.limit < 8, limiter.limit)
+        for __ in range(30):
+            limiter(mock.Mock())
+        self.assertEqual(limiter.limit, 8)
+
+        # Latency
+        limiter.max_latency = 0.001
+        limiter(partial(time.sleep, 0.01))
+        self.assertEqual(limiter.limit, 4)
+
+    def test_client(self):
+        client = self.connect(max_concurrency=2)
+        self.assertIs(client._http.limiter, client.limiter)
+        self.assertEqual(client.limiter.max_concurrency, 2)
+        with ThreadPoolExecutor(4) as executor:
+            counts = executor.map(client.env['res.partner'].search_count, [[('id', '!=', idx)] for idx in range(8)])
+            self.assertEqual([*counts], [3] * 8)
+        self.assertIsNone(odooly.Client(self.server, 'db').limiter)
+
+    def test_config(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            (conf := Path(tmpdir, 'odooly.ini')).write_text(
+                "[DEFAULT]\nmax_rps = 50\n\n[demo]\nusername = demo\nmax_concurrency = 4\n"
+                "\n[cached]\ncache_dir = ~/.cache/odooly\n\n[chunked]\nchunk_size = 5000\nchunk_workers = 4\n"
+                "\n[retried]\nretry = yes\n")
+            with mock.patch('odooly.Client._config_file', conf):
+                self.assertEqual(odooly.Client._read_options('demo'), {'max_rps': 50, 'max_concurrency': 4})
+                self.assertEqual(odooly.Client._read_options('cached'),
+                                 {'max_rps': 50, 'cache_dir': str(Path.home() / '.cache/odooly')})
+                self.assertEqual(odooly.Client._read_options('chunked'),
+                                 {'max_rps': 50, 'chunk_size': 5000, 'chunk_workers': 4})
+                self.assertEqual(odooly.Client._read_options('retried'), {'max_rps': 50, 'retry': True})
+                self.assertEqual(odooly.Client._read_options('other'), {})
+
+
+class TestStats(HTTPTestCase):
+    """Metrics of the calls and the requests."""
+
+    def test_percentile(self):
+        metric = odooly._Metric()
+        for ms in range(1, 101):
+            metric.add(ms / 1000, 10, 100, ms > 98)
+        self.assertEqual((metric.count, metric.errors, metric.sent, metric.received), (100, 2, 1000, 10000))
+        self.assertTrue(0.050 <= metric.percentile(0.5) < 0.050 * 1.25, metric.percentile(0.5))
+        self.assertTrue(0.095 <= metric.percentile(0.95) < 0.095 * 1.25, metric.percentile(0.95))
+        self.assertTrue(0.100 <= metric.percentile(1) < 0.100 * 1.25, metric.percentile(1))
+
+    def test_client(self):
+        client = self.connect()
+        self.assertIs(client.env.stats, client.stats)
+        client.stats.reset()
+        Partner = client.env['res.partner']
+        for __ in range(3):
+            Partner.search_count([])
+        self.assertEqual([*Partner.search_read([], 'name', stream=True)], ['Joe', 'Jane', 'Jack'])
+        with self.assertRaises(odooly.ServerError):
+            Partner.unknown()
+
+        rows = {(row['kind'], row['model'], row['method']): row for row in client.stats.summary()}
+        call = rows['call', 'res.partner', 'search_count']
+        self.assertEqual((call['protocol'], call['count'], call['errors']), ('Web API', 3, 0))
+        self.assertTrue(0 < call['p50'] <= call['p95'] <= call['p99'])
+        request = rows['request', 'res.partner', 'search_count']
+        self.assertEqual((request['protocol'], request['count'], request['errors']), ('Web API', 3, 0))
+        self.assertGreater(request['sent'], 100)
+        self.assertGreater(request['received'], 30)
+        self.assertIn(('request', 'res.partner', 'search_read'), rows)
+        self.assertEqual(rows['call', 'res.partner', 'unknown']['errors'], 1)
+
+        report = client.stats.report().splitlines()
+        self.assertEqual(len(report), 1 + len(rows))
+        self.assertIn('call     Web API   res.partner / search_count', client.stats.report())
+
+        client.stats.enabled = False
+        client.env['res.partner'].search_count([])
+        self.assertEqual(len(client.stats.summary()), len(rows))
+        client.stats.reset()
+        self.assertEqual(client.stats.summary(), [])
+
+
+class TestHooks(HTTPTestCase):
+    """Hooks around the requests."""
+
+    def test_hooks(self):
+        (client, events) = (self.connect(), [])
+        Partner = client.env['res.partner']
+        hook = client.add_hook(
+            lambda info: info.update(span=len(events)),
+            lambda info, res: events.append(('response', info, res)),
+            lambda info, exc: events.append(('error', info, exc)))
+        self.assertEqual(Partner.search_count([]), 3)
+        with self.assertRaises(odooly.ServerError):
+            Partner.unknown()
+        client.remove_hook(hook)
+        Partner.search_count([('id', '>', 1)])
+        client.add_hook(on_response=lambda info, res: events.append(('response', info, res)))
+        client.web_webclient.version_info()
+
+        self.assertEqual([(kind, info['method']) for (kind, info, __) in events],
+                         [('response', 'search_count'), ('error', 'unknown'), ('response', 'version_info')])
+        (__, info, res) = events[0]
+        self.assertEqual(res, 3)
+        self.assertEqual((info['protocol'], info['model'], info['span']), ('Web API', 'res.partner', 0))
+        self.assertEqual(info['args']['args'], ([],))
+        self.assertGreater(info['sent'], 100)
+        self.assertGreater(info['received'], 30)
+        self.assertGreater(info['elapsed'], 0)
+        self.assertIsInstance(events[1][2], odooly.ServerError)
+        self.assertEqual(events[2][1]['model'], 'web/webclient')
+
+    def test_hide_secrets(self):
+        (client, events) = (self.connect(), [])
+        client.add_hook(events.append)
+        client.login('admin', 'passwd')
+        client.env['res.partner'].search_count([])
+        self.assertEqual(events[0]['method'], 'authenticate')
+        self.assertEqual(events[0]['args']['password'], '*')
+        self.assertNotIn('passwd', repr(events))
+
+        # Arguments of the RPC services
+        self.assertEqual(odooly._hide_secrets(('db', 2, 'passwd', 'res.users', 'read')),
+                         ('db', 2, '*', 'res.users', 'read'))
+        self.assertEqual(odooly._hide_secrets(('admin', 'db'), 'db'), ('*', 'db'))
+        self.assertEqual(odooly._hide_secrets(('db', 'admin')), ('db', 'admin'))
+
+
+class TestEnvCache(HTTPTestCase):
+    """Bounded cache of the environments and the fields."""
+
+    def test_evict(self):
+        cache = odooly.EnvCache(maxsize=3)
+        cache['auth', 'db', 'srv'] = {'usr': (1, 'pss')}
+        cache[odooly.Env, 'db', 'srv'] = 'root env'
+        for name in 'abcd':
+            cache[('_fields', name), 'db', 'srv'] = {'name': {'type': 'char'}}
+        self.assertEqual(len(cache), 3)
+        self.assertIn(('auth', 'db', 'srv'), cache)
+        self.assertIn((odooly.Env, 'db', 'srv'), cache)
+        self.assertEqual([key[0] for key in cache][2:], [('_fields', 'd')])
+
+        # Least recently used
+        cache.maxsize = 4
+        cache[('_fields', 'e'), 'db', 'srv'] = {}
+        cache[('_fields', 'd'), 'db', 'srv']
+        cache[b'\0\0\0\1ctx', 'db', 'srv'] = {}
+        self.assertEqual([key[0] for key in cache][2:], [('_fields', 'd'), b'\0\0\0\1ctx'])
+        self.assertEqual(cache.get(('_fields', 'e')), None)
+        self.assertEqual(cache.cache_info(), {
+            'entries': 4, 'size': sum(odooly._sizeof(value) for value in cache.copy().values()),
+            'hits': 1, 'misses': 1, 'evictions': 4})
+
+    def test_maxbytes(self):
+        fields = {f'field_{idx}': {'type': 'char', 'string': f'Field {idx}'} for idx in range(20)}
+        size = odooly._sizeof(fields)
+        cache = odooly.EnvCache(maxbytes=size * 3 + size // 2)
+        for name in 'abcdef':
+            cache[('_fields', name), 'db', 'srv'] = {**fields}
+        self.assertLessEqual(cache.size, cache.maxbytes)
+        self.assertEqual([key[0] for key in cache], [('_fields', 'd'), ('_fields', 'e'), ('_fields', 'f')])
+        self.assertEqual(cache.evictions, 3)
+
+        # An entry larger than maxbytes is not stored
+        cache[('_fields', 'big'), 'db', 'srv'] = {name: fields for name in 'wxyz'}
+        self.assertNotIn((('_fields', 'big'), 'db', 'srv'), cache)
+        self.assertEqual((len(cache), cache.evictions), (3, 4))
+        cache.clear()
+        self.assertEqual((len(cache), cache.size), (0, 0))
+
+        # A limit of zero is not replaced by the default
+        cache = odooly.EnvCache(maxsize=0, maxbytes=0)
+        self.assertEqual((cache.maxsize, cache.maxbytes), (0, 0))
+        cache['auth', 'db', 'srv'] = {}
+        cache[('_fields', 'a'), 'db', 'srv'] = {}
+        self.assertEqual([*cache], [('auth', 'db', 'srv')])
+
+    fake_odoo = True
+    password = 'admin'
+
+    def test_env(self):
+        with mock.patch.object(odooly.Env._cache, 'maxsize', 8):
+            client = self.connect()
+            count = client.env['res.partner'].search_count([])
+            evictions = odooly.Env._cache.evictions
+            for idx in range(20):
+                self.assertEqual(client.env(context={'idx': idx})['res.partner'].search_count([]), count)
+            self.assertEqual(len(odooly.Env._cache), 8)
+            self.assertEqual(odooly.Env._cache.evictions - evictions, 17)
+            self.assertIs(odooly.Env(client, 'db').client, client)
+            self.assertIn('admin', client.env._cache_get('auth'))
+
+
+class TestMetadataCache(HTTPTestCase):
+    """Persistent cache of the fields and the models."""
+    fake_odoo = True
+    password = 'admin'
+
+    def setUp(self):
+        super().setUp()
+        self.cache_dir = tempfile.mkdtemp()
+        self.caches = mock.patch('odooly._metadata_caches', weakref.WeakSet()).start()
+        mock.patch('odooly.MetadataCache._unavailable', set()).start()
+
+    def _calls(self):
+        odooly.Env._cache.clear()
+        client = self.connect(cache_dir=self.cache_dir)
+        client.stats.reset()
+        client.env['res.partner']._fields
+        client.env['res.country']._fields
+        self.assertIn('res.partner', client.env.models())
+        client.metadata_cache.save()
+        self.requests = {f"{row['model']}.{row['method']}": row['count']
+                         for row in client.stats.summary() if row['kind'] == 'request'}
+        return sorted(f"{row['model']}.{row['method']}" for row in client.stats.summary() if row['kind'] == 'call')
+
+    def test_cache(self):
+        all_calls = ['ir.model.fields_get', 'ir.model.search_read', 'res.country.fields_get', 'res.partner.fields_get']
+        self.assertEqual(self._calls(), all_calls)
+        self.assertEqual(len([*Path(self.cache_dir).glob('*.json.gz')]), 1)
+        self.assertEqual(self._calls(), [])
+
+        # Only the models of the changed fields are discarded
+        [field_id] = self.odoo._search('ir.model.fields', [('model', '=', 'res.country'), ('name', '=', 'code')])
+        self.odoo._write('ir.model.fields', [field_id], {'ttype': 'char'})
+        self.assertEqual(self._calls(), ['res.country.fields_get'])
+        self.odoo._load('ir.model.fields', [{'model': 'res.partner', 'name': 'x_code', 'ttype': 'char'}])
+        self.assertEqual(self._calls(), ['res.partner.fields_get'])
+        self.odoo._load('ir.model.fields', [{'model': 'x.model', 'name': 'x_code', 'ttype': 'char'}])
+        self.assertEqual(self._calls(), ['ir.model.search_read'])
+        self.assertEqual(self._calls(), [])
+
+        # Removed fields, or a module upgrade: rebuild the cache
+        self.odoo._unlink('ir.model.fields', [field_id])
+        self.assertEqual(self._calls(), all_calls)
+        self.odoo._write('ir.module.module', [1], {'latest_version': '17.0.1.0'})
+        self.assertEqual(self._calls(), all_calls)
+        self.assertEqual(self._calls(), [])
+
+    def test_clear(self):
+        self._calls()
+        odooly.MetadataCache(self.cache_dir).clear()
+        self.assertEqual(len(self._calls()), 4)
+        # No access to the registry: it is checked once
+        with mock.patch.dict(self.odoo.tables, {'ir.model.fields': {}}):
+            del self.odoo.tables['ir.model.fields']
+            self.assertEqual(len(self._calls()), 4)
+            self.assertEqual(self.requests['ir.module.module.search_read'], 1)
+            self.assertEqual(self.requests['ir.model.fields.search_count'], 1)
+            self.assertEqual(len(self._calls()), 4)
+            self.assertNotIn('ir.module.module.search_read', self.requests)
+
+    def test_save_on_exit(self):
+        cache = odooly.MetadataCache(self.cache_dir)
+        self.assertIn(cache, self.caches)
+        with mock.patch.object(cache, 'save') as mock_save:
+            odooly._save_metadata_caches()
+        mock_save.assert_called_once_with()
+        del cache, mock_save
+        gc.collect()
+        self.assertEqual(len(self.caches), 0)
+
+
+class TestCassette(HTTPTestCase):
+    """Record and replay the HTTP requests."""
+
+    def _session(self, server):
+        odooly.Env._cache.clear()
+        Partner = self.connect(server).env['res.partner']
+        rows = [Partner.search_count([]), Partner.read([1, 2], 'name'),
+                [*Partner.search_read([], 'name', stream=True)]]
+        with self.assertRaises(odooly.ServerError):
+            Partner.unknown()
+        with mock.patch.object(OdooHandler, 'unavailable', 1):
+            with self.assertRaisesRegex(OSError, 'Service Unavailable') as cm:
+                Partner.write([1], {'name': 'Jim'})
+            self.assertEqual(odooly._http_status(cm.exception), 503)
+        return rows
+
+    def test_replay(self):
+        server = self.start_server()
+        path = Path(tempfile.mkdtemp()) / 'session.json.gz'
+        self.addCleanup(path.unlink)
+        with odooly.Cassette(path) as cassette:
+            self.assertEqual(cassette.mode, 'record')
+            rows = self._session(server)
+        self.assertIsNone(odooly.HTTPSession.cassette)
+        self.assertEqual(rows, [3, ['Joe', 'Jane'], ['Joe', 'Jane', 'Jack']])
+        calls = [*OdooHandler.calls]
+
+        with odooly.Cassette(path, latency=True) as cassette:
+            self.assertEqual(cassette.mode, 'replay')
+            self.assertEqual(self._session(server), rows)
+            with self.assertRaisesRegex(odooly.Error, 'Request not recorded'):
+                odooly.HTTPSession().request(f'{server}/web/unknown', json={})
+        self.assertEqual(OdooHandler.calls, calls)
+        self.assertRaises(ValueError, odooly.Cassette, path, 'rewind')
+
+
+class TestFakeOdoo(HTTPTestCase):
+    """The fake Odoo server of the tests and benchmarks."""
+    fake_odoo = True
+    password = 'admin'
+
+    def setUp(self):
+        super().setUp()
+        self.server = self.start_server()
+        self.odoo.populate(30, categories=3)
+
+    def _check_client(self, client):
+        Partner = client.env['res.partner']
+        self.assertEqual(Partner.search_count([]), 28)      # Admin + 27 active
+        self.assertEqual(Partner.search([('name', 'ilike', 'partner 2')], order='name desc', limit=2).name,
+                         ['Partner 29', 'Partner 28'])
+        company = Partner.with_context(active_test=False).get(['ref = P000010'])
+        self.assertEqual(company.child_ids.ref, [f'P{idx:06}' for idx in range(11, 20)])
+        self.assertEqual(company.child_ids[0].parent_id, company)
+        self.assertEqual(company.category_id.name, ['Category 1'])
+
+        jill = Partner.create({'name': 'Jill', 'parent_id': company, 'category_id': [1, 2]})
+        self.assertEqual(len(company.read('child_ids')), 10)
+        jill.write({'email': 'jill@example.com'})
+        values = jill.read('email category_id')
+        self.assertEqual((values['email'], values['category_id'].ids), ('jill@example.com', [1, 2]))
+        jill.unlink()
+        self.assertFalse(jill.exists())
+        with self.assertRaises(odooly.ServerError):
+            Partner.browse(jill.id).read('name')
+
+    def test_web(self):
+        self._check_client(self.connect())
+
+    def test_jsonrpc(self):
+        self._check_client(self.connect(f'{self.server}/jsonrpc'))
+
+    def test_prefetch(self):
+        client = self.connect()
+        partners = client.env['res.partner'].search([('parent_id', '!=', False)])
+        client.stats.reset()
+        names = [(rec.name, rec.parent_id.name, rec.country_id.code, rec.category_id.name) for rec in partners]
+        self.assertEqual(len(names), 27)
+        self.assertEqual(names[0], ('Partner 1', 'Partner 0', 'FR', ['Category 1']))
+        # One read per field, instead of one per record and field
+        self.assertEqual(sorted((row['model'], row['count']) for row in client.stats.summary()
+                                if row['kind'] == 'call' and row['method'] == 'read'),
+                         [('res.country', 1), ('res.partner', 5), ('res.partner.category', 1)])
+
+    def test_fetch(self):
+        client = self.connect()
+        partners = client.env['res.partner'].search([('parent_id', '!=', False)])
+        self.assertIs(partners.fetch('name parent_id.country_id.code category_id.name'), partners)
+        client.stats.reset()
+        names = [(rec.name, rec.parent_id.country_id.code, rec.category_id.name) for rec in partners]
+        self.assertEqual(len(names), 27)
+        self.assertEqual(names[0], ('Partner 1', 'BE', ['Category 1']))
+        self.assertFalse(client.stats.summary())
+        # A path is read in one request
+        self.assertEqual(partners.mapped('parent_id.country_id.code'), ['BE', 'CH'])
+        self.assertEqual(partners.filtered('parent_id.country_id.code'), partners)
+        # Search and read in one request
+        partners = client.env['res.partner'].search([('parent_id', '!=', False)])
+        parent_names = partners.fetch(['parent_id.name']).parent_id.name
+        self.assertEqual(parent_names, ['Partner 0'] * 9 + ['Partner 10'] * 9 + ['Partner 20'] * 9)
+        self.assertEqual(sorted((row['method'], row['count']) for row in client.stats.summary()
+                                if row['kind'] == 'call'),
+                         [('web_read', 2), ('web_search_read', 1)])
+
+    def test_deferred_writes(self):
+        client = self.connect()
+        partners = client.env['res.partner'].search([('parent_id', '!=', False)])
+        self.assertEqual(len(partners), 27)
+        client.stats.reset()
+        with client.env.deferred_writes():
+            for rec in partners:
+                rec.ref = 'P1'
+                rec.email = 'info@example.com'
+        self.assertEqual(sorted((row['method'], row['count']) for row in client.stats.summary()
+                                if row['kind'] == 'call'), [('fields_get', 1), ('write', 1)])
+        self.assertEqual(partners.mapped('ref'), ['P1'] * 27)
+        self.assertEqual({*partners.mapped('email')}, {'info@example.com'})
+
+    def test_create_bulk(self):
+        client = self.connect()
+        Partner = client.env['res.partner']
+        countries = client.env['res.country'].search([])
+        values = ({'name': f'Bulk {idx}', 'country_id': countries[idx % 2]} for idx in range(250))
+        records = Partner.create_bulk(values, chunk_size=20, workers=4)
+        self.assertEqual(len(records), 250)
+        self.assertEqual(records[:2].name, ['Bulk 0', 'Bulk 1'])
+        self.assertEqual(records[:2].country_id, countries[:2])
+        self.assertEqual(records[-1].name, 'Bulk 249')
+        self.assertEqual([row['count'] for row in client.stats.summary()
+                          if row['kind'] == 'call' and row['method'] == 'create'], [13])
+
+        # The worker threads are stopped on close
+        pool = client._thread_pool(4)
+        with mock.patch.object(odooly.HTTPSession, 'close') as mock_close:
+            client.close()
+        self.assertEqual(client._pools, {})
+        self.assertRaises(RuntimeError, pool.submit, print)
+        self.assertEqual(mock_close.call_count, len(client._sessions))
+        self.assertGreater(mock_close.call_count, 1)
+
+    def test_chunks(self):
+        client = self.connect(chunk_size=10, chunk_workers=3)
+        partners = client.env['res.partner'].with_context(active_test=False).search([])
+        ids = partners.ids[::-1] + [False, partners.ids[0]]
+        rows = client.env['res.partner'].read(ids, 'name', order=True)
+        self.assertEqual(len(rows), len(ids))
+        self.assertIs(rows[-2], False)
+        self.assertEqual(rows[0], client.env['res.partner'].read(ids[0], 'name'))
+        self.assertIs(partners.write({'ref': 'Chunked'}), True)
+        self.assertEqual(set(partners.read('ref')), {'Chunked'})
+        self.assertEqual([row['count'] for row in client.stats.summary()
+                          if row['kind'] == 'call' and row['method'] == 'write'], [len(partners) // 10 + 1])
+
+    def test_search_iter(self):
+        client = self.connect()
+        Partner = client.env['res.partner'].with_context(active_test=False)
+        batches = [*Partner.search_iter([('name', 'like', 'Partner')], batch_size=7)]
+        self.assertEqual([len(batch) for batch in batches], [7, 7, 7, 7, 2])
+        self.assertEqual(sum(batches, Partner.browse([])).ids, Partner.search([('name', 'like', 'Partner')]).ids)
+        rows = [*Partner.search_iter(['name like Partner'], 'name email', batch_size=10)]
+        self.assertEqual(rows[0], {'id': batches[0].ids[0], 'name': 'Partner 0', 'email': 'partner0@example.com'})
+        self.assertEqual(len(rows), 30)
+        records = Partner.search(['name like Partner'])
+        self.assertEqual([batch.ids for batch in records.iter_batches(20)], [records.ids[:20], records.ids[20:]])
+
+    def test_parallel_search_read(self):
+        client = self.connect()
+        Partner = client.env['res.partner'].with_context(active_test=False)
+        rows = Partner.search_read(['name like Partner'], 'name email', order='id')
+        self.assertEqual(Partner.parallel_search_read(['name like Partner'], 'name email', partitions=4), rows)
+        unordered = Partner.parallel_search_read(['name like Partner'], 'name email', partitions=3, ordered=False)
+        self.assertCountEqual(unordered, rows)
+        # The threads are reused, with their session
+        client.stats.reset()
+        self.assertEqual(Partner.parallel_search_read(['name = Nobody'], 'name'), [])
+        self.assertEqual([row['method'] for row in client.stats.summary() if row['kind'] == 'request'], ['search'])
+
+    def test_json2(self):
+        self.odoo.server_version = '19.0'
+        client = odooly.Client(self.server, 'db')
+        client.login('admin', api_key='admin')
+        self.assertIsInstance(client.env._execute_kw, odooly.Json2)
+        self._check_client(client)
+        # The sessions of JSON-2 are closed with the client
+        json2_http = client.env._execute_kw._http
+        self.assertIn(json2_http, client._sessions)
+        with mock.patch.object(json2_http, 'close') as mock_close:
+            client.close()
+        mock_close.assert_called_once_with()
+        with self.assertRaisesRegex(odooly.ServerError, 'Invalid apikey'):
+            odooly.Client(self.server, 'db').login('admin', api_key='wrong')
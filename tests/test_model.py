@@ -1,5 +1,10 @@
+import threading
+import time
+import types
+from concurrent.futures import Future, ThreadPoolExecutor
 from functools import partial
-from unittest.mock import sentinel, ANY
+from unittest import mock
+from unittest.mock import call, sentinel, ANY
 
 import odooly
 from ._common import JsonRpcTestCase, OBJ
@@ -13,7 +18,9 @@ class TestCase(JsonRpcTestCase):
     password = 'passwd'
     uid = 1
 
-    def obj_exec(self, db_name, uid, passwd, model, method, args=None, kw=None):
+    def obj_exec(self, db_name, uid, passwd, model, method, args=None, kw=None, stream=False):
+        if stream:
+            return iter(self.obj_exec(db_name, uid, passwd, model, method, args, kw))
         if method == 'search_read':
             ids = self.obj_exec(db_name, uid, passwd, model, 'search', args)
             args = (ids,) + args[1:]
@@ -284,6 +291,27 @@ class TestModel(TestCase):
         self.assertCalls(*expected_calls)
         self.assertOutput('')
 
+    def test_search_read_stream(self):
+        FooBar = self.env['foo.bar']
+        domain = [('name', 'like', 'Morice')]
+
+        rows = FooBar.search_read(['name like Morice'], 'name', stream=True)
+        self.assertNotIsInstance(rows, list)
+        self.assertEqual(list(rows), ['v_name', 'v_name'])
+        rows = FooBar.search_read(domain, ['name'], limit=2, stream=True)
+        self.assertEqual(next(rows), {'id': 1001, 'name': 'v_name'})
+
+        stream_call = call.object.execute_kw(
+            self.database, self.uid, self.password, 'foo.bar', 'search_read',
+            (domain, ['name']), {'limit': 2, 'context': self.user_context}, stream=True)
+        self.assertCalls(
+            call.object.execute_kw(
+                self.database, self.uid, self.password, 'foo.bar', 'search_read',
+                (domain, ['name']), {'context': self.user_context}, stream=True),
+            stream_call,
+        )
+        self.assertOutput('')
+
     def test_read(self):
         FooBar = self.env['foo.bar']
 
@@ -539,6 +567,161 @@ class TestModel(TestCase):
         )
         self.assertOutput('')
 
+    def test_parallel_search_read(self):
+        FooBar = self.env['foo.bar']
+        ids = [3, 4, 8, 9, 10, 12, 20]
+
+        def search_read(db, uid, passwd, model, method, args, kw=None):
+            if method == 'search':
+                return [min(ids) if args[3] == 'id' else max(ids)]
+            (low, high) = (args[0][0][2], args[0][1][2])
+            return [{'id': id_, 'name': f'Name {id_}'} for id_ in ids if low <= id_ < high]
+        self.service.object.execute_kw.side_effect = search_read
+
+        self.assertEqual(FooBar.parallel_search_read(['name like Name'], 'name', partitions=3),
+                         [f'Name {id_}' for id_ in ids])
+        rows = FooBar.parallel_search_read(['name like Name'], 'name', partitions=3, ordered=False)
+        self.assertIsInstance(rows, types.GeneratorType)
+        self.assertEqual(sorted(rows), sorted(f'Name {id_}' for id_ in ids))
+        self.assertEqual(len(FooBar.parallel_search_read([], partitions=100)), 7)
+        self.assertEqual(self.service.object.execute_kw.call_count, 2 + 3 + 2 + 3 + 2 + 18)
+        (domain, ctx) = ([('name', 'like', 'Name')], {'context': self.user_context})
+        calls = [args[3:] for (__, args, __) in self.service.object.execute_kw.mock_calls]
+        self.assertCountEqual(calls[:2], [('foo.bar', 'search', (domain, 0, 1, 'id'), ctx),
+                                          ('foo.bar', 'search', (domain, 0, 1, 'id desc'), ctx)])
+        for (low, high) in [(3, 9), (9, 15), (15, 21)]:
+            self.assertIn(('foo.bar', 'search_read', ([('id', '>=', low), ('id', '<', high)] + domain, ['name']),
+                           {'order': 'id', **ctx}), calls[2:5])
+        self.service.reset_mock()
+
+        self.service.object.execute_kw.side_effect = [[], []]
+        self.assertEqual(FooBar.parallel_search_read([], 'name'), [])
+        self.assertOutput('')
+
+    def test_search_iter(self):
+        FooBar = self.env['foo.bar']
+        self.service.object.execute_kw.side_effect = [
+            [1, 2, 5], [7, 9, 11], [13],
+            [{'id': 4, 'name': 'Four'}, {'id': 6, 'name': 'Six'}], [],
+            [13, 17], [42],
+        ]
+        batches = FooBar.search_iter(['name like Morice'], batch_size=3)
+        self.assertIsInstance(batches, types.GeneratorType)
+        self.assertEqual([*batches], [FooBar.browse([1, 2, 5]), FooBar.browse([7, 9, 11]), FooBar.browse([13])])
+        self.assertEqual([*FooBar.search_iter([], 'name', batch_size=2)], ['Four', 'Six'])
+        self.assertEqual([*FooBar.search(['name like Morice']).iter_batches(2)],
+                         [FooBar.browse([13, 17]), FooBar.browse([42])])
+        domain = [('name', 'like', 'Morice')]
+        self.assertCalls(
+            OBJ('foo.bar', 'search', [('id', '>', 0)] + domain, 0, 3, 'id'),
+            OBJ('foo.bar', 'search', [('id', '>', 5)] + domain, 0, 3, 'id'),
+            OBJ('foo.bar', 'search', [('id', '>', 11)] + domain, 0, 3, 'id'),
+            OBJ('foo.bar', 'search_read', [('id', '>', 0)], ['name'], order='id', limit=2),
+            OBJ('foo.bar', 'search_read', [('id', '>', 6)], ['name'], order='id', limit=2),
+            OBJ('foo.bar', 'search', [('id', '>', 0)] + domain, 0, 2, 'id'),
+            OBJ('foo.bar', 'search', [('id', '>', 17)] + domain, 0, 2, 'id'),
+        )
+
+        # The ids of a RecordList are split in batches
+        records = FooBar.browse([42, 13, 17, 42, 7])
+        self.assertEqual([batch.ids for batch in records.iter_batches(2)], [[42, 13], [17, 42], [7]])
+        self.service.object.execute_kw.side_effect = [[13, 17, 42]]
+        records = FooBar.search(['name like Morice'], order='name', limit=3)
+        self.assertEqual([batch.ids for batch in records.iter_batches(2)], [[13, 17], [42]])
+        self.assertCalls(OBJ('foo.bar', 'search', domain, 0, 3, 'name'))
+        self.assertOutput('')
+
+    def test_create_bulk(self):
+        FooBar = self.env['foo.bar']
+        record42 = FooBar.browse(42)
+
+        def create(db, uid, passwd, model, method, args, kw=None):
+            if method != 'create':
+                return self.obj_exec(db, uid, passwd, model, method, args, kw)
+            if any(vals['spam'] == 13 for vals in args[0]):
+                raise odooly.ServerError({'code': 200})
+            return [vals['spam'] for vals in args[0]]
+        self.service.object.execute_kw.side_effect = create
+
+        values = ({'spam': idx} for idx in range(1, 8))
+        progress = []
+        records = FooBar.create_bulk(values, chunk_size=3, workers=1,
+                                     progress=lambda count, elapsed: progress.append(count))
+        self.assertEqual(records, FooBar.browse([1, 2, 3, 4, 5, 6, 7]))
+        self.assertEqual(progress, [3, 6, 7])
+        self.assertCalls(
+            OBJ('foo.bar', 'fields_get'),
+            OBJ('foo.bar', 'create', [{'spam': 1}, {'spam': 2}, {'spam': 3}]),
+            OBJ('foo.bar', 'create', [{'spam': 4}, {'spam': 5}, {'spam': 6}]),
+            OBJ('foo.bar', 'create', [{'spam': 7}]),
+        )
+
+        # The new records are in input order
+        records = FooBar.create_bulk(({'spam': idx} for idx in range(200, 100, -1)), chunk_size=7, workers=4)
+        self.assertEqual(records.ids, [*range(200, 100, -1)])
+        self.assertEqual(self.service.object.execute_kw.call_count, 15)
+        self.service.reset_mock()
+
+        # The failed chunks are collected
+        errors = []
+        records = FooBar.create_bulk([{'spam': 11}, {'spam': 12}, {'spam': 13}, {'spam': record42}],
+                                     chunk_size=2, workers=2, errors=errors)
+        self.assertEqual(records.ids, [11, 12])
+        self.assertEqual([(offset, chunk) for (offset, chunk, __) in errors],
+                         [(2, [{'spam': 13}, {'spam': record42}])])
+        self.assertIsInstance(errors[0][2], odooly.ServerError)
+        # The errors of the client are collected too
+        errors = []
+        records = FooBar.create_bulk([{'spam': 11}, {'unknown': 12}, {'spam': 14}], chunk_size=1, errors=errors)
+        self.assertEqual(records.ids, [11, 14])
+        self.assertEqual([(offset, chunk) for (offset, chunk, __) in errors], [(1, [{'unknown': 12}])])
+        self.assertIsInstance(errors[0][2], KeyError)
+        with self.assertRaises(odooly.ServerError):
+            FooBar.create_bulk([{'spam': 11}, {'spam': 13}], chunk_size=1)
+        self.assertEqual(FooBar.create_bulk([]), FooBar.browse([]))
+        self.assertOutput('')
+
+    def test_chunks(self):
+        FooBar = self.env['foo.bar']
+        self.client.chunk_size = 2
+        records = FooBar.browse([42, 13, 17, 42, 7])
+
+        self.assertEqual(records.read('name'), ['v_name'] * 5)
+        self.assertEqual(FooBar.read([42, 13, 17], 'name'), ['v_name'] * 3)
+        records.write({'spam': 42})
+        records[:2].unlink()
+        self.assertEqual(len(records.name), 5)
+        self.assertCalls(
+            OBJ('foo.bar', 'fields_get'),
+            OBJ('foo.bar', 'read', [7, 13], ['name']),
+            OBJ('foo.bar', 'read', [17, 42], ['name']),
+            OBJ('foo.bar', 'read', [13, 17], ['name']),
+            OBJ('foo.bar', 'read', [42], ['name']),
+            OBJ('foo.bar', 'write', [42, 13], {'spam': 42}),
+            OBJ('foo.bar', 'write', [17, 42], {'spam': 42}),
+            OBJ('foo.bar', 'write', [7], {'spam': 42}),
+            OBJ('foo.bar', 'unlink', [42, 13]),
+            OBJ('foo.bar', 'read', [7, 13], ['name']),
+            OBJ('foo.bar', 'read', [17, 42], ['name']),
+        )
+
+        # The chunks are sent concurrently
+        self.client.chunk_workers = 3
+        self.assertIs(FooBar.browse([*range(1, 10)]).write({'spam': 42}), True)
+        self.assertEqual(FooBar.read([*range(1, 10)], 'name', order=True), ['v_name'] * 9)
+        self.assertEqual(self.service.object.execute_kw.call_count, 10)
+        self.service.reset_mock()
+
+        # The chunks are disabled
+        self.client.chunk_size = None
+        records.unlink()
+        self.assertCalls(OBJ('foo.bar', 'unlink', [42, 13, 17, 42, 7]))
+        for chunk_size in (None, 0):
+            client = odooly.Client(self.server, chunk_size=chunk_size)
+            self.assertEqual(client.chunk_size, chunk_size)
+        self.assertEqual(odooly.Client(self.server).chunk_size, 10_000)
+        self.assertOutput('')
+
     def test_create_relation(self):
         FooBar = self.env['foo.bar']
         FooLines = self.env['foo.lines']
@@ -932,6 +1115,175 @@ class TestRecord(TestCase):
         self.assertCalls()
         self.assertOutput('')
 
+    def test_deferred_writes(self):
+        records = self.env['foo.bar'].browse([13, 17, 42])
+        misc_rec = self.env['foo.misc'].browse(42)
+        self.assertEqual(records[2].name, 'v_name')
+
+        with self.env.deferred_writes() as deferred:
+            for rec in records:
+                rec.name = 'Joe'
+                rec.misc_id = misc_rec
+            records[2].name = 'Jack'
+            self.assertIn('pending=3', repr(deferred))
+            self.assertCalls(
+                OBJ('foo.bar', 'fields_get'),
+                OBJ('foo.bar', 'read', [42], ['name']),
+            )
+        self.assertIsNone(self.env._deferred)
+        # The records with identical values are written together
+        self.assertCalls(
+            OBJ('foo.bar', 'write', [13, 17], {'name': 'Joe', 'misc_id': 42}),
+            OBJ('foo.bar', 'write', [42], {'name': 'Jack', 'misc_id': 42}),
+        )
+
+        # The pending writes are sent before any other call, by chunks
+        mock.patch('odooly.DeferredWrites.chunk_size', 2).start()
+        with self.env.deferred_writes() as deferred:
+            for rec in records:
+                rec.name = 'Joe'
+            self.assertEqual(records[2].name, 'v_name')
+            deferred.flush()    # Nothing to do
+        self.assertCalls(
+            OBJ('foo.bar', 'write', [13, 17], {'name': 'Joe'}),
+            OBJ('foo.bar', 'write', [42], {'name': 'Joe'}),
+            OBJ('foo.bar', 'read', [42], ['name']),
+        )
+
+        # The pending writes are discarded on error
+        with self.assertRaises(ZeroDivisionError):
+            with self.env.deferred_writes():
+                records[0].name = 'Joe'
+                1 / 0
+        self.assertCalls()
+        self.assertOutput('')
+
+    def test_shared_cache(self):
+        records = self.env['foo.bar'].browse([13, 42])
+        rec1, rec2 = self.env['foo.bar'].browse(42), self.env['foo.bar'].browse(42)
+
+        # The values are shared by the records of the same Env
+        self.assertEqual(rec1.message, 'v_message')
+        self.assertEqual(rec2.message, 'v_message')
+        self.assertEqual(records.read('name message'),
+                         [{'id': 13, 'name': 'v_name', 'message': 'v_message'},
+                          {'id': 42, 'name': 'v_name', 'message': 'v_message'}])
+        self.assertEqual([rec.name for rec in records], ['v_name', 'v_name'])
+        self.assertEqual(self.env['foo.bar'].with_context(lang='fr_FR').browse(42).name, 'v_name')
+        self.assertCalls(
+            OBJ('foo.bar', 'fields_get'),
+            OBJ('foo.bar', 'read', [42], ['message']),
+            OBJ('foo.bar', 'read', [13, 42], ['name', 'message']),
+            OBJ('foo.bar', 'read', [42], ['name'], context={'lang': 'fr_FR', 'tz': 'Europe/Zurich'}),
+        )
+
+        # Write and unlink invalidate the records
+        rec1.write({'name': 'Joe'})
+        self.assertEqual(rec2.name, 'v_name')
+        self.assertEqual(rec2.message, 'v_message')
+        records.unlink()
+        self.assertEqual(rec1.message, 'v_message')
+        self.assertEqual(records[0].message, 'v_message')
+        rec1.refresh()
+        self.assertEqual(rec2.message, 'v_message')
+        self.assertCalls(
+            OBJ('foo.bar', 'write', [42], {'name': 'Joe'}),
+            OBJ('foo.bar', 'read', [42], ['name']),
+            OBJ('foo.bar', 'read', [42], ['message']),
+            OBJ('foo.bar', 'unlink', [13, 42]),
+            OBJ('foo.bar', 'read', [42], ['message']),
+            OBJ('foo.bar', 'read', [13], ['message']),
+            OBJ('foo.bar', 'read', [42], ['message']),
+        )
+
+        # The calls through the Model or the Env invalidate the records too
+        self.assertEqual(rec1.name, 'v_name')
+        self.env['foo.bar'].write([42], {'name': 'Joe'})
+        self.assertEqual(self.env['foo.bar'].browse(42).name, 'v_name')
+        self.env.execute('foo.bar', 'unlink', [42])
+        self.assertEqual(self.env['foo.bar'].get(42).name, 'v_name')
+        self.assertEqual(rec1.message, 'v_message')
+        self.env.execute('foo.bar', 'action_done', [13])
+        self.assertEqual(rec1.message, 'v_message')
+        self.assertCalls(
+            OBJ('foo.bar', 'read', [42], ['name']),
+            OBJ('foo.bar', 'write', [42], {'name': 'Joe'}),
+            OBJ('foo.bar', 'read', [42], ['name']),
+            OBJ('foo.bar', 'unlink', [42]),
+            OBJ('foo.bar', 'read', [42], ['name']),
+            OBJ('foo.bar', 'read', [42], ['message']),
+            OBJ('foo.bar', 'action_done', [13]),
+            OBJ('foo.bar', 'read', [42], ['message']),
+        )
+
+        # The least recently used records are evicted
+        with mock.patch.object(odooly.Env, '_max_records', 2):
+            self.env['foo.bar'].browse([1, 2, 3]).read('name')
+            self.assertEqual([*self.env._records], [('foo.bar', 2), ('foo.bar', 3)])
+            self.assertEqual(self.env['foo.bar'].browse(2).name, 'v_name')
+            self.env['foo.bar'].browse(4).read('name')
+        self.assertEqual([*self.env._records], [('foo.bar', 2), ('foo.bar', 4)])
+        self.assertCalls(OBJ('foo.bar', 'read', [1, 2, 3], ['name']), OBJ('foo.bar', 'read', [4], ['name']))
+
+        # The records are counted in the size of the Env in the EnvCache
+        cache = self.env._cache
+        size = cache._sizes[self.env._cache_key]
+        self.assertGreater(self.env._records_size, 0)
+        self.env['foo.bar'].browse([5, 6]).read('name message')
+        self.assertGreater(cache._sizes[self.env._cache_key], size)
+        self.assertEqual(cache.size, sum(cache._sizes.values()))
+        size = cache._sizes[self.env._cache_key] - self.env._records_size
+        self.env.refresh()
+        self.assertEqual(self.env._records_size, 0)
+        self.assertEqual(cache._sizes[self.env._cache_key], size)
+        self.assertOutput('')
+
+    def test_prefetch(self):
+        records = self.env['foo.bar'].browse([13, 17, 42, 13, 7])
+
+        # The siblings are read together, by chunks
+        with mock.patch.object(odooly.Env, '_prefetch_max', 2):
+            self.assertEqual([rec.name for rec in records], ['v_name'] * 5)
+            self.assertEqual(records[2].message, 'v_message')
+            self.assertEqual(records[4].message, 'v_message')
+        self.assertEqual(self.env['foo.bar'].browse(42).name, 'v_name')
+        self.assertCalls(
+            OBJ('foo.bar', 'fields_get'),
+            OBJ('foo.bar', 'read', [13, 17], ['name']),
+            OBJ('foo.bar', 'read', [7, 42], ['name']),
+            OBJ('foo.bar', 'read', [13, 42], ['message']),
+            OBJ('foo.bar', 'read', [7], ['message']),
+        )
+        self.assertOutput('')
+
+    def test_prefetch_missing(self):
+        obj_exec = self.service.object.execute_kw.side_effect
+
+        def execute_kw(db_name, uid, passwd, model, method, args, kw=None):
+            if method == 'read' and (666 in args[0] or (31 in args[0] and len(args[0]) > 1)):
+                raise odooly.ServerError({'code': 200})
+            if method in ('exists', 'search') and model == 'foo.bar':
+                ids = args[0] if method == 'exists' else args[0][0][2]
+                return [id_ for id_ in ids if id_ != 666]
+            return obj_exec(db_name, uid, passwd, model, method, args, kw)
+        self.service.object.execute_kw.side_effect = execute_kw
+        exists = 'exists' if float(self.server_version) < 19 else 'search'
+
+        # The group is read again without the missing record, once
+        records = self.env['foo.bar'].browse([21, 666, 22])
+        self.assertEqual(records[0].name, 'v_name')
+        self.assertEqual(records[2].name, 'v_name')
+        self.assertRaises(odooly.ServerError, getattr, records[1], 'name')
+        # The group fails again: it is not prefetched anymore
+        records = self.env['foo.bar'].browse([31, 32, 33])
+        self.assertEqual([records[0].name, records[1].name], ['v_name'] * 2)
+        calls = self.service.object.execute_kw.call_args_list
+        self.assertEqual([call.args[5][0] for call in calls if call.args[4] in ('read', exists)], [
+            [21, 22, 666], ANY, [21, 22], [666],
+            [31, 32, 33], ANY, [31], [32],
+        ])
+        self.assertOutput('')
+
     def test_equal(self):
         rec1 = self.env['foo.bar'].get(42)
         rec2 = self.env['foo.bar'].get(42)
@@ -1151,6 +1503,8 @@ class TestRecord(TestCase):
         self.assertOutput('')
 
     def test_mapped(self):
+        # Read level by level, like Odoo < 17
+        mock.patch('odooly.BaseRecord._use_cache', return_value=False).start()
         m = self.env['foo.bar']
         self.service.object.execute_kw.side_effect = [
             {'fld1': {'type': 'char'}, 'display_name': {'type': 'char'}, 'foo_categ_id': {'relation': 'foo.categ', 'type': 'many2one'}},
@@ -1159,15 +1513,10 @@ class TestRecord(TestCase):
             [{'id': k, 'foo_categ_id': [k * 10, 'Categ C%04d' % k]} for k in [4, 17, 7, 42, 112, 13]],
             {'fld2': {'type': 'char'}},
             [{'id': k * 10, 'fld2': 'f2_%04d' % k} for k in [4, 17, 7, 42, 112, 13]],
-            self._return_display_name(42, 'Record 42'),
-            self._return_display_name(4, 'Record 4'),
-            self._return_display_name(42, 'Record 42'),
-            self._return_display_name(4, 'Record 4'),
+            [{'id': k, 'display_name': 'Record %s' % k} for k in [4, 17, 7, 42, 112, 13]],
 
             [{'id': 42, 'foo_categ_id': [33, 'Categ 33']}],
             [{'id': 33, 'fld2': 'c33 f2'}],
-            self._return_display_name(42, 'Sample42'),
-            self._return_display_name(42, 'Sample42'),
 
             [{'id': 88, 'foo_categ_id': [33, 'Categ 33']}],
             [{'id': 33, 'fld2': 'c33 f2'}],
@@ -1189,7 +1538,8 @@ class TestRecord(TestCase):
 
         records2 = m.browse([42, 42])
         self.assertEqual(records2.mapped('foo_categ_id.fld2'), ['c33 f2'])
-        self.assertEqual(records2.mapped(str), ['Sample42'] * 2)
+        # The display_name of the record 42 is cached
+        self.assertEqual(records2.mapped(str), ['Record 42'] * 2)
 
         rec1 = m.get(88)
         self.assertEqual(rec1.mapped('foo_categ_id.fld2'), ['c33 f2'])
@@ -1204,15 +1554,11 @@ class TestRecord(TestCase):
             OBJ('foo.bar', 'read', ids1_sorted, ['foo_categ_id']),
             OBJ('foo.categ', 'fields_get'),
             OBJ('foo.categ', 'read', [k * 10 for k in ids1_sorted], ['fld2']),
-            self._call_display_name('foo.bar', 42),
-            self._call_display_name('foo.bar', 4),
-            self._call_display_name('foo.bar', 42),
-            self._call_display_name('foo.bar', 4),
+            # The display_name is prefetched
+            OBJ('foo.bar', 'read', ids1_sorted, ['display_name']),
 
             OBJ('foo.bar', 'read', [42], ['foo_categ_id']),
             OBJ('foo.categ', 'read', [33], ['fld2']),
-            self._call_display_name('foo.bar', 42),
-            self._call_display_name('foo.bar', 42),
 
             OBJ('foo.bar', 'read', [88], ['foo_categ_id']),
             OBJ('foo.categ', 'read', [33], ['fld2']),
@@ -1226,6 +1572,72 @@ class TestRecord(TestCase):
         self.assertCalls()
         self.assertOutput('')
 
+    def test_fetch(self):
+        m = self.env['foo.bar']
+        categ_40 = {'id': 40, 'display_name': 'Categ 40', 'code': 'C40'}
+        children = [{'id': 1, 'name': 'Child 1'}, {'id': 2, 'name': 'Child 2'}]
+        fields = {'name': {'type': 'char'}, 'display_name': {'type': 'char'},
+                  'foo_categ_id': {'relation': 'foo.categ', 'type': 'many2one'},
+                  'foo_child_ids': {'relation': 'foo.child', 'type': 'one2many'}}
+        if float(self.server_version) < 17.0:
+            side_effect = [
+                [{'id': 4, 'name': 'Four', 'foo_categ_id': [40, 'Categ 40'], 'foo_child_ids': [1, 2]},
+                 {'id': 7, 'name': 'Seven', 'foo_categ_id': False, 'foo_child_ids': []}],
+                fields,
+                [{'id': 40, 'code': 'C40'}],
+                {'code': {'type': 'char'}, 'display_name': {'type': 'char'}},
+                children,
+                {'name': {'type': 'char'}},
+            ]
+        else:
+            side_effect = [
+                fields,
+                {'code': {'type': 'char'}, 'display_name': {'type': 'char'}},
+                {'name': {'type': 'char'}},
+                [{'id': 4, 'name': 'Four', 'foo_categ_id': categ_40, 'foo_child_ids': children},
+                 {'id': 7, 'name': 'Seven', 'foo_categ_id': False, 'foo_child_ids': []}],
+            ]
+        self.service.object.execute_kw.side_effect = side_effect
+
+        records = m.browse([4, 7])
+        self.assertIs(records.fetch('name foo_categ_id.code foo_child_ids.name'), records)
+
+        # The values are cached
+        self.assertEqual([rec.name for rec in records], ['Four', 'Seven'])
+        self.assertEqual(records[0].foo_categ_id.code, 'C40')
+        self.assertEqual(str(records[0].foo_categ_id), 'Categ 40')
+        self.assertEqual(records.foo_child_ids[0].name, ['Child 1', 'Child 2'])
+
+        if float(self.server_version) < 17.0:
+            self.assertCalls(
+                OBJ('foo.bar', 'read', [4, 7], ['name', 'foo_categ_id', 'foo_child_ids']),
+                OBJ('foo.bar', 'fields_get'),
+                OBJ('foo.categ', 'read', [40], ['code']),
+                OBJ('foo.categ', 'fields_get'),
+                OBJ('foo.child', 'read', [1, 2], ['name']),
+                OBJ('foo.child', 'fields_get'),
+            )
+        else:
+            spec = {'name': {},
+                    'foo_categ_id': {'fields': {'display_name': {}, 'code': {}}},
+                    'foo_child_ids': {'fields': {'name': {}}}}
+            self.assertCalls(
+                OBJ('foo.bar', 'fields_get'),
+                OBJ('foo.categ', 'fields_get'),
+                OBJ('foo.child', 'fields_get'),
+                OBJ('foo.bar', 'web_read', [4, 7], spec),
+            )
+            # A path is fetched in one request
+            rows = [{'id': 4, 'foo_categ_id': {**categ_40, 'code': 'C41'}}, {'id': 7, 'foo_categ_id': False}]
+            self.service.object.execute_kw.side_effect = [rows, rows]
+            self.assertEqual(records.mapped('foo_categ_id.code'), ['C41'])
+            self.assertEqual(records.filtered('foo_categ_id.code'), m.browse([4]))
+            self.assertCalls(
+                OBJ('foo.bar', 'web_read', [4, 7], {'foo_categ_id': {'fields': {'display_name': {}, 'code': {}}}}),
+                OBJ('foo.bar', 'web_read', [4, 7], {'foo_categ_id': {'fields': {'display_name': {}, 'code': {}}}}),
+            )
+        self.assertOutput('')
+
     def test_mapped_empty_relation(self):
         m = self.env['foo.bar']
         self.service.object.execute_kw.side_effect = [
@@ -1247,6 +1659,8 @@ class TestRecord(TestCase):
         self.assertOutput('')
 
     def test_filtered(self):
+        # Read level by level, like Odoo < 17
+        mock.patch('odooly.BaseRecord._use_cache', return_value=False).start()
         m = self.env['foo.bar']
         items = [[k, 'Item %d' % k] for k in range(1, 9)]
         self.service.object.execute_kw.side_effect = [
@@ -1344,7 +1758,6 @@ class TestRecord(TestCase):
             [{'id': k, 'fld1': 'val%s' % k} for k in [4, 17, 7, 42, 112, 13]],
             [{'id': k, 'fld1': 'val%s' % k} for k in [4, 17, 7, 42, 112, 13]],
             self._return_display_name(4, 'Record 4'),
-            self._return_display_name(4, 'Record 4'),
             [{'id': k} for k in [4, 17, 7, 42, 112]],
         ]
 
@@ -1373,8 +1786,7 @@ class TestRecord(TestCase):
             OBJ('foo.bar', 'fields_get'),
             OBJ('foo.bar', 'read', ids1_sorted, ['fld1']),
             OBJ('foo.bar', 'read', ids1_sorted, ['fld1']),
-            self._call_display_name('foo.bar', 4),
-            self._call_display_name('foo.bar', 4),
+            OBJ('foo.bar', 'read', [4, 7], ['display_name']),
         )
 
         records2 = m.browse([42, 42])
@@ -1502,6 +1914,99 @@ class TestRecord(TestCase):
         self.assertOutput('')
 
 
+class TestBatch(TestCase):
+    """Tests the Batch class."""
+
+    def setUp(self):
+        super().setUp()
+        self.action = mock.Mock(code='', id=77)
+        self.run = mock.Mock()
+        self.get_action = mock.patch('odooly.Env._get_sql_action', return_value=self.action).start()
+
+    def obj_exec(self, db_name, uid, passwd, model, method, args=None, kw=None, stream=False):
+        if (model, method) == ('ir.actions.server', 'run'):
+            return self.run(*args, **kw)
+        return super().obj_exec(db_name, uid, passwd, model, method, args, kw, stream)
+
+    def test_batch(self):
+        FooBar = self.env['foo.bar']
+        rec = FooBar.browse(42)
+        ctx = {'context': self.user_context}
+        self.run.return_value = {'results': [[1001, 1002], 1999, True, [{'id': 42, 'name': 'Joe'}], 2]}
+
+        with self.env.batch() as batch:
+            found = FooBar.search(['name like Morice'])
+            new_rec = FooBar.create({'name': 'Joe'})
+            written = rec.write({'name': 'Joe'})
+            name = rec.read('name')
+            count = FooBar.search_count([])
+            self.assertIsInstance(found, Future)
+            self.assertFalse(count.done())
+            self.assertIn('pending=5', repr(batch))
+        self.assertIsNone(self.env._batch)
+
+        self.assertEqual(found.result(), FooBar.browse([1001, 1002]))
+        self.assertEqual(new_rec.result(), FooBar.browse(1999))
+        self.assertIs(written.result(), True)
+        self.assertEqual(name.result(), 'Joe')
+        self.assertEqual(rec.name, 'Joe')
+        self.assertEqual(count.result(), 2)
+
+        self.action.write.assert_called_once_with({'code': odooly._batch_action_code})
+        batch_ctx = {**self.user_context, 'lang': None, '__batch': [
+            ('foo.bar', 'search', ([('name', 'like', 'Morice')],), ctx),
+            ('foo.bar', 'create', ({'name': 'Joe'},), ctx),
+            ('foo.bar', 'write', ([42], {'name': 'Joe'}), ctx),
+            ('foo.bar', 'read', ([42], ['name']), ctx),
+            ('foo.bar', 'search_count', ([],), ctx),
+        ]}
+        # Only 'fields_get' is not queued
+        self.assertCalls(OBJ('foo.bar', 'fields_get'), OBJ('ir.actions.server', 'run', [77], context=batch_ctx))
+        self.assertOutput('')
+
+        # Streaming is not supported in a batch
+        with self.env.batch():
+            with self.assertRaises(odooly.Error):
+                FooBar.search_read([], ['name'], stream=True)
+        self.assertCalls()
+
+    def test_batch_flush(self):
+        FooBar = self.env['foo.bar']
+        self.run.side_effect = [{'results': [3]}, {'results': [[]]}]
+
+        with self.env.batch() as batch:
+            count = FooBar.search_count([])
+            self.assertEqual(count.result(), 3)
+            batch.flush()   # Nothing to do
+            rows = FooBar.search_read([], 'name')
+            batch.flush()
+            self.assertEqual(rows.result(), [])
+        self.assertEqual(self.run.call_count, 2)
+
+        # Error is set on all pending calls
+        self.run.side_effect = odooly.ServerError({'code': 200})
+        with self.assertRaises(odooly.ServerError):
+            with self.env.batch():
+                count = FooBar.search_count([])
+                rec = FooBar.browse(42)
+                rec.unlink()
+        self.assertRaises(odooly.ServerError, count.result)
+
+        # Pending calls are cancelled on error
+        with self.assertRaises(ZeroDivisionError):
+            with self.env.batch():
+                count = FooBar.search_count([])
+                1 / 0
+        self.assertTrue(count.cancelled())
+        self.assertEqual(self.run.call_count, 3)
+
+        # The action is checked once
+        self.get_action.assert_called_once_with('__odooly__.batch', 'Batch Execute')
+        self.action.write.assert_called_once_with({'code': odooly._batch_action_code})
+        self.assertEqual(len(self.service.mock_calls), 3)
+        self.assertOutput('')
+
+
 class TestModel15(TestModel):
     server_version = '15.0'
 
@@ -1532,3 +2037,53 @@ class TestModel19(TestModel):
 
 class TestRecord19(TestRecord):
     server_version = '19.0'
+
+
+class TestSingleFlight(TestCase):
+    """Identical calls in flight share the result."""
+
+    def test_threads(self):
+        (started, release) = (threading.Event(), threading.Event())
+
+        def execute_kw(obj, method, params, kw=None):
+            started.set()
+            release.wait(5)
+            return [{'id': 42, 'name': 'Joe'}]
+
+        read = partial(self.env.execute, 'foo.bar', 'read', [42], ['name'])
+        with mock.patch.object(self.env, '_execute_kw', side_effect=execute_kw) as mock_execute, \
+                ThreadPoolExecutor(4) as executor:
+            first = executor.submit(read)
+            started.wait(5)
+            others = [executor.submit(read) for __ in range(3)]
+            time.sleep(0.1)     # Wait for the first call
+            release.set()
+            results = [future.result() for future in (first, *others)]
+            self.assertEqual(mock_execute.call_count, 1)
+
+            # Each caller receives a copy
+            self.assertEqual(results, [[{'id': 42, 'name': 'Joe'}]] * 4)
+            self.assertEqual(len({id(res[0]) for res in results}), 4)
+            results[0][0]['name'] = 'Jane'
+            self.assertEqual(results[1:], [[{'id': 42, 'name': 'Joe'}]] * 3)
+            self.assertEqual(self.client._inflight._calls, {})
+
+            # Calls which are not in flight, and other methods are not shared
+            self.assertEqual(read(), [{'id': 42, 'name': 'Joe'}])
+            self.env.execute('foo.bar', 'write', [42], {'name': 'Joe'})
+            self.assertEqual(mock_execute.call_count, 3)
+
+    def test_key(self):
+        key = partial(self.client._inflight._key, self.env, 'foo.bar', 'read')
+        self.assertEqual(key(([42], ['name']), ()),
+                         ('database', 1, 'foo.bar', 'read', odooly._json_dumps([([42], ['name']), ()])))
+        # Calls on many ids are not shared
+        self.assertIsNone(key(([*range(1001)], ['name']), ()))
+        # Arguments which are not serializable are not shared
+        self.assertIsNone(key(([('date', '=', sentinel.date)],), ()))
+
+    def test_error(self):
+        with mock.patch.object(self.env, '_execute_kw', side_effect=odooly.ServerError({'code': 200})):
+            with self.assertRaises(odooly.ServerError):
+                self.env.execute('foo.bar', 'search_count', [])
+        self.assertEqual(self.client._inflight._calls, {})
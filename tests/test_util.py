@@ -1,7 +1,12 @@
+import json
 from functools import partial
-from unittest import TestCase
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from threading import Thread
+from unittest import TestCase, skipIf
 
-from odooly import issearchdomain, searchargs, Model, Client, Printer
+import odooly
+from odooly import issearchdomain, searchargs, Model, Client, Printer, _JsonStream
+from ._common import close_sessions
 
 
 class TestUtils(TestCase):
@@ -166,3 +171,120 @@ class TestUtils(TestCase):
 
         self.assertRaises(TypeError, setattr, client, 'verbose', 'a')
         self.assertRaises(IndexError, setattr, client, 'verbose', -4)
+
+
+ROWS = [{'id': idx, 'name': f'Name [{idx}] \u20ac', 'amount': idx * 1.5} for idx in range(1000)]
+
+
+class _JsonHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_POST(self):
+        self.rfile.read(int(self.headers['Content-Length']))
+        result = ROWS if self.path == '/rows' else self.client_address[1]
+        body = json.dumps({'jsonrpc': '2.0', 'id': 1, 'result': result}).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        # Close the socket without notice
+        self.close_connection = self.path == '/close'
+
+    def log_message(self, *args):
+        pass
+
+
+class TestJsonCodec(TestCase):
+
+    def test_codecs(self):
+        Ids, Id1 = odooly.Ids, odooly.Id1
+        payload = {'args': [Ids([1, 2]), Id1(3), (6, 0, [4])], 'kw': {'lang': 'fr_CH', 'active_test': False}}
+        for name in 'orjson', 'msgspec', 'json':
+            try:
+                (dumps, loads) = odooly._get_json_codec(name)
+            except ImportError:
+                continue
+            with self.subTest(codec=name):
+                data = dumps(payload)
+                self.assertIsInstance(data, bytes)
+                self.assertEqual(json.loads(data), json.loads(json.dumps(payload)))
+                self.assertEqual(loads(data), json.loads(data))
+                self.assertEqual(loads(data.decode()), json.loads(data))
+                self.assertEqual(dumps({'b': 1, 'a': 2}, sort_keys=True), dumps({'a': 2, 'b': 1}, sort_keys=True))
+
+        self.assertRaises(ValueError, odooly._get_json_codec, 'simplejson')
+        self.assertTrue(odooly._get_json_codec(''))
+
+
+class TestJsonStream(TestCase):
+
+    def _split(self, document, size):
+        data = json.dumps(document).encode()
+        return [data[idx:idx + size] for idx in range(0, len(data), size)]
+
+    def test_stream(self):
+        rows = ROWS[:20] + [{'id': 12345, 'text': ' ]}[{,"\\ ', 'ids': [1, 2], 'ok': True, 'no': None}]
+        for size in 1, 2, 3, 7, 64, 99999:
+            rpc_response = {'jsonrpc': '2.0', 'id': 'a1b2', 'result': rows}
+            self.assertEqual(list(_JsonStream(self._split(rpc_response, size))), rows)
+            self.assertEqual(list(_JsonStream(self._split(rows, size))), rows)
+            self.assertEqual(list(_JsonStream(self._split([12345, 6789], size))), [12345, 6789])
+            self.assertEqual(list(_JsonStream(self._split({'id': None, 'result': []}, size))), [])
+            self.assertEqual(list(_JsonStream(self._split({'result': 42}, size))), [42])
+
+    def test_stream_error(self):
+        error = {'code': 200, 'message': 'Odoo Server Error', 'data': {'name': 'odoo.exceptions.UserError'}}
+        chunks = self._split({'jsonrpc': '2.0', 'id': None, 'error': error}, 5)
+        with self.assertRaises(odooly.ServerError) as cm:
+            list(_JsonStream(chunks))
+        self.assertEqual(cm.exception.args, (error,))
+
+        self.assertRaises(ValueError, list, _JsonStream([b'[{"id": 1}, ']))
+        self.assertRaises(ValueError, list, _JsonStream([b'"result"']))
+
+
+@skipIf(odooly.requests, "urllib.request is not used")
+class TestHTTPSession(TestCase):
+
+    def setUp(self):
+        server = ThreadingHTTPServer(('127.0.0.1', 0), _JsonHandler)
+        Thread(target=server.serve_forever, daemon=True).start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        self.url = 'http://127.0.0.1:%d/' % server.server_address[1]
+        close_sessions(self)
+
+    def test_reuse_connection(self):
+        http = odooly.HTTPSession()
+        ports = {http.request(self.url, json={})['result'] for __ in range(5)}
+        self.assertEqual(len(ports), 1)
+
+        # Reconnect transparently when the server closed the connection
+        port = http.request(self.url + 'close', json={})['result']
+        self.assertEqual(ports, {port})
+        ports.add(http.request(self.url, json={})['result'])
+        ports.add(http.request(self.url, json={})['result'])
+        self.assertEqual(len(ports), 2)
+
+    def test_pool_timeout(self):
+        http = odooly.HTTPSession()
+        [handler] = [h for h in http._session.handlers if hasattr(h, '_pool')]
+        port = http.request(self.url, json={})['result']
+        self.assertEqual(sum(map(len, handler._pool.values())), 1)
+
+        handler.pool_timeout = 0   # Idle connection expires immediately
+        self.assertNotEqual(http.request(self.url, json={})['result'], port)
+        handler.close()
+        self.assertEqual(handler._pool, {})
+
+    def test_stream(self):
+        http = odooly.HTTPSession()
+        rows = http.request(self.url + 'rows', json={}, stream=True)
+        self.assertEqual(next(rows), ROWS[0])
+        self.assertEqual(list(rows), ROWS[1:])
+
+        # Connection is reused after the stream is consumed
+        port = http.request(self.url, json={})['result']
+        self.assertEqual(http.request(self.url, json={})['result'], port)